@@ -0,0 +1,39 @@
+# benchmarks/batch.py
+#
+# Hands per second of the lockstep batch simulator against one Game object
+# per table, both on a single core.
+#
+#     python -m benchmarks.batch --bots 6 --hands 50
+
+import argparse
+import random
+import time
+
+from game.batch import BatchTables
+from game.tournament import run_tournament
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch simulator benchmark")
+    parser.add_argument('--bots', type=int, default=6)
+    parser.add_argument('--hands', type=int, default=50, help="hands per table")
+    parser.add_argument('--game-tables', type=int, default=20, help="tables for the Game baseline")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bot_names = [f'Bot{i+1}' for i in range(args.bots)]
+    random.seed(args.seed)
+    BatchTables(16, bot_names, seed=args.seed).run(1)  # build the evaluator tables outside the timings
+    baseline = run_tournament(bot_names, args.game_tables, args.hands, master_seed=args.seed, workers=1)
+    print(f"{'Game objects':<20} {baseline.hands_played:>9} hands {baseline.hands_per_second:>10.0f} hands/s")
+    for tables in (256, 1024, 4096, 16384):
+        simulator = BatchTables(tables, bot_names, seed=args.seed)
+        start = time.perf_counter()
+        simulator.run(args.hands)
+        rate = simulator.hands_played / (time.perf_counter() - start)
+        print(f"{f'batch x{tables}':<20} {simulator.hands_played:>9} hands {rate:>10.0f} hands/s "
+              f"({rate / baseline.hands_per_second:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/cards.py
+#
+# Deal + evaluate microbenchmark: the original string-based Card/Deck path
+# against the integer-encoded card table.
+#
+#     python -m benchmarks.cards --hands 20000
+
+import argparse
+import random
+import time
+
+from treys import Card as TreysCard, Evaluator
+
+from game.deck import Deck
+
+
+class LegacyCard:
+    SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+    RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+
+    def __init__(self, suit, rank):
+        self.suit = suit
+        self.rank = rank
+
+    def to_treys(self):
+        rank_translation = {'10': 'T', 'Jack': 'J', 'Queen': 'Q', 'King': 'K', 'Ace': 'A'}
+        rank = rank_translation.get(self.rank, self.rank)
+        suit_translation = {'Hearts': 'h', 'Diamonds': 'd', 'Clubs': 'c', 'Spades': 's'}
+        return TreysCard.new(f"{rank}{suit_translation[self.suit]}")
+
+
+class LegacyDeck:
+    def __init__(self, rng):
+        self.cards = [LegacyCard(suit, rank) for suit in LegacyCard.SUITS for rank in LegacyCard.RANKS]
+        rng.shuffle(self.cards)
+
+    def deal(self, num_cards=1):
+        dealt_cards = self.cards[:num_cards]
+        self.cards = self.cards[num_cards:]
+        return dealt_cards
+
+
+def legacy_hand(rng, evaluator, num_players):
+    deck = LegacyDeck(rng)
+    hands = [deck.deal(2) for _ in range(num_players)]
+    board = deck.deal(3) + deck.deal(1) + deck.deal(1)
+    treys_board = [card.to_treys() for card in board]
+    return [evaluator.evaluate(treys_board, [card.to_treys() for card in hand]) for hand in hands]
+
+
+def encoded_hand(deck, evaluator, num_players):
+    deck.shuffle()
+    hands = [deck.deal(2) for _ in range(num_players)]
+    board = deck.deal(3) + deck.deal(1) + deck.deal(1)
+    treys_board = [card.treys for card in board]
+    return [evaluator.evaluate(treys_board, [card.treys for card in hand]) for hand in hands]
+
+
+def time_hands(play, hands):
+    start = time.perf_counter()
+    for _ in range(hands):
+        play()
+    return (time.perf_counter() - start) / hands
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Card/Deck deal+evaluate microbenchmark")
+    parser.add_argument('--hands', type=int, default=20000)
+    parser.add_argument('--players', type=int, default=6)
+    args = parser.parse_args(argv)
+
+    evaluator = Evaluator()
+    rng = random.Random(0)
+    deck = Deck(random.Random(0))
+    legacy = time_hands(lambda: legacy_hand(rng, evaluator, args.players), args.hands)
+    encoded = time_hands(lambda: encoded_hand(deck, evaluator, args.players), args.hands)
+    print(f"{'path':<10} {'us/hand':>10}")
+    print(f"{'legacy':<10} {legacy * 1e6:>10.1f}")
+    print(f"{'encoded':<10} {encoded * 1e6:>10.1f}")
+    print(f"speedup: {legacy / encoded:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/evaluator.py
+#
+# 7-card evaluations per second: treys, the table evaluator's scalar path
+# and its NumPy batch path.
+#
+#     python -m benchmarks.evaluator --hands 200000
+
+import argparse
+import time
+
+import numpy as np
+from treys import Evaluator
+
+from game.card import CARDS
+from game.evaluator import get_evaluator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hand evaluator throughput benchmark")
+    parser.add_argument('--hands', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    hands = np.argsort(rng.random((args.hands, 52)), axis=1)[:, :7]
+    hand_lists = hands.tolist()
+    treys_hands = [[CARDS[index].treys for index in hand] for hand in hand_lists]
+
+    start = time.perf_counter()
+    evaluator = get_evaluator()
+    build = time.perf_counter() - start
+
+    treys_evaluator = Evaluator()
+    sample = treys_hands[:max(1, args.hands // 10)]
+    start = time.perf_counter()
+    for hand in sample:
+        treys_evaluator.evaluate(hand, [])
+    treys_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for hand in hand_lists:
+        evaluator.evaluate(hand)
+    scalar_rate = len(hand_lists) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    evaluator.evaluate_batch(hands)
+    batch_rate = len(hands) / (time.perf_counter() - start)
+
+    print(f"table build: {build:.2f}s")
+    print(f"{'path':<8} {'evals/s':>12} {'vs treys':>9}")
+    for name, rate in (('treys', treys_rate), ('scalar', scalar_rate), ('batch', batch_rate)):
+        print(f"{name:<8} {rate:>12,.0f} {rate / treys_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
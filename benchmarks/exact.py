@@ -0,0 +1,50 @@
+# benchmarks/exact.py
+#
+# Per-spot latency of exact enumeration against Monte Carlo sampling on
+# random flop, turn and river spots.
+#
+#     python -m benchmarks.exact --spots 50
+
+import argparse
+import random
+import time
+
+from game.equity import estimate_equity
+from game.evaluator import get_evaluator
+from game.exact import enumerate_equity, range_weights, top_range
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact equity latency benchmark")
+    parser.add_argument('--spots', type=int, default=50, help="random spots per street")
+    parser.add_argument('--trials', type=int, default=2000, help="Monte Carlo trials to compare against")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    get_evaluator()  # build the tables outside the timings
+    ranges = {'any two': None, 'top 20%': range_weights(top_range(0.2))}
+    print(f"{'street':<6} {'range':<8} {'exact ms':>9} {'max ms':>8} {'matchups':>9} {'MC ms':>8} {'max error':>10}")
+    for street, board_size in (('flop', 3), ('turn', 4), ('river', 5)):
+        spots = [rng.sample(range(52), 2 + board_size) for _ in range(args.spots)]
+        for label, weights in ranges.items():
+            timings = []
+            errors = []
+            sampled = []
+            for cards in spots:
+                hole, board = cards[:2], cards[2:]
+                start = time.perf_counter()
+                result = enumerate_equity(hole, board, weights)
+                timings.append(time.perf_counter() - start)
+                if weights is None:
+                    start = time.perf_counter()
+                    estimate = estimate_equity(hole, board, trials=args.trials, rng=rng.getrandbits(32))
+                    sampled.append(time.perf_counter() - start)
+                    errors.append(abs(estimate.equity - result.equity))
+            mc = f"{sum(sampled) / len(sampled) * 1e3:>8.2f} {max(errors):>10.4f}" if sampled else f"{'-':>8} {'-':>10}"
+            print(f"{street:<6} {label:<8} {sum(timings) / len(timings) * 1e3:>9.2f} {max(timings) * 1e3:>8.2f} "
+                  f"{result.trials:>9} {mc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/loadtest.py
+#
+# Load test for game.server: starts a server on localhost, connects hundreds
+# of simple bot clients to it and reports action-latency percentiles, i.e.
+# the time from a reply reaching a table to that table's next action request.
+#
+#     python -m benchmarks.loadtest --clients 300 --seats 6 --hands 20
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from game.server import PokerServer
+
+
+async def bot_client(name, host, port, rng, slow=False, timeout=1.0):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({'type': 'join', 'name': name}).encode() + b'\n')
+    await writer.drain()
+    actions = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        if message['type'] == 'table_end':
+            break
+        if message['type'] != 'act':
+            continue
+        if slow:
+            # Never answers in time; the server must fall back without stalling others
+            await asyncio.sleep(timeout * 1.5)
+        action = rng.choice(message['valid_actions'])
+        writer.write(json.dumps({'type': 'action', 'action': action, 'amount': rng.randint(10, 50)}).encode() + b'\n')
+        await writer.drain()
+        actions += 1
+    writer.close()
+    return actions
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args):
+    server = PokerServer(args.seats, action_timeout=args.timeout, max_hands=args.hands,
+                         max_tables=args.clients // args.seats + 1, seed=args.seed)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    clients = [bot_client(f'Bot{i+1}', '127.0.0.1', port, random.Random(rng.getrandbits(64)),
+                          slow=i < args.slow, timeout=args.timeout)
+               for i in range(args.clients - args.clients % args.seats)]
+    actions = sum(await asyncio.gather(*clients))
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies = server.turnarounds
+    print(f"{len(clients)} clients, {len(clients) // args.seats} tables, {actions} actions "
+          f"in {elapsed:.2f}s ({actions / elapsed:.0f} actions/s)")
+    if latencies:
+        print(f"action latency (ms): p50 {percentile(latencies, 0.5) * 1e3:.2f}  "
+              f"p90 {percentile(latencies, 0.9) * 1e3:.2f}  p99 {percentile(latencies, 0.99) * 1e3:.2f}  "
+              f"max {max(latencies) * 1e3:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the poker server with bot clients")
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--seats', type=int, default=6, help="players per table")
+    parser.add_argument('--hands', type=int, default=20, help="hands per table")
+    parser.add_argument('--timeout', type=float, default=1.0, help="server per-action timeout in seconds")
+    parser.add_argument('--slow', type=int, default=0, help="clients that never answer in time")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
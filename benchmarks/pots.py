@@ -0,0 +1,41 @@
+# benchmarks/pots.py
+#
+# Cost of settling 10-handed all-in pots with side pots.
+#
+#     python -m benchmarks.pots --hands 100000
+
+import argparse
+import random
+import time
+
+from game.pot import settle_pots
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pot settlement microbenchmark")
+    parser.add_argument('--hands', type=int, default=100000)
+    parser.add_argument('--players', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    players = list(range(args.players))
+    hands = []
+    for _ in range(1000):
+        # Everyone all-in for a different stack, a couple of folds, some tied ranks
+        contributions = {player: rng.randint(10, 2000) for player in players}
+        live = [player for player in players if rng.random() > 0.2] or players[:2]
+        ranks = {player: rng.randint(1, 200) for player in live}
+        hands.append((contributions, ranks))
+
+    start = time.perf_counter()
+    for i in range(args.hands):
+        contributions, ranks = hands[i % len(hands)]
+        settle_pots(contributions, ranks, players)
+    elapsed = time.perf_counter() - start
+    print(f"{args.players}-handed all-in settlements: {elapsed / args.hands * 1e6:.2f} us each "
+          f"({args.hands / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/snapshot.py
+#
+# Size and cost of table snapshots, and how much a background SnapshotWriter
+# slows down a session that checkpoints after every hand.
+#
+#     python -m benchmarks.snapshot --hands 2000
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from game.game import Game
+from game.snapshot import SnapshotWriter, capture, encode
+
+
+def session(args, checkpoint=None):
+    game = Game.headless([f'Bot{i+1}' for i in range(args.players)], rng=random.Random(args.seed),
+                         checkpoint=checkpoint)
+    start = time.perf_counter()
+    hands = sum(result.hands_played for result in game.play_hands(args.hands))
+    return game, hands, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Table snapshot benchmark")
+    parser.add_argument('--hands', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    session(args)  # warm up the evaluator tables and caches
+    game, hands, plain = session(args)
+    repeats = 10000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        data = encode(capture(game))
+    elapsed = time.perf_counter() - start
+    print(f"snapshot: {len(data)} bytes, capture+encode {elapsed / repeats * 1e6:.1f} us")
+
+    print(f"{hands} hands: {hands / plain:.0f} hands/s without checkpoints")
+    with tempfile.TemporaryDirectory() as directory:
+        for every in (1, 10, 100):
+            with SnapshotWriter(os.path.join(directory, 'table.snap'), every) as writer:
+                _, _, checkpointed = session(args, writer)
+            print(f"{hands} hands: {hands / checkpointed:.0f} hands/s checkpointing every {every} "
+                  f"({writer.written} snapshots written)")
+
+
+if __name__ == "__main__":
+    main()
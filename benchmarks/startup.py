@@ -0,0 +1,60 @@
+# benchmarks/startup.py
+#
+# Cold start of fresh interpreters: importing the card modules and the game,
+# and getting to the end of the first dealt hand with and without the cached
+# evaluator tables, plus the first hand in a spawned pool worker. Every
+# figure is the median wall time of a new `python -c` process.
+#
+#     python -m benchmarks.startup --repeats 7
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Seed 1 deals a first hand that reaches the hand evaluator
+FIRST_HAND = ("import random; from game.game import Game; "
+              "Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(1)).play(max_hands=1)")
+POOL_HAND = ("from concurrent.futures import ProcessPoolExecutor; from multiprocessing import get_context; "
+             "from game.tournament import play_table; "
+             "executor = ProcessPoolExecutor(1, mp_context=get_context('spawn')); "
+             "executor.submit(play_table, (1, ['Bot1', 'Bot2', 'Bot3'], {}, 1000, 1, None, 1)).result(); "
+             "executor.shutdown()")
+
+
+def run(code, cache_dir, repeats, fresh_cache=False):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as empty:
+            env = dict(os.environ, POKER_CACHE_DIR=empty if fresh_cache else cache_dir)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=root, env=env, check=True)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run(FIRST_HAND, cache_dir, 1)  # write the evaluator tables into the cache
+        rows = [
+            ('python -c pass', run('pass', cache_dir, args.repeats)),
+            ('import game.card, game.deck', run('import game.card, game.deck', cache_dir, args.repeats)),
+            ('import game.game', run('import game.game', cache_dir, args.repeats)),
+            ('first hand, no table cache', run(FIRST_HAND, cache_dir, args.repeats, fresh_cache=True)),
+            ('first hand, cached tables', run(FIRST_HAND, cache_dir, args.repeats)),
+            ('first hand in a spawned worker', run(POOL_HAND, cache_dir, args.repeats)),
+        ]
+    for label, seconds in rows:
+        print(f"{label:<32} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
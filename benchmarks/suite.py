@@ -0,0 +1,239 @@
+# benchmarks/suite.py
+#
+# Reproducible benchmark suite for the engine and the bots. Every case is
+# seeded and repeated, and the raw samples are kept:
+#
+# - deck: shuffle and deal a six-handed hand
+# - evaluator.scalar / evaluator.batch: 7-card ranks one at a time and in
+#   NumPy batches
+# - hands.<seats>: headless bot hands at several table sizes
+# - memory.table: bytes held per seated six-bot table after a hand
+# - strength.duplicate: threshold bot against a calling station in duplicate
+#   heads-up deals (game.duplicate), in chips per hand
+#
+# Save the results as a baseline, then compare a later run against it.
+# Machines drift (frequency scaling, noisy neighbours), so every run also
+# times a fixed pure-Python calibration loop, and timings are rescaled by
+# the ratio of the two runs' calibration medians before they are compared.
+# A case is flagged when it is worse than the baseline by more than
+# --min-effect and a one-sided permutation test on the two sets of samples
+# puts the chance of that difference below --alpha.
+#
+#     python -m benchmarks.suite --save baseline.json
+#     python -m benchmarks.suite --compare baseline.json
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from game.deck import Deck
+from game.duplicate import calling_station, duplicate_match
+from game.evaluator import evaluate, evaluate_batch
+from game.game import Game
+from game.providers import bot_provider, callback_provider
+
+
+def calibration():
+    start = time.perf_counter()
+    table = dict.fromkeys(range(1024), 0)
+    total = 0
+    for i in range(200000):
+        table[i & 1023] = i
+        total += table[(i * 7) & 1023]
+    return time.perf_counter() - start
+
+
+def deck_case(args, seed):
+    deck = Deck(random.Random(seed))
+    rounds = 20000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        deck.shuffle()
+        for _ in range(6):
+            deck.deal(2)
+        deck.deal(5)
+    return (time.perf_counter() - start) / rounds
+
+
+def scalar_case(args, seed):
+    rng = random.Random(seed)
+    hands = [rng.sample(range(52), 7) for _ in range(20000)]
+    start = time.perf_counter()
+    for hand in hands:
+        evaluate(hand)
+    return (time.perf_counter() - start) / len(hands)
+
+
+def batch_case(args, seed):
+    hands = np.argsort(np.random.default_rng(seed).random((200000, 52)), axis=1)[:, :7]
+    start = time.perf_counter()
+    evaluate_batch(hands)
+    return (time.perf_counter() - start) / len(hands)
+
+
+def hands_case(seats):
+    def case(args, seed):
+        game = Game.headless([f'Bot{i+1}' for i in range(seats)], rng=random.Random(seed))
+        start = time.perf_counter()
+        played = sum(result.hands_played for result in game.play_hands(args.hands))
+        return (time.perf_counter() - start) / played
+    return case
+
+
+def memory_case(args, seed):
+    rng = random.Random(seed)
+    tables = 50
+    Game.headless([f'Bot{i+1}' for i in range(6)], rng=rng).play(max_hands=1)  # warm shared caches
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    games = [Game.headless([f'Bot{i+1}' for i in range(6)], rng=rng) for _ in range(tables)]
+    for game in games:
+        game.play(max_hands=1)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # The process-wide evaluation cache grows with whatever ran before; it
+    # is not part of a table
+    shared = [tracemalloc.Filter(False, '*handcache.py'), tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(shared).compare_to(before.filter_traces(shared), 'filename')
+    held = sum(stat.size_diff for stat in differences)
+    return held / tables
+
+
+def duplicate_samples(args):
+    result = duplicate_match(bot_provider, callback_provider(calling_station), args.deals, seed=args.seed)
+    return result.pairs
+
+
+# name -> (unit, whether lower is better, function of (args, seed) returning one sample);
+# cases measured in seconds are rescaled by the calibration loop
+CASES = {
+    'deck': ('s/hand', True, deck_case),
+    'evaluator.scalar': ('s/hand', True, scalar_case),
+    'evaluator.batch': ('s/hand', True, batch_case),
+    'hands.2': ('s/hand', True, hands_case(2)),
+    'hands.6': ('s/hand', True, hands_case(6)),
+    'hands.9': ('s/hand', True, hands_case(9)),
+    'memory.table': ('bytes', True, memory_case),
+    'strength.duplicate': ('chips/hand', False, None),
+}
+
+
+def run_cases(args):
+    results = {}
+    calibrations = []
+    for name, (unit, lower_is_better, case) in CASES.items():
+        if args.cases and not any(name.startswith(prefix) for prefix in args.cases):
+            continue
+        if case is None:
+            samples = duplicate_samples(args)
+        else:
+            case(args, args.seed)  # warm-up
+            samples = []
+            for repeat in range(args.repeats):
+                calibrations.append(calibration())
+                samples.append(case(args, args.seed + repeat))
+        results[name] = {'unit': unit, 'lower_is_better': lower_is_better, 'paired': case is None,
+                         'samples': samples}
+        print(f"{name:<20} {statistics.mean(samples):>12.4g} {unit}")
+    return results, calibrations
+
+
+def permutation_p_value(baseline, current, lower_is_better, paired=False, rounds=10000, seed=0):
+    # One-sided: the chance of a difference in means at least this much
+    # worse if both runs came from the same distribution. Paired samples
+    # (the same duplicate deals in both runs) flip the sign of each
+    # per-deal difference instead of shuffling the pooled samples.
+    baseline = np.asarray(baseline, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    sign = 1.0 if lower_is_better else -1.0
+    observed = sign * (current.mean() - baseline.mean())
+    tolerance = 1e-12 * abs(observed)
+    rng = np.random.default_rng(seed)
+    hits = 0
+    if paired:
+        differences = sign * (current - baseline)
+        chunk = max(1, min(rounds, 2000000 // len(differences)))
+        for done in range(0, rounds, chunk):
+            flips = rng.choice([-1.0, 1.0], size=(min(chunk, rounds - done), len(differences)))
+            hits += np.count_nonzero((flips * differences).mean(axis=1) >= observed - tolerance)
+        return (hits + 1) / (rounds + 1)
+    pooled = np.concatenate([baseline, current])
+    chunk = max(1, min(rounds, 2000000 // len(pooled)))
+    for done in range(0, rounds, chunk):
+        shuffled = rng.permuted(np.tile(pooled, (min(chunk, rounds - done), 1)), axis=1)
+        differences = sign * (shuffled[:, len(baseline):].mean(axis=1) - shuffled[:, :len(baseline)].mean(axis=1))
+        hits += np.count_nonzero(differences >= observed - tolerance)
+    return (hits + 1) / (rounds + 1)
+
+
+def compare(baseline, results, calibrations, alpha, min_effect):
+    # Returns the names of the cases that regressed
+    regressions = []
+    scale = 1.0
+    if baseline.get('calibration') and calibrations:
+        scale = statistics.median(baseline['calibration']) / statistics.median(calibrations)
+        print(f"\nThis machine ran the calibration loop {1 / scale:.2f}x as long as the baseline's")
+    print(f"\n{'case':<20} {'baseline':>12} {'current':>12} {'change':>8} {'p':>8}  verdict")
+    for name, current in results.items():
+        before = baseline['cases'].get(name)
+        if before is None:
+            continue
+        samples = current['samples']
+        if current['unit'].startswith('s/'):
+            samples = [sample * scale for sample in samples]
+        old = statistics.mean(before['samples'])
+        new = statistics.mean(samples)
+        worse = new - old if current['lower_is_better'] else old - new
+        change = (new - old) / abs(old) if old else 0.0
+        paired = current['paired'] and before.get('paired') and len(samples) == len(before['samples'])
+        p = permutation_p_value(before['samples'], samples, current['lower_is_better'], paired)
+        if worse > min_effect * abs(old) and p < alpha:
+            verdict = 'REGRESSION'
+            regressions.append(name)
+        elif -worse > min_effect * abs(old) and 1 - p < alpha:
+            verdict = 'improved'
+        else:
+            verdict = 'ok'
+        print(f"{name:<20} {old:>12.4g} {new:>12.4g} {change:>+8.1%} {p:>8.4f}  {verdict}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Engine and bot benchmark suite")
+    parser.add_argument('--repeats', type=int, default=7, help="samples per timed case")
+    parser.add_argument('--hands', type=int, default=300, help="hands per sample of the hands cases")
+    parser.add_argument('--deals', type=int, default=1000, help="duplicate deals for the strength case")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', nargs='*', help="only run cases starting with these names")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--alpha', type=float, default=0.01, help="significance level for regressions")
+    parser.add_argument('--min-effect', type=float, default=0.05,
+                        help="smallest relative slowdown (or loss) that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results, calibrations = run_cases(args)
+    if args.save:
+        record = {'python': platform.python_version(), 'machine': platform.machine(),
+                  'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seed': args.seed,
+                  'calibration': calibrations, 'cases': results}
+        with open(args.save, 'w') as f:
+            json.dump(record, f, indent=1)
+        print(f"Wrote {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, calibrations, args.alpha, args.min_effect)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
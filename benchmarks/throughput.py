@@ -0,0 +1,45 @@
+# benchmarks/throughput.py
+#
+# Headless hands-per-second benchmark for bot-only tables.
+#
+#     python -m benchmarks.throughput --hands 2000
+
+import argparse
+import random
+import time
+
+from game.game import Game
+from game.handcache import cache_stats, clear_cache
+
+
+def run_table_size(num_bots, hands, starting_chips):
+    game = Game.headless([f'Bot{i+1}' for i in range(num_bots)], starting_chips)
+    start = time.perf_counter()
+    played = sum(result.hands_played for result in game.play_hands(hands))
+    elapsed = time.perf_counter() - start
+    return played, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless engine throughput benchmark")
+    parser.add_argument('--hands', type=int, default=1000, help="hands to play per table size")
+    parser.add_argument('--min-seats', type=int, default=2)
+    parser.add_argument('--max-seats', type=int, default=10)
+    parser.add_argument('--chips', type=int, default=1000, help="starting chips per bot")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    print(f"{'seats':>5} {'hands':>8} {'seconds':>9} {'hands/s':>10} {'cache hits':>11} {'misses':>8} {'hit rate':>9}")
+    for num_bots in range(args.min_seats, args.max_seats + 1):
+        clear_cache()
+        played, elapsed = run_table_size(num_bots, args.hands, args.chips)
+        stats = cache_stats()
+        lookups = stats.hits + stats.misses
+        hit_rate = stats.hits / lookups if lookups else 0.0
+        print(f"{num_bots:>5} {played:>8} {elapsed:>9.3f} {played / elapsed:>10.1f} "
+              f"{stats.hits:>11} {stats.misses:>8} {hit_rate:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
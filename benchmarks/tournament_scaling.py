@@ -0,0 +1,34 @@
+# benchmarks/tournament_scaling.py
+#
+# Hands per second of the tournament runner as the worker count grows.
+#
+#     python -m benchmarks.tournament_scaling --tables 64 --hands 100
+
+import argparse
+import os
+
+from game.tournament import run_tournament
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tournament runner scaling benchmark")
+    parser.add_argument('--bots', type=int, default=6)
+    parser.add_argument('--tables', type=int, default=64)
+    parser.add_argument('--hands', type=int, default=100, help="hands per table")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bot_names = [f'Bot{i+1}' for i in range(args.bots)]
+    counts = sorted({1, 2, 4, 8, 16, os.cpu_count()} & set(range(1, os.cpu_count() + 1)))
+    baseline = None
+    print(f"{'workers':>7} {'hands/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for workers in counts:
+        result = run_tournament(bot_names, args.tables, args.hands, master_seed=args.seed,
+                                workers=workers)
+        baseline = baseline or result.hands_per_second
+        speedup = result.hands_per_second / baseline
+        print(f"{workers:>7} {result.hands_per_second:>10.1f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+# game/batch.py
+#
+# Lockstep simulator for thousands of bot-only tables. Instead of one Game
+# object per table, every table's chips, bets, hole cards, boards and betting
+# state live in NumPy arrays of shape (tables,) or (tables, seats), and all
+# tables advance together: cards are dealt from one batched shuffle, each
+# betting step decides for every table's current actor at once, and
+# showdowns are ranked with the batch evaluator and settled with a
+# vectorised version of game.pot.
+#
+# The rules follow Game and HandState: blinds and first actors, the bots'
+# threshold policy and bet sizing from get_bot_action, min-raise top-ups,
+# side pots and odd chips. A table whose session ends rebuys every bot,
+# as game.tournament does.
+#
+#     python -m game.batch --tables 4096 --bots 6 --hands 100
+
+import argparse
+import time
+
+import numpy as np
+
+from .equity import MAX_OPPONENTS
+from .evaluator import get_evaluator
+from .preflop import NUM_CLASSES, class_cards, hand_class, preflop_table
+from .tournament import PlayerStats, TournamentResult
+
+SMALL_BLIND = 5
+BIG_BLIND = 10
+MAX_RANK = 7462
+NO_SEAT = -1
+NO_LEVEL = np.iinfo(np.int64).max // 4
+
+FOLD, CHECK, CALL, BET, RAISE = range(5)
+ACTIONS = ['fold', 'check', 'call', 'bet', 'raise']
+
+# Hand class of every pair of card indices
+HAND_CLASSES = np.array([[hand_class((first, second)) if first != second else 0 for second in range(52)]
+                         for first in range(52)], dtype=np.intp)
+
+
+def preflop_strengths():
+    # Bot pre-flop strength by hand class and number of opponents
+    table = preflop_table()
+    if table is None:
+        raise ValueError("The batch simulator needs the pre-flop equity table")
+    return np.array([[table.strength(class_cards(index), opponents)
+                      for opponents in range(1, MAX_OPPONENTS + 1)] for index in range(NUM_CLASSES)])
+
+
+def next_seats(start, mask, counts):
+    # First seat at or after `start` (circularly, among the seated) where mask holds
+    offsets = np.arange(mask.shape[1])
+    candidates = (start[:, None] + offsets) % counts[:, None]
+    found = np.take_along_axis(mask, candidates, axis=1)
+    first = np.argmax(found, axis=1)
+    return np.where(found.any(axis=1), candidates[np.arange(len(start)), first], NO_SEAT)
+
+
+def settle(contributions, live, ranks, first, counts):
+    # Vectorised game.pot.settle_pots: payouts per seat for every table.
+    # Pots sit at the distinct contribution levels of live players, the top
+    # pot also takes folded chips above it, and odd chips go to winners in
+    # seat order starting at `first`.
+    tables, seats = contributions.shape
+    rows = np.arange(tables)
+    levels = np.sort(np.where(live, contributions, NO_LEVEL), axis=1)
+    top = levels[rows, live.sum(axis=1) - 1]
+    order = (np.arange(seats) - first[:, None]) % counts[:, None]
+    order = np.where(np.arange(seats) < counts[:, None], order, seats)
+    ranks = np.where(live, ranks, MAX_RANK + 1)
+    payouts = np.zeros_like(contributions)
+    previous = np.zeros(tables, dtype=contributions.dtype)
+    for k in range(seats):
+        level = levels[:, k]
+        valid = (level < NO_LEVEL) & ((level != previous) | (k == 0))
+        upper = np.where(level == top, NO_LEVEL, level)
+        amount = (np.minimum(contributions, upper[:, None])
+                  - np.minimum(contributions, previous[:, None])).sum(axis=1)
+        eligible = live & (contributions >= level[:, None])
+        best = np.where(eligible, ranks, MAX_RANK + 1).min(axis=1)
+        winners = eligible & (ranks == best[:, None]) & valid[:, None]
+        share, odd = np.divmod(amount, np.maximum(winners.sum(axis=1), 1))
+        winner_order = np.where(winners, order, seats + 1)
+        ahead = (winner_order[:, None, :] < winner_order[:, :, None]).sum(axis=2)
+        payouts += np.where(winners, share[:, None] + (ahead < odd[:, None]), 0)
+        previous = np.where(valid, level, previous)
+    return payouts
+
+
+class BatchTables:
+    def __init__(self, num_tables, bot_names, starting_chips=1000, seed=None):
+        self.bot_names = list(bot_names)
+        self.starting_chips = starting_chips
+        self.rng = np.random.default_rng(seed)
+        self.evaluator = get_evaluator()
+        self.strengths = preflop_strengths()
+        tables, seats = num_tables, len(self.bot_names)
+        # Rotate the seating so no bot keeps the same position on every table
+        self.seating = (np.arange(seats) + np.arange(tables)[:, None]) % seats
+        self.ids = self.seating.copy()  # Bot at each seat; busted bots are squeezed out
+        self.chips = np.full((tables, seats), starting_chips, dtype=np.int64)
+        self.counts = np.full(tables, seats, dtype=np.int64)  # Seated players per table
+        self.dealer = np.zeros(tables, dtype=np.int64)
+        self.hands_played = 0
+        self.sessions = 0
+        self.showdowns = 0
+        self.pot_total = 0
+        self.action_counts = np.zeros(len(ACTIONS), dtype=np.int64)
+        self.stat_hands = np.zeros(seats, dtype=np.int64)
+        self.stat_net = np.zeros(seats, dtype=np.int64)
+        self.stat_net_sq = np.zeros(seats, dtype=np.int64)
+
+    @property
+    def num_tables(self):
+        return len(self.chips)
+
+    def post(self, seat, amount):
+        rows = np.arange(self.num_tables)
+        put = np.minimum(amount, self.chips[rows, seat])
+        self.chips[rows, seat] -= put
+        self.street_bet[rows, seat] += put
+        self.total_bet[rows, seat] += put
+
+    def open_street(self, first):
+        rows = np.arange(self.num_tables)
+        can_act = self.in_hand & (self.chips > 0)
+        self.ring = can_act.sum(axis=1)
+        self.pending = self.ring.copy()
+        # A lone player who is not facing a bet has nobody to bet against
+        lone = can_act.argmax(axis=1)
+        self.pending[(self.ring == 1) & (self.street_bet[rows, lone] >= self.current)] = 0
+        actor = next_seats(first, can_act, self.counts)
+        self.actor = np.where((self.pending > 0) & (self.live > 1), actor, NO_SEAT)
+
+    def start_street(self, street):
+        self.street = street
+        self.current[:] = 0
+        self.min_raise[:] = BIG_BLIND
+        self.street_bet[:] = 0
+        if street > 0:
+            # Bots judge made hands by rank once the flop is out
+            tables, seats = self.chips.shape
+            cards = np.concatenate([self.hole, np.broadcast_to(self.board[:, None, :2 + street],
+                                                               (tables, seats, 2 + street))], axis=2)
+            ranks = self.evaluator.evaluate_batch(cards.reshape(tables * seats, 4 + street))
+            self.made = 1 - ranks.reshape(tables, seats) / MAX_RANK
+        self.open_street((self.dealer + 1) % self.counts)
+
+    def act(self, rows):
+        rng = self.rng
+        seat = self.actor[rows]
+        chips = self.chips[rows, seat]
+        current = self.current[rows]
+        to_call = current - self.street_bet[rows, seat]
+
+        # get_bot_action: thresholds on strength plus noise, keyed on the table's bet
+        if self.street == 0:
+            opponents = np.clip(self.live[rows] - 1, 1, MAX_OPPONENTS)
+            strength = self.strengths[self.classes[rows, seat], opponents - 1]
+        else:
+            strength = self.made[rows, seat]
+        strength = strength + rng.uniform(-0.1, 0.1, len(rows))
+        action = np.where(current > 0,
+                          np.where(strength > 0.7, RAISE, np.where(strength > 0.4, CALL, FOLD)),
+                          np.where(strength > 0.6, BET, CHECK))
+
+        # get_bot_bet_amount / get_bot_raise_amount
+        bet_cap = np.minimum(100, chips)
+        bet = np.where(bet_cap < 10, bet_cap, rng.integers(10, np.maximum(bet_cap, 10) + 1))
+        raise_cap = np.minimum(100, chips - to_call)
+        raised = np.where(raise_cap < 10, np.maximum(raise_cap, 0), rng.integers(10, np.maximum(raise_cap, 10) + 1))
+        amount = np.where(action == BET, bet, raised)
+
+        # HandState.apply normalisation
+        action[(action == CALL) & (to_call == 0)] = CHECK
+        action[(action == RAISE) & (chips <= to_call)] = CALL
+        self.action_counts += np.bincount(action, minlength=len(ACTIONS))
+
+        can_act = self.in_hand[rows] & (self.chips[rows] > 0)
+        following = next_seats(seat + 1, can_act, self.counts[rows])
+
+        folded = action == FOLD
+        aggressive = (action == BET) | (action == RAISE)
+        put = np.where(action == CALL, np.minimum(to_call, chips), 0)
+        min_raise = self.min_raise[rows]
+        put = np.where(aggressive, np.minimum(to_call + np.maximum(amount, min_raise), chips), put)
+        self.in_hand[rows[folded], seat[folded]] = False
+        self.live[rows] -= folded
+        self.chips[rows, seat] -= put
+        self.street_bet[rows, seat] += put
+        self.total_bet[rows, seat] += put
+
+        new_bet = self.street_bet[rows, seat]
+        raised_by = new_bet - current
+        self.min_raise[rows] = np.where(aggressive & (raised_by >= min_raise), raised_by, min_raise)
+        self.current[rows] = np.where(aggressive, np.maximum(current, new_bet), current)
+        self.pending[rows] = np.where(aggressive, self.ring[rows] - 1, self.pending[rows] - 1)
+        self.ring[rows] -= folded | (self.chips[rows, seat] == 0)
+        done = (self.pending[rows] <= 0) | (self.live[rows] <= 1)
+        self.actor[rows] = np.where(done, NO_SEAT, following)
+
+    def play_hand(self):
+        tables, seats = self.chips.shape
+        counts = self.counts
+        self.dealer %= counts
+        seated = np.arange(seats) < counts[:, None]
+        before = self.chips.copy()
+
+        # One shuffle per table: seat i is dealt cards 2i and 2i+1, then the board
+        decks = self.rng.permuted(np.broadcast_to(np.arange(52), (tables, 52)), axis=1)
+        self.hole = decks[:, :2 * seats].reshape(tables, seats, 2)
+        self.board = decks[:, 2 * seats:2 * seats + 5]
+        self.classes = HAND_CLASSES[self.hole[:, :, 0], self.hole[:, :, 1]]
+
+        self.in_hand = seated.copy()
+        self.live = counts.copy()
+        self.street_bet = np.zeros((tables, seats), dtype=np.int64)
+        self.total_bet = np.zeros((tables, seats), dtype=np.int64)
+        self.current = np.zeros(tables, dtype=np.int64)
+        self.min_raise = np.full(tables, BIG_BLIND, dtype=np.int64)
+        self.street = 0
+
+        # Heads-up the dealer posts the small blind and acts first pre-flop
+        heads_up = counts == 2
+        small_blind = np.where(heads_up, self.dealer, (self.dealer + 1) % counts)
+        big_blind = np.where(heads_up, (self.dealer + 1) % counts, (self.dealer + 2) % counts)
+        self.post(small_blind, SMALL_BLIND)
+        self.post(big_blind, BIG_BLIND)
+        self.current = self.street_bet.max(axis=1)
+        self.open_street((big_blind + 1) % counts)
+
+        for street in range(4):
+            if street:
+                self.start_street(street)
+            while True:
+                acting = np.flatnonzero(self.actor != NO_SEAT)
+                if not len(acting):
+                    break
+                self.act(acting)
+
+        # Showdown over the full board; a table won by folds has one live seat
+        cards = np.concatenate([self.hole, np.broadcast_to(self.board[:, None, :], (tables, seats, 5))], axis=2)
+        ranks = self.evaluator.evaluate_batch(cards.reshape(tables * seats, 7)).reshape(tables, seats)
+        self.chips += settle(self.total_bet, self.in_hand, ranks, (self.dealer + 1) % counts, counts)
+        self.showdowns += int(np.count_nonzero(self.live > 1))
+        self.pot_total += int(self.total_bet.sum())
+
+        # Per-bot results for everyone who was dealt in
+        ids = self.ids[seated]
+        delta = (self.chips - before)[seated]
+        self.stat_hands += np.bincount(ids, minlength=seats)
+        self.stat_net += np.bincount(ids, weights=delta, minlength=seats).astype(np.int64)
+        self.stat_net_sq += np.bincount(ids, weights=delta * delta, minlength=seats).astype(np.int64)
+        self.hands_played += tables
+
+        self.dealer = (self.dealer + 1) % counts
+        self.remove_busted(seated)
+
+    def remove_busted(self, seated):
+        # Squeeze busted bots out of their seats, keeping the others in order
+        keep = seated & (self.chips > 0)
+        order = np.argsort(~keep, axis=1, kind='stable')
+        self.chips = np.take_along_axis(np.where(keep, self.chips, 0), order, axis=1)
+        self.ids = np.take_along_axis(self.ids, order, axis=1)
+        self.counts = keep.sum(axis=1)
+        # A session ends once one bot holds every chip; rebuy everyone
+        over = self.counts < 2
+        if over.any():
+            self.chips[over] = self.starting_chips
+            self.ids[over] = self.seating[over]
+            self.counts[over] = self.chips.shape[1]
+            self.dealer[over] = 0
+            self.sessions += int(over.sum())
+
+    def run(self, hands):
+        # Plays `hands` hands on every table
+        start = time.perf_counter()
+        for _ in range(hands):
+            self.play_hand()
+        return self.result(time.perf_counter() - start)
+
+    def result(self, elapsed):
+        stats = {}
+        for bot, name in enumerate(self.bot_names):
+            stats[name] = PlayerStats()
+            stats[name].hands = int(self.stat_hands[bot])
+            stats[name].net = int(self.stat_net[bot])
+            stats[name].net_sq = int(self.stat_net_sq[bot])
+        return TournamentResult(self.num_tables, self.hands_played, stats, elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many bot tables in lockstep")
+    parser.add_argument('--bots', type=int, default=6, help="bots seated at every table")
+    parser.add_argument('--tables', type=int, default=4096)
+    parser.add_argument('--hands', type=int, default=100, help="hands per table")
+    parser.add_argument('--chips', type=int, default=1000, help="starting chips per bot")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bot_names = [f'Bot{i+1}' for i in range(args.bots)]
+    simulator = BatchTables(args.tables, bot_names, args.chips, args.seed)
+    print(simulator.run(args.hands).report())
+
+
+if __name__ == "__main__":
+    main()
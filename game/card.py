@@ -7,13 +7,37 @@ class Card:
     TREYS_RANKS = {'2': '2', '3': '3', '4': '4', '5': '5', '6': '6',
                    '7': '7', '8': '8', '9': '9', '10': 'T',
                    'Jack': 'J', 'Queen': 'Q', 'King': 'K', 'Ace': 'A'}
+    # Bit layout of a treys card integer: rank bit, suit bit, rank index, rank prime
+    TREYS_SUIT_BITS = {'Hearts': 2, 'Diamonds': 4, 'Clubs': 8, 'Spades': 1}
+    PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+    __slots__ = ('suit', 'rank', 'index', 'treys')
 
     def __init__(self, suit, rank):
         self.suit = suit
         self.rank = rank
+        rank_index = self.RANKS.index(rank)
+        # 0-51, suit-major; the position of this card in CARDS
+        self.index = self.SUITS.index(suit) * 13 + rank_index
+        self.treys = ((1 << rank_index) << 16 | self.TREYS_SUIT_BITS[suit] << 12
+                      | rank_index << 8 | self.PRIMES[rank_index])
+
+    @staticmethod
+    def from_index(index):
+        return CARDS[index]
 
     def to_treys_notation(self):
         return self.TREYS_RANKS[self.rank] + self.TREYS_SUITS[self.suit]
 
+    def __eq__(self, other):
+        return isinstance(other, Card) and self.index == other.index
+
+    def __hash__(self):
+        return self.index
+
     def __repr__(self):
-        return f"{self.rank} of {self.suit}"
\ No newline at end of file
+        return f"{self.rank} of {self.suit}"
+
+
+# Shared table of all 52 cards; decks deal views into it instead of building cards
+CARDS = tuple(Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS)
@@ -0,0 +1,552 @@
+# game/cfr.py
+#
+# Monte Carlo CFR trainer for heads-up play, and a bot that plays the result
+# as a lookup policy.
+#
+# The game is abstracted in two ways. Betting: BettingTree enumerates every
+# action sequence when each player may fold, check/call, raise by a few
+# pot fractions or move all-in, with a cap on raises per street. Cards: on
+# each street a hand is reduced to one of a few equity buckets, from the
+# pre-flop table before the flop and from a batched equity sample after it.
+# An information set is a decision node plus the acting player's bucket on
+# that street, so regrets and the average strategy are dense float32 arrays
+# of shape (decision nodes * buckets, actions).
+#
+# Training uses external-sampling MCCFR with regret matching+. Tables live
+# in .npy files opened as memory maps, so a checkpoint only flushes dirty
+# pages and training resumes from the same directory. Workers train on
+# copies of the tables and the master adds up their changes. Progress
+# reports give iterations per second and an exploitability estimate from a
+# sampled best response.
+#
+#     python -m game.cfr train runs/cfr --iterations 200000 --workers 8
+#     python -m game.cfr export runs/cfr policy.npz
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .equity import card_indices
+from .evaluator import evaluate_batch, get_evaluator
+from .game import Game
+from .preflop import preflop_table
+from .hand import STREETS
+from .providers import bot_provider
+
+FOLD, SHOWDOWN, DECISION = range(3)
+STACK = 1000
+SMALL_BLIND = 5
+BIG_BLIND = 10
+RAISE_SIZES = (0.5, 1.0)
+MAX_RAISES = 2
+BUCKETS = 8
+EQUITY_SAMPLES = 64
+
+
+class BettingTree:
+    def __init__(self, stack=STACK, small_blind=SMALL_BLIND, big_blind=BIG_BLIND,
+                 raise_sizes=RAISE_SIZES, max_raises=MAX_RAISES):
+        # Player 0 is the button: it posts the small blind, acts first
+        # pre-flop and second after the flop
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.raise_sizes = tuple(raise_sizes)
+        self.max_raises = max_raises
+        self.kind = []
+        self.player = []  # Actor at a decision node, folder at a fold node
+        self.street = []
+        self.contributions = []
+        self.actions = []  # (label, contribution after the action) per decision node
+        self.children = []
+        self.decision = []  # Row block of a decision node in the tables, or -1
+        self.num_decisions = 0
+        self.root = self.build(0, (small_blind, big_blind), (small_blind, big_blind), 0, 0, (False, False),
+                               big_blind)
+        self.max_actions = max(len(actions) for actions in self.actions)
+
+    def add(self, kind, player, street, contributions):
+        self.kind.append(kind)
+        self.player.append(player)
+        self.street.append(street)
+        self.contributions.append(contributions)
+        self.actions.append(())
+        self.children.append(())
+        self.decision.append(-1)
+        return len(self.kind) - 1
+
+    def build(self, street, contributions, bets, player, raises, acted, min_raise):
+        node = self.add(DECISION, player, street, contributions)
+        self.decision[node] = self.num_decisions
+        self.num_decisions += 1
+        opponent = 1 - player
+        to_call = bets[opponent] - bets[player]
+        left = self.stack - contributions[player]
+        actions = []
+        if to_call > 0:
+            actions.append(('fold', contributions[player]))
+        actions.append(('call' if to_call else 'check', contributions[player] + min(to_call, left)))
+        if raises < self.max_raises and left > to_call and contributions[opponent] < self.stack:
+            pot = sum(contributions) + to_call
+            targets = {self.stack}
+            for size in self.raise_sizes:
+                raise_by = max(int(size * pot), min_raise)
+                targets.add(min(contributions[player] + to_call + raise_by, self.stack))
+            actions += [('all-in' if target == self.stack else 'raise', target) for target in sorted(targets)]
+
+        children = []
+        for label, target in actions:
+            put_in = target - contributions[player]
+            after = tuple(target if seat == player else contributions[seat] for seat in (0, 1))
+            new_bets = tuple(bets[seat] + put_in if seat == player else bets[seat] for seat in (0, 1))
+            if label == 'fold':
+                children.append(self.add(FOLD, player, street, contributions))
+            elif label in ('check', 'call'):
+                if not acted[opponent]:
+                    # The big blind still has its option after a limp
+                    children.append(self.build(street, after, new_bets, opponent, raises,
+                                               tuple(seat == player or acted[seat] for seat in (0, 1)), min_raise))
+                elif street == 3 or self.stack in after:
+                    children.append(self.add(SHOWDOWN, -1, street, after))
+                else:
+                    children.append(self.build(street + 1, after, (0, 0), 1, 0, (False, False), self.big_blind))
+            else:
+                raised_by = new_bets[player] - new_bets[opponent]
+                children.append(self.build(street, after, new_bets, opponent, raises + 1,
+                                           tuple(seat == player for seat in (0, 1)), max(min_raise, raised_by)))
+        self.actions[node] = tuple(actions)
+        self.children[node] = tuple(children)
+        return node
+
+
+def tree_config(tree):
+    return {'stack': tree.stack, 'small_blind': tree.small_blind, 'big_blind': tree.big_blind,
+            'raise_sizes': list(tree.raise_sizes), 'max_raises': tree.max_raises}
+
+
+_trees = {}
+
+
+def shared_tree(config):
+    # One tree per process and configuration
+    key = json.dumps(config, sort_keys=True)
+    if key not in _trees:
+        _trees[key] = BettingTree(**config)
+    return _trees[key]
+
+
+def equity_bucket(equity, buckets):
+    return min(int(equity * buckets), buckets - 1)
+
+
+def sample_matchups(hole, board, rng, samples):
+    # `samples` random opponent holdings and runouts for one hand, as rows
+    # of 7 card indices for the hero and the opponent
+    hole = card_indices(hole)
+    board = card_indices(board)
+    unseen = np.array(sorted(set(range(52)) - set(hole) - set(board)), dtype=np.intp)
+    needed = 7 - len(board)
+    keys = rng.random((samples, len(unseen)))
+    drawn = unseen[np.argpartition(keys, needed - 1, axis=1)[:, :needed]]
+    boards = np.concatenate([np.broadcast_to(np.array(board, dtype=np.intp), (samples, len(board))),
+                             drawn[:, 2:]], axis=1)
+    hero = np.concatenate([boards, np.broadcast_to(np.array(hole, dtype=np.intp), (samples, 2))], axis=1)
+    return hero, np.concatenate([boards, drawn[:, :2]], axis=1)
+
+
+def sampled_equities(spots, rng, samples):
+    # Equity against one random hand for each (hole, board) spot, with every
+    # sample of every spot ranked in a single batch
+    if not spots:
+        return []
+    matchups = [sample_matchups(hole, board, rng, samples) for hole, board in spots]
+    ranks = evaluate_batch(np.concatenate([rows for pair in matchups for rows in pair]))
+    ranks = ranks.reshape(len(spots), 2, samples)
+    shares = (ranks[:, 0] < ranks[:, 1]) + (ranks[:, 0] == ranks[:, 1]) / 2
+    return shares.mean(axis=1).tolist()
+
+
+def hand_bucket(hole, board, rng, buckets=BUCKETS, samples=EQUITY_SAMPLES):
+    if not board:
+        return equity_bucket(preflop_table().strength(hole, 1), buckets)
+    return equity_bucket(sampled_equities([(hole, board)], rng, samples)[0], buckets)
+
+
+def deal_buckets(holes, board, rng, buckets=BUCKETS, samples=EQUITY_SAMPLES):
+    # Buckets of both hands on every street of a dealt board, and the
+    # showdown result from player 0's side (1 win, 0 tie, -1 loss)
+    table = preflop_table()
+    spots = [(hole, board[:size]) for hole in holes for size in (3, 4, 5)]
+    equities = sampled_equities(spots, rng, samples)
+    result = [[equity_bucket(table.strength(hole, 1), buckets)] for hole in holes]
+    for player in (0, 1):
+        result[player] += [equity_bucket(equity, buckets) for equity in equities[3 * player:3 * player + 3]]
+    first, second = evaluate_batch(np.array([list(holes[0]) + list(board), list(holes[1]) + list(board)])).tolist()
+    return result, (first < second) - (first > second)
+
+
+class Solver:
+    # External-sampling MCCFR over one BettingTree; regrets and strategy
+    # sums are (decision nodes * buckets, actions) float32 arrays
+    def __init__(self, tree, regrets, strategy, buckets=BUCKETS, samples=EQUITY_SAMPLES, seed=None):
+        self.tree = tree
+        self.regrets = regrets
+        self.strategy = strategy
+        self.buckets = buckets
+        self.samples = samples
+        self.rng = np.random.default_rng(seed)
+
+    def iterate(self):
+        cards = self.rng.permutation(52)[:9].tolist()
+        hand_buckets, outcome = deal_buckets((cards[:2], cards[2:4]), cards[4:], self.rng,
+                                             self.buckets, self.samples)
+        for traverser in (0, 1):
+            self.traverse(self.tree.root, traverser, hand_buckets, outcome)
+
+    def current_strategy(self, row, count):
+        regrets = self.regrets[row, :count].tolist()
+        total = sum(regret for regret in regrets if regret > 0)
+        if total <= 0:
+            return [1.0 / count] * count
+        return [regret / total if regret > 0 else 0.0 for regret in regrets]
+
+    def traverse(self, node, traverser, hand_buckets, outcome):
+        tree = self.tree
+        kind = tree.kind[node]
+        if kind == FOLD:
+            loser = tree.player[node]
+            amount = tree.contributions[node][loser]
+            return -amount if loser == traverser else amount
+        if kind == SHOWDOWN:
+            amount = min(tree.contributions[node]) * outcome
+            return amount if traverser == 0 else -amount
+
+        player = tree.player[node]
+        children = tree.children[node]
+        count = len(children)
+        row = tree.decision[node] * self.buckets + hand_buckets[player][tree.street[node]]
+        strategy = self.current_strategy(row, count)
+        if player == traverser:
+            values = [self.traverse(child, traverser, hand_buckets, outcome) for child in children]
+            value = sum(p * v for p, v in zip(strategy, values))
+            # Regret matching+: cumulative regrets never go below zero
+            regrets = self.regrets[row, :count].tolist()
+            self.regrets[row, :count] = [max(r + v - value, 0.0) for r, v in zip(regrets, values)]
+            return value
+        self.strategy[row, :count] += strategy
+        pick = self.rng.random()
+        for child, probability in zip(children, strategy):
+            pick -= probability
+            if pick < 0:
+                break
+        return self.traverse(child, traverser, hand_buckets, outcome)
+
+
+def action_counts(tree):
+    return np.array([len(tree.actions[node]) for node in range(len(tree.kind))
+                     if tree.decision[node] >= 0], dtype=np.intp)
+
+
+def normalised_policy(tree, strategy, buckets):
+    # Average strategy with unreached rows uniform over their node's actions
+    counts = np.repeat(action_counts(tree), buckets)
+    legal = np.arange(strategy.shape[1]) < counts[:, None]
+    totals = strategy.sum(axis=1, keepdims=True)
+    uniform = legal / counts[:, None]
+    return np.where(totals > 0, strategy / np.where(totals > 0, totals, 1), uniform).astype(np.float32)
+
+
+def exploitability(tree, policy, buckets=BUCKETS, deals=1000, samples=EQUITY_SAMPLES, seed=0):
+    # Average gain of a best response against each side of `policy`, in
+    # chips per hand, over a fixed sample of deals. The best response sees
+    # its own bucket per street, as the policy does, so this measures
+    # exploitability within the abstraction.
+    rng = np.random.default_rng(seed)
+    hand_buckets = np.zeros((deals, 2, 4), dtype=np.intp)
+    outcomes = np.zeros(deals)
+    for deal in range(deals):
+        cards = rng.permutation(52)[:9].tolist()
+        dealt, outcomes[deal] = deal_buckets((cards[:2], cards[2:4]), cards[4:], rng, buckets, samples)
+        hand_buckets[deal] = dealt
+    columns = np.arange(deals)
+
+    def walk(node, reach, responder):
+        kind = tree.kind[node]
+        if kind == FOLD:
+            loser = tree.player[node]
+            amount = tree.contributions[node][loser]
+            return reach * (-amount if loser == responder else amount)
+        if kind == SHOWDOWN:
+            amount = min(tree.contributions[node]) * outcomes
+            return reach * (amount if responder == 0 else -amount)
+        player = tree.player[node]
+        bucket = hand_buckets[:, player, tree.street[node]]
+        children = tree.children[node]
+        if player == responder:
+            values = np.array([walk(child, reach, responder) for child in children])
+            totals = np.array([np.bincount(bucket, weights=row, minlength=buckets) for row in values])
+            return values[totals.argmax(axis=0)[bucket], columns]
+        probabilities = policy[tree.decision[node] * buckets + bucket]
+        value = np.zeros(deals)
+        for action, child in enumerate(children):
+            child_reach = reach * probabilities[:, action]
+            if child_reach.any():
+                value += walk(child, child_reach, responder)
+        return value
+
+    gains = [walk(tree.root, np.ones(deals), responder).mean() for responder in (0, 1)]
+    return sum(gains) / 2
+
+
+def train_chunk(spec):
+    # Worker entry point: runs iterations on copies of the tables and
+    # returns how much they changed
+    config, buckets, samples, regrets, strategy, seed, iterations = spec
+    solver = Solver(shared_tree(config), regrets.copy(), strategy.copy(), buckets, samples, seed)
+    for _ in range(iterations):
+        solver.iterate()
+    return solver.regrets - regrets, solver.strategy - strategy
+
+
+class Trainer:
+    def __init__(self, directory, tree=None, buckets=BUCKETS, samples=EQUITY_SAMPLES, seed=0):
+        # Opens the training run in `directory`, creating it when needed.
+        # An existing run keeps its own abstraction settings.
+        self.directory = directory
+        self.meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.meta = json.load(f)
+            mode = 'r+'
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.meta = {'tree': tree_config(tree or BettingTree()), 'buckets': buckets, 'samples': samples,
+                         'seed': seed, 'iterations': 0, 'seconds': 0.0}
+            mode = 'w+'
+        self.tree = shared_tree(self.meta['tree'])
+        self.buckets = self.meta['buckets']
+        self.samples = self.meta['samples']
+        shape = (self.tree.num_decisions * self.buckets, self.tree.max_actions)
+        self.regrets = np.lib.format.open_memmap(os.path.join(directory, 'regrets.npy'), mode=mode,
+                                                 dtype=np.float32, shape=shape)
+        self.strategy = np.lib.format.open_memmap(os.path.join(directory, 'strategy.npy'), mode=mode,
+                                                  dtype=np.float32, shape=shape)
+        if mode == 'w+':
+            self.checkpoint()
+
+    @property
+    def iterations(self):
+        return self.meta['iterations']
+
+    def checkpoint(self):
+        # Only the pages of the tables touched since the last flush are written
+        self.regrets.flush()
+        self.strategy.flush()
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def policy(self):
+        return normalised_policy(self.tree, self.strategy, self.buckets)
+
+    def exploitability(self, deals=1000):
+        return exploitability(self.tree, self.policy(), self.buckets, deals, self.samples)
+
+    def train(self, iterations, workers=1, chunk=500, checkpoint_every=5000, report_every=None,
+              report_deals=500, sink=print):
+        # Runs `iterations` more iterations in rounds of `chunk` per worker
+        done = 0
+        since_checkpoint = 0
+        since_report = 0
+        executor = None
+        if workers > 1:
+            # Load the evaluator before the pool starts so forked workers inherit it
+            get_evaluator()
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while done < iterations:
+                start = time.perf_counter()
+                round_size = min(chunk * workers, iterations - done)
+                sizes = [round_size // workers + (1 if i < round_size % workers else 0) for i in range(workers)]
+                seeds = [(self.meta['seed'], self.iterations, worker) for worker in range(workers)]
+                if executor is None:
+                    # Plain ndarray views of the memory maps index much faster
+                    solver = Solver(self.tree, np.asarray(self.regrets), np.asarray(self.strategy),
+                                    self.buckets, self.samples, seeds[0])
+                    for _ in range(round_size):
+                        solver.iterate()
+                else:
+                    specs = [(self.meta['tree'], self.buckets, self.samples, np.asarray(self.regrets),
+                              np.asarray(self.strategy), seed, size) for seed, size in zip(seeds, sizes) if size]
+                    for regret_delta, strategy_delta in executor.map(train_chunk, specs):
+                        self.regrets += regret_delta
+                        self.strategy += strategy_delta
+                    np.maximum(self.regrets, 0, out=self.regrets)
+                elapsed = time.perf_counter() - start
+                done += round_size
+                since_checkpoint += round_size
+                since_report += round_size
+                self.meta['iterations'] += round_size
+                self.meta['seconds'] += elapsed
+                if since_checkpoint >= checkpoint_every or done >= iterations:
+                    self.checkpoint()
+                    since_checkpoint = 0
+                if sink is not None and report_every and (since_report >= report_every or done >= iterations):
+                    value = self.exploitability(report_deals)
+                    sink(f"{self.iterations} iterations, {round_size / elapsed:.0f} it/s, "
+                         f"exploitability {value:.2f} chips/hand ({value / self.tree.big_blind * 1000:.0f} mbb/hand)")
+                    since_report = 0
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self
+
+    def export(self, path):
+        save_policy(path, self.tree, self.policy(), self.buckets, self.samples)
+
+
+def save_policy(path, tree, policy, buckets, samples):
+    config = {'tree': tree_config(tree), 'buckets': buckets, 'samples': samples}
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, policy=policy.astype(np.float16), config=json.dumps(config))
+
+
+class Policy:
+    def __init__(self, tree, policy, buckets=BUCKETS, samples=EQUITY_SAMPLES):
+        self.tree = tree
+        self.policy = policy
+        self.buckets = buckets
+        self.samples = samples
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            config = json.loads(str(data['config']))
+            policy = data['policy'].astype(np.float32)
+        return cls(shared_tree(config['tree']), policy, config['buckets'], config['samples'])
+
+    def probabilities(self, node, bucket):
+        count = len(self.tree.children[node])
+        return self.policy[self.tree.decision[node] * self.buckets + bucket, :count]
+
+
+class PolicyProvider:
+    # Action provider that plays a trained policy heads-up. The hand so far
+    # is mapped onto the betting tree, matching each bet or raise to the
+    # abstract size closest to it; multiway pots and hands that leave the
+    # tree fall back to the threshold bot.
+    def __init__(self, policy, fallback=bot_provider):
+        self.policy = Policy.load(policy) if isinstance(policy, str) else policy
+        self.fallback = fallback
+
+    def locate(self, state):
+        tree = self.policy.tree
+        if len(state.players) != 2:
+            return None
+        button = state.small_blind_seat
+        totals = [0, 0]
+        node = tree.root
+        for event in state.events:
+            player = 0 if event.seat == button else 1
+            totals[player] += event.amount
+            if event.action in ('small blind', 'big blind'):
+                continue
+            if (tree.kind[node] != DECISION or tree.player[node] != player
+                    or tree.street[node] != STREETS.index(event.street)):
+                return None
+            node = self.follow(node, event.action, totals[player])
+            if node is None:
+                return None
+        actor = 0 if state.actor == button else 1
+        if (tree.kind[node] != DECISION or tree.player[node] != actor
+                or tree.street[node] != STREETS.index(state.street)):
+            return None
+        return node
+
+    def follow(self, node, action, total):
+        tree = self.policy.tree
+        options = list(zip(tree.actions[node], tree.children[node]))
+        if action == 'fold':
+            matches = [child for (label, _), child in options if label == 'fold']
+        elif action in ('check', 'call'):
+            matches = [child for (label, _), child in options if label in ('check', 'call')]
+        else:
+            raises = [(abs(target - total), child) for (label, target), child in options
+                      if label in ('raise', 'all-in')]
+            matches = [min(raises)[1]] if raises else []
+        return matches[0] if matches else None
+
+    def __call__(self, game, player, current_bet):
+        state = game.state
+        node = self.locate(state)
+        if node is None:
+            return self.fallback(game, player, current_bet)
+        if game.equity_rng is None:
+            game.equity_rng = np.random.default_rng(game.rng.getrandbits(64))
+        bucket = hand_bucket(player.hand, game.community_cards, game.equity_rng,
+                             self.policy.buckets, self.policy.samples)
+        probabilities = self.policy.probabilities(node, bucket).tolist()
+        pick = game.rng.random() * sum(probabilities)
+        for (label, target), probability in zip(self.policy.tree.actions[node], probabilities):
+            pick -= probability
+            if pick < 0:
+                break
+        to_call = state.to_call()
+        if label in ('fold', 'check', 'call'):
+            if to_call == 0:
+                return 'check', None
+            return ('fold' if label == 'fold' else 'call'), None
+        increment = target - player.total_bet - to_call
+        return ('bet' if state.current_bet == 0 else 'raise'), max(increment, 0)
+
+
+def play_policy(policy, hands=1000, seed=0):
+    # Heads-up match of the policy against the threshold bot, rebuying both
+    # when one goes broke; returns the policy's net chips
+    game = Game.headless(['Policy', 'Threshold'], STACK, rng=random.Random(seed))
+    game.players[0].provider = PolicyProvider(policy)
+    return sum(result.chips['Policy'] - STACK for result in game.play_hands(hands))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train heads-up strategies with Monte Carlo CFR")
+    commands = parser.add_subparsers(dest='command', required=True)
+    train = commands.add_parser('train', help="train, or resume training, in a directory")
+    train.add_argument('directory')
+    train.add_argument('--iterations', type=int, default=10000)
+    train.add_argument('--workers', type=int, default=1)
+    train.add_argument('--chunk', type=int, default=500, help="iterations per worker between merges")
+    train.add_argument('--checkpoint-every', type=int, default=5000)
+    train.add_argument('--report-every', type=int, default=5000)
+    train.add_argument('--buckets', type=int, default=BUCKETS, help="equity buckets per street (new runs)")
+    train.add_argument('--max-raises', type=int, default=MAX_RAISES, help="raises per street (new runs)")
+    train.add_argument('--seed', type=int, default=0)
+    export = commands.add_parser('export', help="write the average strategy as a policy file")
+    export.add_argument('directory')
+    export.add_argument('path')
+    play = commands.add_parser('play', help="play a policy against the threshold bot")
+    play.add_argument('path')
+    play.add_argument('--hands', type=int, default=2000)
+    play.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        trainer = Trainer(args.directory, BettingTree(max_raises=args.max_raises), args.buckets, seed=args.seed)
+        trainer.train(args.iterations, args.workers, args.chunk, args.checkpoint_every, args.report_every)
+    elif args.command == 'export':
+        Trainer(args.directory).export(args.path)
+        print(f"Wrote {args.path}")
+    else:
+        net = play_policy(Policy.load(args.path), args.hands, args.seed)
+        print(f"Policy vs threshold bot: {net:+d} chips over {args.hands} hands "
+              f"({net / BIG_BLIND / args.hands * 100:+.1f} bb/100)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,32 @@
 # game/deck.py
 
 import random
-from .card import Card
+from .card import CARDS
 
 class Deck:
-    def __init__(self):
-        self.cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        self.order = list(range(len(CARDS)))
+        self.position = 0
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        # Shuffles the card indices in place and resets the cursor, so a deck
+        # can be reused for every hand without rebuilding anything
+        self.rng.shuffle(self.order)
+        self.position = 0
 
     def deal(self, num_cards=1):
-        if num_cards > len(self.cards):
+        end = self.position + num_cards
+        if end > len(self.order):
             raise ValueError("Not enough cards left to deal")
-        dealt_cards = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
+        dealt_cards = [CARDS[index] for index in self.order[self.position:end]]
+        self.position = end
         return dealt_cards
 
+    @property
+    def cards(self):
+        return [CARDS[index] for index in self.order[self.position:]]
+
     def __len__(self):
-        return len(self.cards)
\ No newline at end of file
+        return len(self.order) - self.position
@@ -0,0 +1,127 @@
+# game/duplicate.py
+#
+# Duplicate poker for comparing two action providers heads-up. Every deal is
+# played twice from equal stacks: once with provider A in the first seat and
+# once with the providers swapped. Both halves share a seed, so the cards
+# (and any bot randomness up to the first differing decision) are the same.
+# Whatever the cards gave one seat they gave the other player in the mirrored
+# half. Card luck therefore cancels out of each pair, and the difference
+# between the providers shows up in far fewer hands than in ordinary play.
+#
+#     python -m game.duplicate --a threshold --b caller --deals 5000
+#     python -m game.duplicate --a policy.npz --b threshold
+
+import argparse
+import math
+import random
+import time
+
+from .game import Game
+from .providers import bot_provider, callback_provider
+
+BIG_BLIND = 10
+
+
+class DuplicateResult:
+    def __init__(self, pairs, singles):
+        self.pairs = pairs  # Per deal: A's average result over the two halves
+        self.singles = singles  # Per deal: A's result in the first half only
+        self.deals = len(pairs)
+
+    @property
+    def mean(self):
+        # A's expected chips per hand against B
+        return sum(self.pairs) / self.deals
+
+    @property
+    def std_error(self):
+        return standard_error(self.pairs)
+
+    @property
+    def unpaired_std_error(self):
+        # What the same number of hands would give without mirroring; the
+        # first halves alone are ordinary heads-up play
+        return standard_error(self.singles) / math.sqrt(2)
+
+    @property
+    def bb_per_100(self):
+        return self.mean / BIG_BLIND * 100
+
+    def __repr__(self):
+        return (f"DuplicateResult(deals={self.deals}, bb_per_100={self.bb_per_100:.1f}, "
+                f"std_error={self.std_error / BIG_BLIND * 100:.1f})")
+
+
+def standard_error(values):
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    return math.sqrt(variance / len(values))
+
+
+def play_deal(first, second, seed, dealer, starting_chips):
+    # Chips won by the provider in the first seat over a single hand
+    game = Game.headless(['Seat1', 'Seat2'], starting_chips, rng=random.Random(seed))
+    game.players[0].provider = first
+    game.players[1].provider = second
+    game.dealer_index = dealer
+    game.play(max_hands=1)
+    return game.roster[0].chips - starting_chips
+
+
+def duplicate_match(provider_a, provider_b, deals, seed=0, starting_chips=1000):
+    rng = random.Random(seed)
+    pairs = []
+    singles = []
+    for deal in range(deals):
+        deal_seed = rng.getrandbits(64)
+        dealer = deal % 2
+        straight = play_deal(provider_a, provider_b, deal_seed, dealer, starting_chips)
+        mirrored = -play_deal(provider_b, provider_a, deal_seed, dealer, starting_chips)
+        pairs.append((straight + mirrored) / 2)
+        singles.append(straight)
+    return DuplicateResult(pairs, singles)
+
+
+def calling_station(game, player, current_bet):
+    return 'call'
+
+
+def provider_from_spec(spec):
+    # 'threshold' (the built-in bot), 'caller' (never folds or raises) or the
+    # path of a policy exported by game.cfr
+    if spec == 'threshold':
+        return bot_provider
+    if spec == 'caller':
+        return callback_provider(calling_station)
+    if spec.endswith('.npz'):
+        from .cfr import PolicyProvider
+        return PolicyProvider(spec)
+    raise ValueError(f"Unknown provider {spec!r}; expected threshold, caller or a policy .npz path")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Duplicate heads-up match between two providers")
+    parser.add_argument('--a', default='threshold', help="threshold, caller or a policy .npz")
+    parser.add_argument('--b', default='caller', help="threshold, caller or a policy .npz")
+    parser.add_argument('--deals', type=int, default=2000, help="deals, each played twice")
+    parser.add_argument('--chips', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = duplicate_match(provider_from_spec(args.a), provider_from_spec(args.b), args.deals,
+                             args.seed, args.chips)
+    elapsed = time.perf_counter() - start
+    scale = 100 / BIG_BLIND
+    print(f"{args.a} vs {args.b}: {result.bb_per_100:+.1f} bb/100 over {2 * result.deals} hands "
+          f"({elapsed:.1f}s)")
+    print(f"std error {result.std_error * scale:.1f} bb/100 duplicate, "
+          f"{result.unpaired_std_error * scale:.1f} bb/100 unpaired")
+    if result.std_error:
+        print(f"mirroring is worth {(result.unpaired_std_error / result.std_error) ** 2:.1f}x as many hands")
+
+
+if __name__ == "__main__":
+    main()
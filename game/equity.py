@@ -0,0 +1,79 @@
+# game/equity.py
+#
+# Monte Carlo equity estimation. Trials are run in NumPy batches: the unseen
+# cards are sampled in bulk and every 7-card hand in the batch is ranked with
+# the batch evaluator, so no per-trial Python loop is needed.
+
+import time
+
+import numpy as np
+
+from .card import Card
+from .evaluator import evaluate_batch
+
+MAX_OPPONENTS = 9
+
+
+class EquityResult:
+    def __init__(self, win, tie, equity, trials):
+        self.win = win
+        self.tie = tie
+        self.equity = equity  # Win probability plus each tie's share of the pot
+        self.trials = trials
+
+    def __repr__(self):
+        return f"EquityResult(win={self.win:.4f}, tie={self.tie:.4f}, equity={self.equity:.4f}, trials={self.trials})"
+
+
+def card_indices(cards):
+    return [card.index if isinstance(card, Card) else int(card) for card in cards]
+
+
+def estimate_equity(hole_cards, board=(), num_opponents=1, trials=10000, time_budget=None,
+                    batch_size=1024, rng=None):
+    # Estimates how often hole_cards win or tie against num_opponents random
+    # hands over random runouts of the board. Stops after `trials` trials or
+    # once `time_budget` seconds have passed, whichever comes first; at least
+    # one batch is always run.
+    if not 1 <= num_opponents <= MAX_OPPONENTS:
+        raise ValueError(f"num_opponents must be between 1 and {MAX_OPPONENTS}")
+    hole = card_indices(hole_cards)
+    known_board = card_indices(board)
+    if len(hole) != 2 or len(known_board) > 5 or len(set(hole + known_board)) != len(hole) + len(known_board):
+        raise ValueError("Expected two hole cards and up to five distinct board cards")
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    unseen = np.array(sorted(set(range(52)) - set(hole + known_board)), dtype=np.intp)
+    to_come = 5 - len(known_board)
+    needed = to_come + 2 * num_opponents
+    hole = np.array(hole, dtype=np.intp)
+    known_board = np.array(known_board, dtype=np.intp)
+
+    wins = ties = 0
+    shares = 0.0
+    done = 0
+    while done < trials:
+        size = min(batch_size, trials - done)
+        # The first `needed` columns of a random argpartition are a uniform
+        # sample without replacement of the unseen cards
+        keys = rng.random((size, len(unseen)))
+        drawn = unseen[np.argpartition(keys, needed - 1, axis=1)[:, :needed]]
+        boards = np.concatenate([np.broadcast_to(known_board, (size, len(known_board))),
+                                 drawn[:, :to_come]], axis=1)
+        hero = evaluate_batch(np.concatenate([boards, np.broadcast_to(hole, (size, 2))], axis=1))
+        opponents = np.empty((size, num_opponents), dtype=hero.dtype)
+        for i in range(num_opponents):
+            start = to_come + 2 * i
+            opponents[:, i] = evaluate_batch(np.concatenate([boards, drawn[:, start:start + 2]], axis=1))
+        best = opponents.min(axis=1)
+        won = hero < best
+        tied = hero == best
+        wins += int(won.sum())
+        ties += int(tied.sum())
+        tied_with = (opponents == hero[:, None]).sum(axis=1)
+        shares += float((1.0 / (tied_with[tied] + 1)).sum())
+        done += size
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return EquityResult(wins / done, ties / done, (wins + shares) / done, done)
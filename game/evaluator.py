@@ -0,0 +1,281 @@
+# game/evaluator.py
+#
+# Table-driven hand evaluator for 5-7 cards that returns the same ranks as
+# treys (1 is a royal flush, 7462 the worst high card) without enumerating
+# 5-card subsets.
+#
+# Every card carries an additive key: a rank key chosen so that the sum over
+# any hand of up to seven cards identifies its rank multiset uniquely, and a
+# suit key whose sum tells whether (and in which suit) the hand holds a flush.
+# A flush is then ranked by its 13-bit rank mask, anything else by its rank
+# sum, each with a single table lookup. evaluate() ranks one hand;
+# evaluate_batch() ranks an (n, 7) array of card indices with NumPy.
+#
+# Building the tables takes the better part of a second, so the first build
+# is written to a cache file ($POKER_CACHE_DIR, by default
+# ~/.cache/poker_game) and later processes memory-map it instead. Processes
+# started on the same machine share the mapped pages through the OS page
+# cache, and workers forked after get_evaluator() inherit the tables as-is.
+# The file header carries a digest of the card keys and of the treys sources
+# the tables come from, so a file written under other keys or another treys
+# release is rebuilt rather than trusted.
+
+import bisect
+import hashlib
+import importlib.util
+import itertools
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .card import CARDS
+
+RANK_KEYS = [0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181]
+SUIT_KEYS = [0, 1, 8, 57]
+SUIT_BITS = 9  # Seven suit keys sum to at most 399, which fits below the rank sum
+
+MAX_RANKS = [1, 10, 166, 322, 1599, 1609, 2467, 3325, 6185, 7462]
+CLASS_NAMES = ["Royal Flush", "Straight Flush", "Four of a Kind", "Full House", "Flush",
+               "Straight", "Three of a Kind", "Two Pair", "Pair", "High Card"]
+
+CARD_KEYS = [RANK_KEYS[card.index % 13] << SUIT_BITS | SUIT_KEYS[card.index // 13] for card in CARDS]
+RANK_BITS = [1 << (card.index % 13) for card in CARDS]
+
+TABLES_MAGIC = b'EVTB'
+TABLES_VERSION = 2
+# magic, version, padding, fingerprint, lengths of the sized sections
+TABLES_HEADER = struct.Struct('<4sHH16s5I')
+TABLES_FILE = f'evaluator-v{TABLES_VERSION}.bin'
+
+def five_card_tables():
+    # Rank of every 5-card flush by rank mask and of every other 5-card hand
+    # by rank multiset, taken from the treys lookup tables
+    from treys.lookup import LookupTable
+
+    table = LookupTable()
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+    flushes = {}
+    for ranks in itertools.combinations(range(13), 5):
+        product = 1
+        for rank in ranks:
+            product *= primes[rank]
+        flushes[sum(1 << rank for rank in ranks)] = table.flush_lookup[product]
+    unsuited = {}
+    for ranks in itertools.combinations_with_replacement(range(13), 5):
+        if max(ranks.count(rank) for rank in ranks) <= 4:
+            product = 1
+            for rank in ranks:
+                product *= primes[rank]
+            unsuited[ranks] = table.unsuited_lookup[product]
+    return flushes, unsuited
+
+
+def tables_fingerprint():
+    # Hashes the treys sources from their files, without importing treys
+    digest = hashlib.sha256(repr((RANK_KEYS, SUIT_KEYS, SUIT_BITS)).encode())
+    treys_dir = os.path.dirname(importlib.util.find_spec('treys').origin)
+    for name in ('card.py', 'lookup.py'):
+        with open(os.path.join(treys_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.digest()[:16]
+
+
+def build_tables():
+    flushes, unsuited = five_card_tables()
+
+    # Flush ranks for every mask of 5-7 ranks: the best 5-rank subset
+    flush = np.zeros(1 << 13, dtype=np.uint16)
+    for mask, rank in flushes.items():
+        flush[mask] = rank
+    for size in (6, 7):
+        for ranks in itertools.combinations(range(13), size):
+            mask = sum(1 << rank for rank in ranks)
+            flush[mask] = min(flush[mask & ~(1 << rank)] for rank in ranks)
+
+    # Non-flush ranks by rank sum. The best hand among n cards is the best
+    # among the hands with one card removed, so sizes build on each other.
+    by_multiset = dict(unsuited)
+    rank_sums = [{}, {}, {}]
+    for ranks, rank in unsuited.items():
+        rank_sums[0][sum(RANK_KEYS[r] for r in ranks)] = rank
+    for position, size in enumerate((6, 7), start=1):
+        for ranks in itertools.combinations_with_replacement(range(13), size):
+            if max(ranks.count(rank) for rank in ranks) > 4:
+                continue
+            best = min(by_multiset[ranks[:i] + ranks[i + 1:]] for i in range(size)
+                       if i == 0 or ranks[i] != ranks[i - 1])
+            by_multiset[ranks] = best
+            rank_sums[position][sum(RANK_KEYS[r] for r in ranks)] = best
+    seven = np.zeros(max(rank_sums[2]) + 1, dtype=np.uint16)
+    seven[list(rank_sums[2])] = list(rank_sums[2].values())
+
+    # Flush suit (or -1) for every suit-key sum, per hand size
+    flush_suits = np.full((8, 7 * SUIT_KEYS[-1] + 1), -1, dtype=np.int8)
+    for size in (5, 6, 7):
+        for counts in itertools.product(range(size + 1), repeat=4):
+            if sum(counts) == size:
+                suit_sum = sum(count * key for count, key in zip(counts, SUIT_KEYS))
+                flush_suits[size, suit_sum] = next((suit for suit, count in enumerate(counts) if count >= 5), -1)
+    return flush, seven, rank_sums[0], rank_sums[1], flush_suits
+
+
+def tables_path():
+    cache_dir = os.environ.get('POKER_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'poker_game')
+    return os.path.join(cache_dir, TABLES_FILE)
+
+
+def table_sections(tables):
+    flush, seven, five, six, flush_suits = tables
+    five_sums = sorted(five)
+    six_sums = sorted(six)
+    return [flush.astype('<u2'), flush_suits.astype('i1').ravel(),
+            np.array(five_sums, dtype='<i8'), np.array([five[key] for key in five_sums], dtype='<u2'),
+            np.array(six_sums, dtype='<i8'), np.array([six[key] for key in six_sums], dtype='<u2'),
+            seven.astype('<u2')]
+
+
+def write_tables(tables, path):
+    # Header, then each array padded to an 8-byte boundary so the mapped
+    # views stay aligned
+    sections = table_sections(tables)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(TABLES_HEADER.pack(TABLES_MAGIC, TABLES_VERSION, 0, tables_fingerprint(),
+                                   *(len(section) for section in sections[2:])))
+        f.write(bytes(-TABLES_HEADER.size % 8))
+        for section in sections:
+            f.write(section.tobytes())
+            f.write(bytes(-section.nbytes % 8))
+    os.replace(tmp_path, path)
+
+
+def read_tables(path):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < TABLES_HEADER.size:
+        raise ValueError(f"{path} is not an evaluator table file")
+    magic, version, _, fingerprint, *lengths = TABLES_HEADER.unpack_from(buffer)
+    if magic != TABLES_MAGIC or version != TABLES_VERSION:
+        raise ValueError(f"{path} is not an evaluator table file")
+    if fingerprint != tables_fingerprint():
+        raise ValueError(f"{path} was built from other card keys or treys tables")
+    layout = [('<u2', 1 << 13), ('i1', 8 * (7 * SUIT_KEYS[-1] + 1))]
+    layout += list(zip(['<i8', '<u2', '<i8', '<u2', '<u2'], lengths))
+    offset = TABLES_HEADER.size + (-TABLES_HEADER.size % 8)
+    sections = []
+    for dtype, count in layout:
+        size = np.dtype(dtype).itemsize * count
+        if offset + size > len(buffer):
+            raise ValueError(f"{path} is truncated")
+        sections.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=offset))
+        offset += size + (-size % 8)
+    flush, flush_suits, five_sums, five_ranks, six_sums, six_ranks, seven = sections
+    five = dict(zip(five_sums.tolist(), five_ranks.tolist()))
+    six = dict(zip(six_sums.tolist(), six_ranks.tolist()))
+    return flush, seven, five, six, flush_suits.reshape(8, -1)
+
+
+def cached_tables(path=None):
+    # Tables from the cache file, building (and caching) them when it is
+    # missing or stale. An unwritable cache only costs the rebuild.
+    path = path or tables_path()
+    try:
+        return read_tables(path)
+    except (OSError, ValueError):
+        pass
+    tables = build_tables()
+    try:
+        write_tables(tables, path)
+    except OSError:
+        pass
+    return tables
+
+
+class HandEvaluator:
+    def __init__(self, tables=None):
+        self.flush, self.seven, five, six, self.flush_suits = tables or build_tables()
+        # Plain Python containers for the scalar path, NumPy arrays for batches
+        self.flush_list = self.flush.tolist()
+        self.flush_suit_lists = self.flush_suits.tolist()
+        self.rank_sums = {5: five, 6: six}
+        # 5- and 6-card rank sums as sorted arrays, for batches of partial boards
+        self.sorted_sums = {}
+        for size, table in self.rank_sums.items():
+            sums = np.array(sorted(table), dtype=np.int64)
+            self.sorted_sums[size] = (sums, np.array([table[key] for key in sums.tolist()], dtype=np.uint16))
+        self.card_keys = np.array(CARD_KEYS, dtype=np.int64)
+        self.suits = np.array([card.index // 13 for card in CARDS], dtype=np.int8)
+        self.rank_bits = np.array(RANK_BITS, dtype=np.int32)
+
+    def evaluate(self, cards):
+        # cards: 5-7 Card objects or card indices
+        indices = [card if isinstance(card, int) else card.index for card in cards]
+        key = 0
+        for index in indices:
+            key += CARD_KEYS[index]
+        suit = self.flush_suit_lists[len(indices)][key & ((1 << SUIT_BITS) - 1)]
+        if suit >= 0:
+            mask = 0
+            for index in indices:
+                if index // 13 == suit:
+                    mask |= RANK_BITS[index]
+            return self.flush_list[mask]
+        if len(indices) == 7:
+            return int(self.seven[key >> SUIT_BITS])
+        return self.rank_sums[len(indices)][key >> SUIT_BITS]
+
+    def evaluate_batch(self, hands):
+        # hands: integer array of card indices with shape (n, 5), (n, 6) or (n, 7)
+        hands = np.asarray(hands, dtype=np.intp)
+        if hands.ndim != 2 or not 5 <= hands.shape[1] <= 7:
+            raise ValueError("evaluate_batch expects an (n, 5-7) array of card indices")
+        size = hands.shape[1]
+        keys = self.card_keys[hands].sum(axis=1)
+        suits = self.flush_suits[size, keys & ((1 << SUIT_BITS) - 1)]
+        if size == 7:
+            ranks = self.seven[keys >> SUIT_BITS]
+        else:
+            # Flush hands may have no entry; they are ranked by mask below
+            sums, values = self.sorted_sums[size]
+            ranks = values[np.minimum(np.searchsorted(sums, keys >> SUIT_BITS), len(sums) - 1)]
+        flushed = np.flatnonzero(suits >= 0)
+        if len(flushed):
+            flush_hands = hands[flushed]
+            in_suit = self.suits[flush_hands] == suits[flushed, None]
+            masks = np.bitwise_or.reduce(np.where(in_suit, self.rank_bits[flush_hands], 0), axis=1)
+            ranks[flushed] = self.flush[masks]
+        return ranks.astype(np.int32)
+
+
+def rank_class(rank):
+    return bisect.bisect_left(MAX_RANKS, rank)
+
+
+def class_to_string(hand_class):
+    return CLASS_NAMES[hand_class]
+
+
+def hand_name(rank):
+    return CLASS_NAMES[bisect.bisect_left(MAX_RANKS, rank)]
+
+
+_evaluator = None
+
+
+def get_evaluator():
+    # Tables are loaded on first use and shared by everything in the process
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = HandEvaluator(cached_tables())
+    return _evaluator
+
+
+def evaluate(cards):
+    return get_evaluator().evaluate(cards)
+
+
+def evaluate_batch(hands):
+    return get_evaluator().evaluate_batch(hands)
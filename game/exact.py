@@ -0,0 +1,177 @@
+# game/exact.py
+#
+# Exact heads-up equity on the flop, turn and river. Every runout of the
+# board is enumerated against every opponent holding, which is small enough
+# once the flop is out: at most 1081 runouts x 1081 holdings. Evaluation is
+# incremental: the evaluator's card keys are additive and flushes are ranked
+# by per-suit rank masks, so each runout's key and masks are computed once
+# and every opponent holding is added to them in a single NumPy step instead
+# of re-ranking seven cards from scratch.
+#
+# The opponent's holdings can be weighted by a range, given per hand class
+# (169 weights, see game.preflop) or per combination (1326 weights, in
+# COMBOS order).
+
+import functools
+import itertools
+
+import numpy as np
+
+from .equity import EquityResult, card_indices
+from .evaluator import CARD_KEYS, RANK_BITS, SUIT_BITS, get_evaluator
+from .preflop import NUM_CLASSES, class_cards, hand_class, preflop_table
+
+COMBOS = np.array(list(itertools.combinations(range(52), 2)), dtype=np.intp)
+COMBO_CLASSES = np.array([hand_class(combo) for combo in COMBOS], dtype=np.intp)
+SUIT_MASK = (1 << SUIT_BITS) - 1
+
+
+class ExactResult(EquityResult):
+    def __init__(self, win, tie, equity, matchups, card_equity):
+        super().__init__(win, tie, equity, matchups)
+        self.card_equity = card_equity  # Next board card -> equity once it is dealt
+
+    @property
+    def outs(self):
+        # Next cards that leave the hero ahead of the range
+        return sorted(card for card, equity in self.card_equity.items() if equity > 0.5)
+
+    def __repr__(self):
+        return (f"ExactResult(win={self.win:.4f}, tie={self.tie:.4f}, equity={self.equity:.4f}, "
+                f"matchups={self.trials}, outs={len(self.outs)})")
+
+
+def card_table(cards):
+    # Rank and suit halves of the additive keys, per-suit rank masks and a
+    # 52-bit card set for rows of cards. Keeping the halves apart lets the
+    # large grids be summed in 32 bits.
+    cards = np.asarray(cards, dtype=np.intp).reshape(len(cards), -1)
+    keys = np.array(CARD_KEYS, dtype=np.int64)[cards].sum(axis=1)
+    rank_keys = (keys >> SUIT_BITS).astype(np.int32)
+    suit_keys = (keys & SUIT_MASK).astype(np.int16)
+    masks = np.zeros((len(cards), 4), dtype=np.intp)
+    bits = np.zeros(len(cards), dtype=np.uint64)
+    rank_bits = np.array(RANK_BITS, dtype=np.intp)
+    for column in cards.T:
+        masks[np.arange(len(cards)), column // 13] |= rank_bits[column]
+        bits |= np.left_shift(np.uint64(1), column.astype(np.uint64))
+    return rank_keys, suit_keys, masks, bits
+
+
+@functools.lru_cache(maxsize=1)
+def combo_table():
+    return card_table(COMBOS)
+
+
+def rank_grid(evaluator, rank_keys, suit_keys, masks, extra_masks=None):
+    # Ranks of 7-card hands given their summed keys; for a flush the rank
+    # mask of the flush suit is the OR of the partial masks. Holdings that
+    # collide with a runout give meaningless keys, which are clipped into
+    # range here and masked out by the caller.
+    ranks = np.take(evaluator.seven, rank_keys, mode='clip').astype(np.int32)
+    suits = np.take(evaluator.flush_suits[7], suit_keys, mode='clip')
+    flushed = np.nonzero(suits >= 0)
+    if len(flushed[0]):
+        suit = suits[flushed]
+        if extra_masks is None:
+            mask = masks[flushed[0], suit]
+        else:
+            mask = masks[flushed[0], suit] | extra_masks[flushed[1], suit]
+        ranks[flushed] = evaluator.flush[mask]
+    return ranks
+
+
+def range_weights(weights):
+    # Per-combination weights from 169 class weights or 1326 combination weights
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(weights) == NUM_CLASSES:
+        return weights[COMBO_CLASSES]
+    if len(weights) == len(COMBOS):
+        return weights
+    raise ValueError(f"A range needs {NUM_CLASSES} class weights or {len(COMBOS)} combination weights")
+
+
+def top_range(fraction, num_opponents=1):
+    # Weights for the strongest `fraction` of starting hands by pre-flop equity
+    table = preflop_table()
+    if table is None:
+        raise ValueError("top_range needs the pre-flop equity table")
+    strengths = np.array([table.strength(class_cards(index), num_opponents) for index in range(NUM_CLASSES)])
+    return (strengths >= 1 - fraction).astype(np.float64)
+
+
+def exact_equity(hole_cards, board, weights=None):
+    # Exact equity of hole_cards against one opponent holding drawn from the
+    # (optionally weighted) range, over every runout of a 3-5 card board
+    hole = card_indices(hole_cards)
+    known = card_indices(board)
+    if len(hole) != 2 or not 3 <= len(known) <= 5 or len(set(hole + known)) != len(hole) + len(known):
+        raise ValueError("Expected two hole cards and three to five distinct board cards")
+    if weights is None:
+        return cached_equity(tuple(sorted(hole)), tuple(sorted(known)))
+    return enumerate_equity(hole, known, range_weights(weights))
+
+
+@functools.lru_cache(maxsize=4096)
+def cached_equity(hole, board):
+    return enumerate_equity(list(hole), list(board), None)
+
+
+def enumerate_equity(hole, board, weights):
+    evaluator = get_evaluator()
+    dead = set(hole + board)
+    unseen = [card for card in range(52) if card not in dead]
+
+    # Opponent holdings that do not collide with the known cards
+    combo_ranks, combo_suits, combo_masks, combo_bits = combo_table()
+    dead_bits = np.uint64(sum(1 << card for card in dead))
+    live = np.flatnonzero((combo_bits & dead_bits) == 0)
+    if weights is not None:
+        live = live[weights[live] > 0]
+    if not len(live):
+        raise ValueError("The range has no holdings left once the known cards are removed")
+
+    # Every runout's key and suit masks, built once on top of the known board
+    to_come = 5 - len(board)
+    runouts = list(itertools.combinations(unseen, to_come))
+    runouts = np.array(runouts, dtype=np.intp).reshape(len(runouts), to_come)
+    board_ranks, board_suits, board_masks, _ = card_table([board])
+    runout_ranks, runout_suits, runout_masks, runout_bits = card_table(runouts)
+    ranks = runout_ranks + board_ranks[0]
+    suits = runout_suits + board_suits[0]
+    masks = runout_masks | board_masks[0]
+
+    hero_ranks, hero_suits, hero_masks, _ = card_table([hole])
+    hero = rank_grid(evaluator, ranks + hero_ranks[0], suits + hero_suits[0], masks | hero_masks[0])
+    villain = rank_grid(evaluator, ranks[:, None] + combo_ranks[live], suits[:, None] + combo_suits[live],
+                        masks, combo_masks[live])
+
+    # A holding is only possible on runouts that do not use its cards
+    valid = (runout_bits[:, None] & combo_bits[live]) == 0
+    won = (hero[:, None] < villain) & valid
+    tied = (hero[:, None] == villain) & valid
+    if weights is None:
+        runout_won = np.count_nonzero(won, axis=1)
+        runout_tied = np.count_nonzero(tied, axis=1)
+        runout_total = np.count_nonzero(valid, axis=1)
+    else:
+        combo_weights = weights[live]
+        runout_won = won @ combo_weights
+        runout_tied = tied @ combo_weights
+        runout_total = valid @ combo_weights
+    runout_share = runout_won + runout_tied / 2
+    total = runout_total.sum()
+
+    # Equity once the next card is out, averaged over the runouts that hold it
+    card_equity = {}
+    if to_come:
+        shares = np.zeros(52)
+        totals = np.zeros(52)
+        for column in runouts.T:
+            np.add.at(shares, column, runout_share)
+            np.add.at(totals, column, runout_total)
+        card_equity = {card: float(shares[card] / totals[card]) for card in unseen if totals[card] > 0}
+    return ExactResult(float(runout_won.sum() / total), float(runout_tied.sum() / total),
+                       float(runout_share.sum() / total), int(np.count_nonzero(valid)), card_equity)
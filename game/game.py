@@ -1,26 +1,101 @@
 # game/game.py
 import random
+from collections import deque
+import numpy as np
 from .deck import Deck
+from .equity import estimate_equity, MAX_OPPONENTS
+from .hand import HandState, STREETS
+from .handcache import evaluate_cards
+from .pot import settle_pots
+from .preflop import preflop_table
 from .player import Player
-from treys import Evaluator, Card as TreysCard, Deck as TreysDeck
+from .providers import console_provider, bot_provider
+
+
+EQUITY_TRIALS = 2000  # Trials per estimate when only a time budget is given
+HISTORY_LIMIT = 500  # Recent hands kept in memory when there is no history store
+
+
+class SessionResult:
+    def __init__(self, hands_played, players):
+        self.hands_played = hands_played
+        self.chips = {player.name: player.chips for player in players}
+        alive = [player for player in players if player.chips > 0]
+        self.winner = alive[0].name if len(alive) == 1 else None
+
+    def __repr__(self):
+        return f"SessionResult(hands_played={self.hands_played}, winner={self.winner}, chips={self.chips})"
+
 
 class Game:
-    def __init__(self, player_name, bot_names, starting_chips=1000):
-        self.players = [Player(player_name, chips=starting_chips)]
-        self.players += [Player(name, chips=starting_chips, is_bot=True) for name in bot_names]
-        self.evaluator = Evaluator()
-        self.hand_history = []
+    def __init__(self, player_name, bot_names, starting_chips=1000, sink=print, bot_provider=None,
+                 rng=None, equity_trials=None, equity_budget=None, history_store=None,
+                 checkpoint=None, exact_equity=False, opponent_range=None, stats=None,
+                 history_limit=HISTORY_LIMIT):
+        # player_name may be None for a bot-only table
+        self.players = []
+        if player_name is not None:
+            self.players.append(Player(player_name, chips=starting_chips))
+        self.players += [Player(name, chips=starting_chips, is_bot=True, provider=bot_provider)
+                         for name in bot_names]
+        self.roster = list(self.players)  # Every seated player, including busted ones
+        self.starting_chips = starting_chips
+        self.sink = sink
+        # Any object with the random module's interface; pass a seeded
+        # random.Random for reproducible tables
+        self.rng = rng if rng is not None else random
+        self.deck = Deck(self.rng)
+        # With equity_trials, bots judge their hands by Monte Carlo equity
+        # over that many trials instead of the rank heuristics. equity_budget
+        # additionally caps each estimate at that many seconds; how many
+        # trials fit then depends on machine load, so seeded tables are no
+        # longer reproducible with it.
+        self.equity_trials = equity_trials
+        self.equity_budget = equity_budget
+        self.equity_rng = None
+        # With exact_equity, bots enumerate every runout after the flop
+        # instead; opponent_range weights the holdings they play against
+        self.exact_equity = exact_equity
+        self.opponent_range = opponent_range
+        # Finished hands are streamed to history_store (a HandHistoryStore)
+        # when one is given; otherwise only the last history_limit hands are
+        # kept in memory (all of them with None)
+        self.history_store = history_store
+        # A SnapshotWriter that is handed the table state after every hand
+        self.checkpoint = checkpoint
+        # An OpponentStats fed every action and finished hand; bots read it
+        # to adjust to the players they are up against
+        self.stats = stats
+        self.hand_history = deque(maxlen=history_limit)
+        self.hands_played = 0
         self.dealer_index = 0
+        self.state = None  # HandState of the hand in progress
+
+    @classmethod
+    def headless(cls, bot_names, starting_chips=1000, sink=None, **options):
+        return cls(None, bot_names, starting_chips, sink=sink, **options)
+
+    def emit(self, message):
+        if self.sink is not None:
+            self.sink(message)
+
+    @property
+    def pot(self):
+        return self.state.pot if self.state is not None else 0
+
+    @property
+    def street(self):
+        return self.state.street if self.state is not None else None
 
     def start_round(self):
         self.assign_positions()
-        self.deck = Deck()
-        self.pot = 0
+        self.deck.shuffle()
         self.community_cards = []
         for player in self.players:
             player.hand = []
             player.active = True
             player.current_bet = 0
+            player.total_bet = 0
 
         self.collect_blinds()
 
@@ -28,81 +103,48 @@ class Game:
         small_blind = 5  # Set blind amounts
         big_blind = 10
 
-        for player in self.players:
-            if player.position == 'Small Blind':
-                amount = player.bet(small_blind)
-                self.pot += amount
-                print(f"{player.name} posts small blind of {amount} chips.")
-            elif player.position == 'Big Blind':
-                amount = player.bet(big_blind)
-                self.pot += amount
-                print(f"{player.name} posts big blind of {amount} chips.")
+        self.state = HandState(self.players, self.dealer_index, small_blind, big_blind)
+        if self.stats is not None:
+            self.stats.start_hand([player.name for player in self.players])
+        for event in self.state.events:
+            if self.stats is not None:
+                self.stats.observe(self.players[event.seat].name, event.street, event.action, event.amount)
+            player = self.players[event.seat]
+            self.emit(f"{player.name} posts {event.action} of {event.amount} chips.")
+            if player.chips == 0:
+                self.emit(f"{player.name} is all-in!")
 
     def deal_hole_cards(self):
         for player in self.players:
             player.receive_cards(self.deck.deal(2))
-        print("\nHole Cards:")
+        self.emit("\nHole Cards:")
         for player in self.players:
-            print(f"{player.name}: {player.hand}")
+            self.emit(f"{player.name}: {player.hand}")
 
     def betting_round(self, round_name):
-        print(f"\n{round_name} Betting Round:")
-        active_players = [player for player in self.players if player.active and player.chips > 0]
-        current_bet = max(player.current_bet for player in self.players)
-        actions_taken = False
-
-        # Determine the starting index based on the round
-        if round_name == "Pre-Flop":
-            # First betting round starts with the player after the big blind
-            start_index = (self.dealer_index + 3) % len(self.players)
-        else:
-            # Post-flop rounds start with the player after the dealer
-            start_index = (self.dealer_index + 1) % len(self.players)
-
-        betting_order = self.players[start_index:] + self.players[:start_index]
-
-        while True:
-            for player in betting_order:
-                if not player.active or player.chips == 0:
-                    continue
-
-                # Check if betting can end
-                if all(p.current_bet == current_bet for p in active_players if p.active):
-                    if actions_taken:
-                        break  # Betting round ends when all bets are equal
-
-                print(f"\n{player.name}'s turn ({player.position}).")
-                print(f"Current bet: {current_bet}, Your bet: {player.current_bet}")
-                print(f"Chips: {player.chips}, Pot: {self.pot}")
-
-                if player.is_bot:
-                    action = self.get_bot_action(player, current_bet)
-                    # Handle bot's action and print their decisions
-                    self.handle_bot_action(player, action, current_bet)
-                else:
-                    action = self.get_player_action(player, current_bet)
-                    # Handle player's action
-                    self.handle_player_action(player, action, current_bet)
-
-                actions_taken = True
-                current_bet = max(p.current_bet for p in self.players if p.active)
-
-            active_players = [p for p in self.players if p.active and p.chips > 0]
-            if len(active_players) <= 1 or all(
-                p.current_bet == current_bet for p in active_players if p.active
-            ):
-                break
-
-        for player in self.players:
-            player.reset_bet()
+        state = self.state
+        if round_name != state.street:
+            state.start_street(round_name)
+        self.emit(f"\n{round_name} Betting Round:")
+
+        while not state.street_over:
+            player = self.players[state.actor]
+            current_bet = state.current_bet
+            self.emit(f"\n{player.name}'s turn ({player.position}).")
+            self.emit(f"Current bet: {current_bet}, Your bet: {player.current_bet}")
+            self.emit(f"Chips: {player.chips}, Pot: {self.pot}")
+
+            action, amount = self.get_action(player, current_bet)
+            self.handle_action(player, action, amount, current_bet)
+
+    def get_action(self, player, current_bet):
+        provider = player.provider
+        if provider is None:
+            provider = bot_provider if player.is_bot else console_provider
+        return provider(self, player, current_bet)
 
     def get_player_action(self, player, current_bet):
-        if current_bet == 0:
-            valid_actions = ['check', 'bet']
-        elif player.current_bet < current_bet:
-            valid_actions = ['fold', 'call', 'raise']
-        else:
-            valid_actions = ['check', 'raise']
+        valid_actions = self.state.legal_actions()
 
         while True:
             action = input(f"{player.name}, choose an action ({'/'.join(valid_actions)}): ").lower()
@@ -124,249 +166,311 @@ class Game:
 
     def deal_flop(self):
         self.community_cards.extend(self.deck.deal(3))
-        print(f"\nFlop: {self.community_cards}")
+        self.emit(f"\nFlop: {self.community_cards}")
 
     def deal_turn(self):
         card = self.deck.deal(1)[0]
         self.community_cards.append(card)
-        print(f"\nTurn: {card}")
+        self.emit(f"\nTurn: {card}")
 
     def deal_river(self):
         card = self.deck.deal(1)[0]
         self.community_cards.append(card)
-        print(f"\nRiver: {card}")
+        self.emit(f"\nRiver: {card}")
 
     def evaluate_hand(self, hand):
-        treys_hand = [TreysCard.new(card.to_treys_notation()) for card in hand]
-        treys_community = [TreysCard.new(card.to_treys_notation()) for card in self.community_cards]
-        rank = self.evaluator.evaluate(treys_community, treys_hand)
-        hand_class = self.evaluator.get_rank_class(rank)
-        hand_name = self.evaluator.class_to_string(hand_class)
-        return rank, hand_name
+        return evaluate_cards(hand + self.community_cards)
 
     def determine_winner(self):
-        print("\nShowdown:")
-        best_rank = None
-        winners = []
+        self.emit("\nShowdown:")
+        ranks = {}
+        hand_names = {}
         for player in self.players:
             if player.active:
-                rank, hand_name = self.evaluate_hand(player.hand)
-                print(f"{player.name} has {player.hand} - {hand_name}")
-                if best_rank is None or rank < best_rank:
-                    best_rank = rank
-                    winners = [player]
-                elif rank == best_rank:
-                    winners.append(player)
-        if len(winners) == 1:
-            winner = winners[0]
-            print(f"\n{winner.name} wins the pot of {self.pot} chips with {hand_name}!")
-            winner.chips += self.pot
-        else:
-            split_pot = self.pot // len(winners)
-            winner_names = ', '.join(winner.name for winner in winners)
-            print(f"\nTie between {winner_names}, pot is split. Each wins {split_pot} chips.")
-            for winner in winners:
-                winner.chips += split_pot
-        self.record_hand(winner, hand_name)
+                ranks[player], hand_names[player] = self.evaluate_hand(player.hand)
+                self.emit(f"{player.name} has {player.hand} - {hand_names[player]}")
+
+        # Odd chips go to the winners closest to the left of the dealer
+        first_seat = (self.dealer_index + 1) % len(self.players)
+        seat_order = self.players[first_seat:] + self.players[:first_seat]
+        contributions = {player: player.total_bet for player in self.players}
+        pots, payouts = settle_pots(contributions, ranks, seat_order)
+        pots = [pot for pot in pots if pot.amount > 0]
+        for i, pot in enumerate(pots):
+            label = 'the pot' if len(pots) == 1 else 'the main pot' if i == 0 else f'side pot {i}'
+            if len(pot.winners) == 1:
+                winner = pot.winners[0]
+                self.emit(f"\n{winner.name} wins {label} of {pot.amount} chips with {hand_names[winner]}!")
+            else:
+                winner_names = ', '.join(winner.name for winner in pot.winners)
+                self.emit(f"\nTie between {winner_names}, {label} of {pot.amount} chips is split.")
+        for player, amount in payouts.items():
+            player.chips += amount
+        # Every live player is eligible for the main pot, so its winners hold the best hand
+        winners = pots[0].winners
+        self.record_hand(winners, hand_names[winners[0]])
 
     def check_for_winner(self):
         active_players = [p for p in self.players if p.active]
         if len(active_players) == 1:
             winner = active_players[0]
-            print(f"\nAll other players folded. {winner.name} wins the pot of {self.pot} chips!")
+            self.emit(f"\nAll other players folded. {winner.name} wins the pot of {self.pot} chips!")
             winner.chips += self.pot
+            self.record_hand([winner], None)
             return True
         return False
 
-    def record_hand(self, winner, hand_name):
+    def record_hand(self, winners, hand_name):
+        self.hands_played += 1
         hand_details = {
-            'winner': winner.name,
+            'number': self.hands_played,
+            'winner': ', '.join(player.name for player in self.players if player in winners),
+            'winners': [player.name for player in self.players if player in winners],
             'winning_hand': hand_name,
             'pot': self.pot,
             'community_cards': self.community_cards.copy(),
-            'players': []
+            'players': [],
+            'actions': [(self.players[event.seat].name, event.street, event.action, event.amount)
+                        for event in self.state.events]
         }
+        # Hands that end before the flop have nothing to evaluate
+        can_evaluate = len(self.community_cards) >= 3
         for player in self.players:
             player_info = {
                 'name': player.name,
                 'hand': player.hand.copy(),
-                'final_hand': self.evaluate_hand(player.hand)[1],
+                'final_hand': self.evaluate_hand(player.hand)[1] if can_evaluate else None,
                 'active': player.active
             }
             hand_details['players'].append(player_info)
-        self.hand_history.append(hand_details)
+        if self.stats is not None:
+            self.stats.end_hand(hand_details)
+        if self.history_store is not None:
+            self.history_store.append(hand_details)
+        else:
+            self.hand_history.append(hand_details)
 
     def show_hand_history(self):
-        print("\nHand History:")
-        for i, hand in enumerate(self.hand_history, 1):
-            print(f"\nHand {i}:")
-            print(f"Winner: {hand['winner']} with {hand['winning_hand']}")
-            print(f"Pot: {hand['pot']} chips")
-            print(f"Community Cards: {hand['community_cards']}")
-            print("Players:")
+        self.emit("\nHand History:")
+        hands = self.history_store if self.history_store is not None else self.hand_history
+        for hand in hands:
+            self.emit(f"\nHand {hand['number']}:")
+            if hand['winning_hand'] is None:
+                self.emit(f"Winner: {hand['winner']} (all other players folded)")
+            else:
+                self.emit(f"Winner: {hand['winner']} with {hand['winning_hand']}")
+            self.emit(f"Pot: {hand['pot']} chips")
+            self.emit(f"Community Cards: {hand['community_cards']}")
+            self.emit("Players:")
             for player in hand['players']:
                 status = '(Folded)' if not player['active'] else ''
-                print(f"  {player['name']}: {player['hand']} - {player['final_hand']} {status}")
+                self.emit(f"  {player['name']}: {player['hand']} - {player['final_hand']} {status}")
 
     def remove_busted_players(self):
-        self.players = [player for player in self.players if player.chips > 0 or not player.is_bot]
-        if len(self.players) == 1:
-            print(f"\n{self.players[0].name} has won all the chips!")
-            exit()
+        # The button is due on seat dealer_index; seats removed before it
+        # shift it down, so it stays with the same player
+        kept = [player.chips > 0 or not player.is_bot for player in self.players]
+        self.dealer_index -= kept[:self.dealer_index].count(False)
+        self.players = [player for player, keep in zip(self.players, kept) if keep]
 
     def get_bot_action(self, player, current_bet):
         hand_strength = self.evaluate_hand_strength(player)
-        random_factor = random.uniform(-0.1, 0.1)
+        random_factor = self.rng.uniform(-0.1, 0.1)
         adjusted_strength = hand_strength + random_factor
 
         if current_bet == 0:
             # No bets yet; decide between check or bet
-            if adjusted_strength > 0.6:
+            if adjusted_strength > 0.6 - self.bet_adjustment(player):
                 return 'bet'
             else:
                 return 'check'
         else:
             if adjusted_strength > 0.7:
                 return 'raise'
-            elif adjusted_strength > 0.4:
+            elif adjusted_strength > 0.4 - self.call_adjustment(player):
                 return 'call'
             else:
                 return 'fold'
 
+    def bet_adjustment(self, player):
+        # Bet lighter into opponents who fold to bets often, and tighter into
+        # those who do not
+        if self.stats is None:
+            return 0.0
+        rates = [self.stats.get(p.name).fold_to_bet for p in self.players if p.active and p is not player]
+        rates = [rate for rate in rates if rate is not None]
+        if not rates:
+            return 0.0
+        return max(-0.1, min(0.1, (sum(rates) / len(rates) - 0.5) * 0.2))
+
+    def call_adjustment(self, player):
+        # Call lighter against an aggressive bettor and tighter against a
+        # passive one, who is less likely to be bluffing
+        if self.stats is None:
+            return 0.0
+        bettor = next((event.seat for event in reversed(self.state.events)
+                       if event.street == self.state.street and event.action in ('bet', 'raise', 'big blind')), None)
+        if bettor is None or self.players[bettor] is player:
+            return 0.0
+        aggression = self.stats.get(self.players[bettor].name).aggression
+        if aggression is None:
+            return 0.0
+        return max(-0.1, min(0.1, (aggression - 1) * 0.05))
+
     def evaluate_hand_strength(self, player):
-        evaluator = Evaluator()
-        hole_cards = [self.card_to_treys(card) for card in player.hand]
-        community_cards = [self.card_to_treys(card) for card in self.community_cards]
+        if self.exact_equity and self.community_cards:
+            return self.enumerate_equity(player)
+        if self.equity_trials is not None or self.equity_budget is not None:
+            return self.estimate_equity(player)
 
         if not self.community_cards:
             # Pre-flop hand strength estimation
             strength = self.preflop_hand_strength(player)
         else:
             # Post-flop hand evaluation
-            all_cards = community_cards + hole_cards
-            rank = evaluator.evaluate(community_cards, hole_cards)
+            rank = self.evaluate_hand(player.hand)[0]
             max_rank = 7462  # Maximum possible rank in treys
             strength = 1 - (rank / max_rank)  # Normalize to [0,1], higher is better
 
         return strength
-    
-    def play(self):
-         while True:
-            self.start_round()
-            self.deal_hole_cards()
-            self.betting_round("Pre-Flop")
-            if self.check_for_winner():
-                if not self.continue_game():
-                    break
-                else:
-                    continue
-            self.deal_flop()
-            self.betting_round("Flop")
-            if self.check_for_winner():
-                if not self.continue_game():
-                    break
-                else:
-                    continue
-            self.deal_turn()
-            self.betting_round("Turn")
-            if self.check_for_winner():
-                if not self.continue_game():
-                    break
-                else:
-                    continue
-            self.deal_river()
-            self.betting_round("River")
+
+    def estimate_equity(self, player):
+        opponents = self.count_opponents(player)
+        table = preflop_table()
+        if not self.community_cards and table is not None:
+            return table.equity(player.hand, opponents)
+        if self.equity_rng is None:
+            self.equity_rng = np.random.default_rng(self.rng.getrandbits(64))
+        result = estimate_equity(player.hand, self.community_cards, opponents,
+                                 trials=self.equity_trials or EQUITY_TRIALS, time_budget=self.equity_budget,
+                                 batch_size=256, rng=self.equity_rng)
+        return result.equity
+
+    def enumerate_equity(self, player):
+        # Imported on first use; the combination tables cost a few ms at import
+        from .exact import exact_equity as exact_hand_equity
+
+        result = exact_hand_equity(player.hand, self.community_cards, self.opponent_range)
+        # Exact heads-up; treat several opponents as independent
+        return result.equity ** self.count_opponents(player)
+
+    def play_hand(self):
+        self.start_round()
+        self.deal_hole_cards()
+        for street, deal in zip(STREETS, (None, self.deal_flop, self.deal_turn, self.deal_river)):
+            if deal is not None:
+                deal()
+            self.betting_round(street)
             if self.check_for_winner():
-                if not self.continue_game():
-                    break
-                else:
-                    continue
+                break
+        else:
             self.determine_winner()
+        self.dealer_index = (self.dealer_index + 1) % len(self.players)
+
+    def play(self, max_hands=None):
+        hands_played = 0
+        while max_hands is None or hands_played < max_hands:
+            self.play_hand()
+            hands_played += 1
             self.remove_busted_players()
+            if self.checkpoint is not None and self.hands_played % self.checkpoint.every == 0:
+                from .snapshot import capture
+                self.checkpoint.submit(capture(self))
             if not self.continue_game():
                 break
+        return SessionResult(hands_played, self.roster)
+
+    def play_hands(self, hands, reseat=True):
+        # Plays `hands` hands in all. A session ends once a single player
+        # holds every chip; with reseat, everyone then rebuys and play goes
+        # on. Returns the SessionResult of each session.
+        results = [self.play(max_hands=hands)]
+        played = results[0].hands_played
+        while reseat and played < hands:
+            self.reseat()
+            results.append(self.play(max_hands=hands - played))
+            played += results[-1].hands_played
+        return results
+
+    def reseat(self):
+        # Seats the whole roster again with fresh stacks, as a new table would
+        for player in self.roster:
+            player.chips = self.starting_chips
+        self.players = list(self.roster)
+        self.dealer_index = 0
+        self.deck = Deck(self.rng)
+
+    def resume(self, snapshot):
+        # Continues from a snapshot taken at a table with the same players
+        from .snapshot import restore
+        restore(self, snapshot)
+        if self.history_store is not None and snapshot.history_size is not None:
+            # Drop hands recorded after the snapshot was taken
+            self.history_store.truncate(snapshot.history_size)
+        return self
 
     def continue_game(self):
-        player = self.players[0]  # Human player is always the first in the list
-        if player.chips == 0:
-            print(f"\n{player.name}, you have lost all your chips. Game over!")
+        human = next((player for player in self.players if not player.is_bot), None)
+        if human is not None and human.chips == 0:
+            self.emit(f"\n{human.name}, you have lost all your chips. Game over!")
             return False
-        elif len(self.players) == 1 and self.players[0] == player:
-            print(f"\nCongratulations {player.name}, you have won all the chips!")
+        elif len(self.players) == 1:
+            if human is not None:
+                self.emit(f"\nCongratulations {human.name}, you have won all the chips!")
+            else:
+                self.emit(f"\n{self.players[0].name} has won all the chips!")
             return False
         else:
             return True
         
     def assign_positions(self):
         num_players = len(self.players)
-        # Rotate dealer
-        self.dealer_index = (self.dealer_index) % num_players
-        positions = ['Dealer', 'Small Blind', 'Big Blind']
+        self.dealer_index = self.dealer_index % num_players
+        if num_players == 2:
+            positions = ['Dealer', 'Big Blind']
+        else:
+            positions = ['Dealer', 'Small Blind', 'Big Blind']
         # Add other positions based on number of players
         if num_players > 3:
             positions += ['UTG'] + ['Middle Position'] * (num_players - 4)
-        # Assign positions to players
+        # Assign positions to players, counting from the dealer
         for i, player in enumerate(self.players):
-            player.position = positions[i % len(positions)]
-
-    def handle_bot_action(self, player, action, current_bet):
-        if action == 'fold':
-            player.fold()
-            print(f"{player.name} folds.")
-        elif action == 'call':
-            bet = current_bet - player.current_bet
-            self.pot += player.bet(bet)
-            print(f"{player.name} calls {bet} chips.")
-        elif action == 'raise':
-            bet = current_bet - player.current_bet
-            raise_amount = self.get_bot_raise_amount(player, current_bet)
-            total_bet = bet + raise_amount
-            current_bet += raise_amount
-            self.pot += player.bet(total_bet)
-            print(f"{player.name} raises by {raise_amount} chips. Total bet: {current_bet}")
-        elif action == 'bet':
-            bet_amount = self.get_bot_bet_amount(player)
-            current_bet = bet_amount
-            self.pot += player.bet(bet_amount)
-            print(f"{player.name} bets {bet_amount} chips. Current bet is now {current_bet}")
-        elif action == 'check':
-            print(f"{player.name} checks.")
+            player.position = positions[(i - self.dealer_index) % num_players]
+
+    def handle_action(self, player, action, amount, current_bet):
+        event = self.state.apply(action, amount)
+        if self.stats is not None:
+            self.stats.observe(player.name, event.street, event.action, event.amount)
+        if event.action == 'fold':
+            self.emit(f"{player.name} folds.")
+        elif event.action == 'call':
+            self.emit(f"{player.name} calls {event.amount} chips.")
+        elif event.action == 'raise':
+            self.emit(f"{player.name} raises by {player.current_bet - current_bet} chips. "
+                      f"Total bet: {player.current_bet}")
+        elif event.action == 'bet':
+            self.emit(f"{player.name} bets {event.amount} chips. Current bet is now {player.current_bet}")
+        elif event.action == 'check':
+            self.emit(f"{player.name} checks.")
+        if event.amount and player.chips == 0:
+            self.emit(f"{player.name} is all-in!")
 
     def get_bot_bet_amount(self, player):
         min_bet = 10
         max_bet = min(100, player.chips)
-        bet_amount = random.randint(min_bet, max_bet)
+        if max_bet < min_bet:
+            return max_bet
+        bet_amount = self.rng.randint(min_bet, max_bet)
         return bet_amount
 
     def get_bot_raise_amount(self, player, current_bet):
         min_raise = 10
         max_raise = min(100, player.chips - (current_bet - player.current_bet))
-        raise_amount = random.randint(min_raise, max_raise)
+        if max_raise < min_raise:
+            return max(max_raise, 0)
+        raise_amount = self.rng.randint(min_raise, max_raise)
         return raise_amount
 
-    def handle_player_action(self, player, action, current_bet):
-        if action == 'fold':
-            player.fold()
-            print(f"{player.name} folds.")
-        elif action == 'call':
-            bet = current_bet - player.current_bet
-            self.pot += player.bet(bet)
-            print(f"{player.name} calls {bet} chips.")
-        elif action == 'raise':
-            bet = current_bet - player.current_bet
-            raise_amount = self.get_raise_amount(player, min_raise=10)
-            total_bet = bet + raise_amount
-            current_bet += raise_amount
-            self.pot += player.bet(total_bet)
-            print(f"{player.name} raises by {raise_amount} chips. Total bet: {current_bet}")
-        elif action == 'bet':
-            bet_amount = self.get_bet_amount(player, min_bet=10)
-            current_bet = bet_amount
-            self.pot += player.bet(bet_amount)
-            print(f"{player.name} bets {bet_amount} chips. Current bet is now {current_bet}")
-        elif action == 'check':
-            print(f"{player.name} checks.")
-
     def get_bet_amount(self, player, min_bet):
         while True:
             try:
@@ -378,7 +482,15 @@ class Game:
             except ValueError:
                 print("Please enter a numeric value.")
 
+    def count_opponents(self, player):
+        opponents = sum(1 for p in self.players if p.active and p is not player)
+        return min(max(opponents, 1), MAX_OPPONENTS)
+
     def preflop_hand_strength(self, player):
+        table = preflop_table()
+        if table is not None:
+            return table.strength(player.hand, self.count_opponents(player))
+
         card_ranks = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
                       '7': 7, '8': 8, '9': 9, '10': 10,
                       'Jack': 11, 'Queen': 12, 'King': 13, 'Ace': 14}
@@ -404,8 +516,4 @@ class Game:
         return strength
     
     def card_to_treys(self, card):
-        rank_translation = {'10': 'T', 'Jack': 'J', 'Queen': 'Q', 'King': 'K', 'Ace': 'A'}
-        rank = rank_translation.get(card.rank, card.rank)
-        suit_translation = {'Hearts': 'h', 'Diamonds': 'd', 'Clubs': 'c', 'Spades': 's'}
-        suit = suit_translation[card.suit]
-        return TreysCard.new(f"{rank}{suit}")
\ No newline at end of file
+        return card.treys
\ No newline at end of file
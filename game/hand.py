@@ -0,0 +1,197 @@
+# game/hand.py
+#
+# Betting state machine for a single hand. Every change to the hand is an
+# immutable Action event appended to an event log, and the bookkeeping needed
+# to run the betting is kept incrementally instead of rescanning the table:
+#
+# - seats that can still act (not folded, not all-in) form a circular linked
+#   list, so the next player to act is one array lookup away;
+# - `pending` counts how many of them still have to act on this street: a bet
+#   or raise resets it to everyone else in the ring, any other action
+#   decrements it, and the street closes when it reaches zero;
+# - the current bet level, minimum raise and pot are updated per action.
+#
+# That keeps legal-action queries O(1), makes snapshot()/restore() cheap for
+# search-based bots, and lets replay() rebuild a hand from its event log.
+
+from collections import namedtuple
+
+Action = namedtuple('Action', ['seat', 'street', 'action', 'amount'])
+
+STREETS = ["Pre-Flop", "Flop", "Turn", "River"]
+
+
+class HandState:
+    def __init__(self, players, dealer, small_blind=5, big_blind=10):
+        # players are Player objects in seat order; their chips, bets and
+        # active flags are updated in place as the hand progresses
+        self.players = players
+        self.dealer = dealer
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.events = []
+        self.pot = 0
+        self.live = sum(1 for player in players if player.active)
+        self.street = STREETS[0]
+        self.current_bet = 0
+        self.min_raise = big_blind
+        self.actor = None
+        self.pending = 0
+        self.next_seat = [None] * len(players)
+        self.prev_seat = [None] * len(players)
+        self.ring_size = 0
+
+        if len(players) == 2:
+            # Heads-up the dealer posts the small blind and acts first pre-flop
+            self.small_blind_seat = dealer
+            self.big_blind_seat = (dealer + 1) % 2
+        else:
+            self.small_blind_seat = (dealer + 1) % len(players)
+            self.big_blind_seat = (dealer + 2) % len(players)
+        self.post(self.small_blind_seat, 'small blind', small_blind)
+        self.post(self.big_blind_seat, 'big blind', big_blind)
+        self.current_bet = max(player.current_bet for player in players)
+        self.open_street((self.big_blind_seat + 1) % len(players))
+
+    def post(self, seat, action, amount):
+        amount = self.players[seat].bet(amount)
+        self.pot += amount
+        self.events.append(Action(seat, self.street, action, amount))
+        return amount
+
+    def open_street(self, first):
+        # Link every seat that can still act, starting from `first`
+        count = len(self.players)
+        seats = [(first + offset) % count for offset in range(count)]
+        seats = [seat for seat in seats if self.players[seat].active and self.players[seat].chips > 0]
+        for position, seat in enumerate(seats):
+            self.next_seat[seat] = seats[(position + 1) % len(seats)]
+            self.prev_seat[seat] = seats[position - 1]
+        self.ring_size = len(seats)
+        self.pending = len(seats)
+        if len(seats) == 1 and self.players[seats[0]].current_bet >= self.current_bet:
+            self.pending = 0  # Nobody left to bet against
+        self.actor = seats[0] if self.pending and self.live > 1 else None
+
+    def start_street(self, street):
+        self.street = street
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        for player in self.players:
+            player.reset_bet()
+        self.open_street((self.dealer + 1) % len(self.players))
+
+    @property
+    def street_over(self):
+        return self.actor is None
+
+    @property
+    def hand_over(self):
+        return self.live <= 1
+
+    def to_call(self):
+        return self.current_bet - self.players[self.actor].current_bet
+
+    def legal_actions(self):
+        if self.actor is None:
+            return []
+        player = self.players[self.actor]
+        to_call = self.current_bet - player.current_bet
+        if to_call == 0:
+            return ['check', 'bet'] if self.current_bet == 0 else ['check', 'raise']
+        if player.chips > to_call:
+            return ['fold', 'call', 'raise']
+        return ['fold', 'call']
+
+    def unlink(self, seat):
+        self.next_seat[self.prev_seat[seat]] = self.next_seat[seat]
+        self.prev_seat[self.next_seat[seat]] = self.prev_seat[seat]
+        self.ring_size -= 1
+
+    def apply(self, action, amount=None):
+        # Applies the actor's action and returns the resulting event. Bets and
+        # raises below the minimum are topped up to it, and every amount is
+        # capped at the player's stack. A call with nothing to call is a
+        # check; a bet into an existing bet is a raise and vice versa.
+        seat = self.actor
+        if seat is None:
+            raise ValueError("No player is due to act")
+        player = self.players[seat]
+        to_call = self.current_bet - player.current_bet
+        if action == 'call' and to_call == 0:
+            action = 'check'
+        elif action == 'bet' and self.current_bet > 0:
+            action = 'raise'
+        elif action == 'raise' and self.current_bet == 0:
+            action = 'bet'
+        if action == 'raise' and player.chips <= to_call:
+            action = 'call'
+        if action == 'check' and to_call > 0:
+            raise ValueError(f"{player.name} cannot check facing a bet of {to_call}")
+
+        following = self.next_seat[seat]
+        if action == 'fold':
+            player.fold()
+            self.live -= 1
+            self.pending -= 1
+            put_in = 0
+        elif action == 'check':
+            self.pending -= 1
+            put_in = 0
+        elif action == 'call':
+            put_in = player.bet(to_call)
+            self.pending -= 1
+        elif action in ('bet', 'raise'):
+            increment = max(amount or 0, self.min_raise)
+            put_in = player.bet(to_call + increment)
+            raised_by = player.current_bet - self.current_bet
+            if raised_by >= self.min_raise:
+                self.min_raise = raised_by
+            self.current_bet = max(self.current_bet, player.current_bet)
+            self.pending = self.ring_size - 1
+        else:
+            raise ValueError(f"Unknown action {action!r}")
+        self.pot += put_in
+
+        if action == 'fold' or player.chips == 0:
+            self.unlink(seat)
+        if self.pending <= 0 or self.live <= 1:
+            self.actor = None
+        else:
+            self.actor = following
+        event = Action(seat, self.street, action, put_in)
+        self.events.append(event)
+        return event
+
+    def snapshot(self):
+        players = tuple((player.chips, player.current_bet, player.total_bet, player.active)
+                        for player in self.players)
+        return (players, len(self.events), self.pot, self.live, self.street, self.current_bet,
+                self.min_raise, self.actor, self.pending, tuple(self.next_seat),
+                tuple(self.prev_seat), self.ring_size)
+
+    def restore(self, snapshot):
+        (players, event_count, self.pot, self.live, self.street, self.current_bet, self.min_raise,
+         self.actor, self.pending, next_seat, prev_seat, self.ring_size) = snapshot
+        for player, (chips, current_bet, total_bet, active) in zip(self.players, players):
+            player.chips = chips
+            player.current_bet = current_bet
+            player.total_bet = total_bet
+            player.active = active
+        del self.events[event_count:]
+        self.next_seat = list(next_seat)
+        self.prev_seat = list(prev_seat)
+
+    @classmethod
+    def replay(cls, players, dealer, events, small_blind=5, big_blind=10):
+        # Rebuilds a hand from its event log; players must hold their chips
+        # as they were before the blinds
+        state = cls(players, dealer, small_blind, big_blind)
+        for event in events[len(state.events):]:
+            if event.street != state.street:
+                state.start_street(event.street)
+            if event.seat != state.actor:
+                raise ValueError(f"Event {event} is out of turn")
+            state.apply(event.action, event.amount - (state.current_bet - players[event.seat].current_bet)
+                        if event.action in ('bet', 'raise') else None)
+        return state
@@ -0,0 +1,43 @@
+# game/handcache.py
+#
+# Process-wide LRU cache of hand evaluations. Hand rank does not depend on
+# which suit is which, so cards are keyed by their four per-suit rank masks in
+# sorted order: every suit relabelling of a hand shares one entry, and the
+# key changes by itself whenever a card is added to the board.
+
+import functools
+
+from .evaluator import evaluate, hand_name
+
+CACHE_SIZE = 1 << 16
+
+
+def canonical_key(cards):
+    masks = [0, 0, 0, 0]
+    for card in cards:
+        masks[card.index // 13] |= 1 << (card.index % 13)
+    masks.sort()
+    return masks[0] | masks[1] << 13 | masks[2] << 26 | masks[3] << 39
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def evaluate_key(key):
+    cards = []
+    for suit in range(4):
+        mask = key >> (13 * suit) & 0x1FFF
+        cards += [suit * 13 + rank for rank in range(13) if mask >> rank & 1]
+    rank = evaluate(cards)
+    return rank, hand_name(rank)
+
+
+def evaluate_cards(cards):
+    # (rank, hand name) for 5 to 7 cards, served from the cache when possible
+    return evaluate_key(canonical_key(cards))
+
+
+def cache_stats():
+    return evaluate_key.cache_info()
+
+
+def clear_cache():
+    evaluate_key.cache_clear()
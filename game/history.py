@@ -0,0 +1,300 @@
+# game/history.py
+#
+# Append-only, on-disk hand history. Hands are written as they finish, either
+# as length-prefixed binary records holding card indices or as JSON lines. A
+# side file of 8-byte record offsets (<path>.idx) lets any hand be fetched by
+# number in O(1), and read_hands() streams a history of any length in constant
+# memory.
+
+import argparse
+import json
+import os
+import struct
+
+from .card import CARDS
+from .evaluator import CLASS_NAMES
+
+MAGIC = b'PKHH\x01'
+STREETS = ['Pre-Flop', 'Flop', 'Turn', 'River']
+ACTIONS = ['small blind', 'big blind', 'fold', 'check', 'call', 'bet', 'raise']
+HAND_NAMES = CLASS_NAMES
+NO_CARD = 255
+NO_HAND = 255
+
+LENGTH = struct.Struct('<I')
+OFFSET = struct.Struct('<Q')
+HEADER = struct.Struct('<IIBBBH')  # number, pot, winning hand, board size, players, actions
+PLAYER = struct.Struct('<BBBB')  # hole cards, final hand, flags
+ACTION = struct.Struct('<BBBI')  # seat, street, action, chips put in
+
+ACTIVE = 1
+WINNER = 2
+
+
+def hand_code(name):
+    return NO_HAND if name is None else HAND_NAMES.index(name)
+
+
+def hand_name(code):
+    return None if code == NO_HAND else HAND_NAMES[code]
+
+
+def encode_binary(hand):
+    players = hand['players']
+    seats = {player['name']: seat for seat, player in enumerate(players)}
+    winners = set(hand['winners'])
+    parts = [HEADER.pack(hand['number'], hand['pot'], hand_code(hand['winning_hand']),
+                         len(hand['community_cards']), len(players), len(hand['actions'])),
+             bytes(card.index for card in hand['community_cards'])]
+    for player in players:
+        name = player['name'].encode('utf-8')
+        if len(name) > 255:
+            raise ValueError(f"player name {player['name']!r} is longer than 255 bytes")
+        hole = [card.index for card in player['hand']] + [NO_CARD, NO_CARD]
+        flags = (ACTIVE if player['active'] else 0) | (WINNER if player['name'] in winners else 0)
+        parts.append(bytes([len(name)]) + name)
+        parts.append(PLAYER.pack(hole[0], hole[1], hand_code(player['final_hand']), flags))
+    for name, street, action, amount in hand['actions']:
+        parts.append(ACTION.pack(seats[name], STREETS.index(street), ACTIONS.index(action), amount))
+    return b''.join(parts)
+
+
+def decode_binary(data):
+    number, pot, winning_hand, board_size, num_players, num_actions = HEADER.unpack_from(data)
+    offset = HEADER.size
+    board = [CARDS[index] for index in data[offset:offset + board_size]]
+    offset += board_size
+    players = []
+    winners = []
+    for _ in range(num_players):
+        name_size = data[offset]
+        name = data[offset + 1:offset + 1 + name_size].decode('utf-8')
+        offset += 1 + name_size
+        first, second, final_hand, flags = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        players.append({
+            'name': name,
+            'hand': [CARDS[index] for index in (first, second) if index != NO_CARD],
+            'final_hand': hand_name(final_hand),
+            'active': bool(flags & ACTIVE)
+        })
+        if flags & WINNER:
+            winners.append(name)
+    actions = []
+    for _ in range(num_actions):
+        seat, street, action, amount = ACTION.unpack_from(data, offset)
+        offset += ACTION.size
+        actions.append((players[seat]['name'], STREETS[street], ACTIONS[action], amount))
+    return {
+        'number': number,
+        'winner': ', '.join(winners),
+        'winners': winners,
+        'winning_hand': hand_name(winning_hand),
+        'pot': pot,
+        'community_cards': board,
+        'players': players,
+        'actions': actions
+    }
+
+
+def encode_json(hand):
+    record = dict(hand)
+    record['community_cards'] = [card.index for card in hand['community_cards']]
+    record['players'] = [dict(player, hand=[card.index for card in player['hand']])
+                         for player in hand['players']]
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def decode_json(data):
+    hand = json.loads(data)
+    hand['community_cards'] = [CARDS[index] for index in hand['community_cards']]
+    for player in hand['players']:
+        player['hand'] = [CARDS[index] for index in player['hand']]
+    hand['actions'] = [tuple(action) for action in hand['actions']]
+    return hand
+
+
+def detect_format(path):
+    return 'jsonl' if path.endswith('.jsonl') else 'binary'
+
+
+def record_offset(path, number):
+    # Where hand `number` starts according to the .idx side file (the end of
+    # the data past the last indexed hand), or None without an index
+    try:
+        with open(path + '.idx', 'rb') as index:
+            index.seek(number * OFFSET.size)
+            entry = index.read(OFFSET.size)
+    except FileNotFoundError:
+        return None
+    return OFFSET.unpack(entry)[0] if len(entry) == OFFSET.size else os.path.getsize(path)
+
+
+def read_hands(path, start=0, format=None):
+    # Generator over the hands in a history file, holding one record at a
+    # time; with an index, reading starts straight at hand `start`
+    format = format or detect_format(path)
+    with open(path, 'rb') as f:
+        if format == 'binary' and f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a hand history file")
+        number = 0
+        offset = record_offset(path, start) if start > 0 else None
+        if offset is not None:
+            f.seek(offset)
+            number = start
+        if format == 'jsonl':
+            for line in f:
+                if number >= start:
+                    yield decode_json(line)
+                number += 1
+            return
+        while True:
+            prefix = f.read(LENGTH.size)
+            if len(prefix) < LENGTH.size:
+                return
+            (size,) = LENGTH.unpack(prefix)
+            if number < start:
+                f.seek(size, 1)
+                number += 1
+                continue
+            data = f.read(size)
+            if len(data) < size:
+                return  # Partially written final record
+            yield decode_binary(data)
+            number += 1
+
+
+def read_record(f, format):
+    # The record at the current position of an open data file
+    if format == 'jsonl':
+        return decode_json(f.readline())
+    (size,) = LENGTH.unpack(f.read(LENGTH.size))
+    return decode_binary(f.read(size))
+
+
+def read_hand(path, number, format=None):
+    # A single hand by number, opening the files read-only
+    with open(path + '.idx', 'rb') as index, open(path, 'rb') as f:
+        index.seek(max(number, 0) * OFFSET.size)
+        entry = index.read(OFFSET.size)
+        if number < 0 or len(entry) < OFFSET.size:
+            raise IndexError(f"hand {number} is not in {path}")
+        (offset,) = OFFSET.unpack(entry)
+        f.seek(offset)
+        return read_record(f, format or detect_format(path))
+
+
+class HandHistoryStore:
+    def __init__(self, path, format=None):
+        self.path = path
+        self.format = format or detect_format(path)
+        self.index_path = path + '.idx'
+        self.data = open(path, 'ab+')
+        self.index = open(self.index_path, 'ab+')
+        if self.format == 'binary' and self.data.tell() == 0:
+            self.data.write(MAGIC)
+        self.count = self.index.tell() // OFFSET.size
+        self.readers = None
+
+    def append(self, hand):
+        if self.format == 'binary':
+            payload = encode_binary(hand)
+            record = LENGTH.pack(len(payload)) + payload
+        else:
+            record = encode_json(hand)
+        self.index.write(OFFSET.pack(self.data.tell()))
+        self.data.write(record)
+        self.count += 1
+
+    def get(self, number):
+        if not 0 <= number < self.count:
+            raise IndexError(f"hand {number} is not in {self.path}")
+        self.flush()
+        if self.readers is None:
+            self.readers = (open(self.index_path, 'rb'), open(self.path, 'rb'))
+        index, f = self.readers
+        index.seek(number * OFFSET.size)
+        (offset,) = OFFSET.unpack(index.read(OFFSET.size))
+        f.seek(offset)
+        return read_record(f, self.format)
+
+    def truncate(self, count):
+        # Forgets every hand from number `count` on
+        if count >= self.count:
+            return
+        self.flush()
+        with open(self.index_path, 'rb') as index:
+            index.seek(count * OFFSET.size)
+            (offset,) = OFFSET.unpack(index.read(OFFSET.size))
+        self.data.truncate(offset)
+        self.index.truncate(count * OFFSET.size)
+        self.data.seek(0, 2)
+        self.index.seek(0, 2)
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        self.flush()
+        return read_hands(self.path, format=self.format)
+
+    def flush(self):
+        self.data.flush()
+        self.index.flush()
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+        if self.readers is not None:
+            for reader in self.readers:
+                reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def replay_hand(hand, sink=print):
+    sink(f"\nHand {hand['number']}:")
+    for player in hand['players']:
+        sink(f"{player['name']}: {player['hand']}")
+    street = None
+    board_sizes = {'Flop': 3, 'Turn': 4, 'River': 5}
+    for name, action_street, action, amount in hand['actions']:
+        if action_street != street:
+            street = action_street
+            if street in board_sizes:
+                sink(f"\n{street}: {hand['community_cards'][:board_sizes[street]]}")
+            sink(f"\n{street} Betting Round:")
+        if action in ('fold', 'check'):
+            sink(f"{name} {action}s.")
+        elif action in ('small blind', 'big blind'):
+            sink(f"{name} posts {action} of {amount} chips.")
+        else:
+            sink(f"{name} {action}s {amount} chips.")
+    if hand['winning_hand'] is None:
+        sink(f"\n{hand['winner']} wins the pot of {hand['pot']} chips.")
+    else:
+        sink(f"\n{hand['winner']} wins the pot of {hand['pot']} chips with {hand['winning_hand']}!")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay hands from a hand history file")
+    parser.add_argument('path')
+    parser.add_argument('--hand', type=int, default=None, help="replay only this hand (0-based)")
+    parser.add_argument('--format', choices=['binary', 'jsonl'], default=None,
+                        help="record format (default: from the file extension)")
+    args = parser.parse_args(argv)
+
+    if args.hand is not None:
+        replay_hand(read_hand(args.path, args.hand, args.format))
+    else:
+        for hand in read_hands(args.path, format=args.format):
+            replay_hand(hand)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 # game/player.py
 
 class Player:
-    def __init__(self, name, chips=1000, is_bot=False):
+    def __init__(self, name, chips=1000, is_bot=False, provider=None):
         self.name = name
         self.chips = chips
         self.hand = []
         self.active = True
         self.current_bet = 0
+        self.total_bet = 0  # Chips put into the pot this hand
         self.is_bot = is_bot
         self.position = None  # Position at the table
+        self.provider = provider  # Callable choosing actions; None uses the game's default
 
     def receive_cards(self, cards):
         self.hand.extend(cards)
@@ -17,8 +19,7 @@ class Player:
         bet_amount = min(self.chips, amount)
         self.chips -= bet_amount
         self.current_bet += bet_amount
-        if self.chips == 0:
-            print(f"{self.name} is all-in!")
+        self.total_bet += bet_amount
         return bet_amount
 
     def reset_bet(self):
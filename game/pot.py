@@ -0,0 +1,82 @@
+# game/pot.py
+#
+# Pot settlement. Every player's total contribution to the hand is known, so
+# the main pot and side pots fall out of the distinct contribution levels of
+# the players still in the hand: pot i holds what everybody put in between
+# level i-1 and level i, and only players who reached level i can win it.
+# Eligibility shrinks as levels rise, which lets a single sweep from the top
+# level down find each pot's best hand; together with the initial sort that
+# makes settlement O(n log n). Odd chips go one at a time to the winners in
+# seat order, starting left of the dealer.
+
+
+class Pot:
+    def __init__(self, amount, level, eligible):
+        self.amount = amount
+        self.level = level  # Contribution needed to be eligible
+        self.eligible = eligible
+        self.winners = []
+        self.payouts = {}
+
+    def __repr__(self):
+        return f"Pot(amount={self.amount}, winners={self.winners})"
+
+
+def build_pots(contributions, live):
+    # contributions maps each player to the chips they put in this hand; live
+    # is the set of players who have not folded. Money folded above the
+    # highest live level is added to the last pot.
+    live = sorted(live, key=contributions.__getitem__)
+    amounts = sorted(contributions.values())
+    pots = []
+    previous = 0
+    index = 0  # First entry of amounts above the previous level
+    for position, player in enumerate(live):
+        level = contributions[player]
+        if level == previous and pots:
+            continue
+        amount = 0
+        while index < len(amounts) and amounts[index] <= level:
+            amount += amounts[index] - previous
+            index += 1
+        amount += (len(amounts) - index) * (level - previous)
+        pots.append(Pot(amount, level, live[position:]))
+        previous = level
+    if pots:
+        pots[-1].amount += sum(amount - previous for amount in amounts[index:])
+    return pots
+
+
+def settle_pots(contributions, ranks, seat_order):
+    # ranks maps each live player to their hand rank (lower is better), and
+    # seat_order lists the players starting left of the dealer. Returns the
+    # pots with winners and payouts filled in, plus the total payout per player.
+    live = [player for player in seat_order if player in ranks]
+    pots = build_pots(contributions, live)
+    seat = {player: position for position, player in enumerate(seat_order)}
+
+    # Players by contribution, highest first: walking levels downwards only
+    # ever adds players to the eligible set
+    by_contribution = sorted(live, key=lambda player: -contributions[player])
+    best_rank = None
+    best = []
+    added = 0
+    for pot in reversed(pots):
+        while added < len(by_contribution) and contributions[by_contribution[added]] >= pot.level:
+            player = by_contribution[added]
+            added += 1
+            rank = ranks[player]
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                best = [player]
+            elif rank == best_rank:
+                best.append(player)
+        pot.winners = sorted(best, key=seat.__getitem__)
+
+    totals = {}
+    for pot in pots:
+        share, odd_chips = divmod(pot.amount, len(pot.winners))
+        for position, player in enumerate(pot.winners):
+            pot.payouts[player] = share + (1 if position < odd_chips else 0)
+            totals[player] = totals.get(player, 0) + pot.payouts[player]
+    return pots, totals
@@ -0,0 +1,152 @@
+# game/preflop.py
+#
+# Pre-flop equity table for the 169 strategically distinct starting hands
+# against 1-9 random opponents. The table is computed offline:
+#
+#     python -m game.preflop --trials 20000
+#
+# and stored as a small little-endian binary file: an 8-byte header
+# (magic, version, hand count, opponent count) followed by uint16 equities
+# scaled by 65535, one row per hand class. At runtime it is memory-mapped on
+# first use, so a lookup is just an index into the mapped buffer.
+
+import argparse
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .card import Card
+from .equity import estimate_equity, MAX_OPPONENTS
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'preflop_equity.bin')
+MAGIC = b'PFEQ'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH')
+NUM_CLASSES = 169
+SCALE = 65535
+
+
+def hand_class(hole_cards):
+    # Pairs sit on the diagonal of a 13x13 grid, suited hands above it
+    # (row = high rank) and offsuit hands below it (row = low rank)
+    first, second = (card.index if isinstance(card, Card) else card for card in hole_cards)
+    high, low = max(first % 13, second % 13), min(first % 13, second % 13)
+    if first // 13 == second // 13:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_cards(index):
+    # A representative pair of card indices for a hand class
+    row, column = divmod(index, 13)
+    if row >= column:
+        # Pair or suited: same suit unless it is a pair
+        return (row, column + 13) if row == column else (row, column)
+    return (row, column + 13)
+
+
+def class_combos(index):
+    row, column = divmod(index, 13)
+    if row == column:
+        return 6
+    return 4 if row > column else 12
+
+
+def class_name(index):
+    symbols = '23456789TJQKA'
+    row, column = divmod(index, 13)
+    if row == column:
+        return symbols[row] * 2
+    if row > column:
+        return symbols[row] + symbols[column] + 's'
+    return symbols[column] + symbols[row] + 'o'
+
+
+class PreflopTable:
+    def __init__(self, path=TABLE_PATH):
+        self.path = path
+        self.equities = None
+        self.strengths = {}
+
+    def load(self):
+        if self.equities is None:
+            with open(self.path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, classes, opponents = HEADER.unpack_from(buffer)
+            if magic != MAGIC or version != VERSION or classes != NUM_CLASSES:
+                raise ValueError(f"{self.path} is not a pre-flop equity table")
+            self.equities = np.frombuffer(buffer, dtype='<u2', count=classes * opponents,
+                                          offset=HEADER.size).reshape(classes, opponents)
+        return self.equities
+
+    def equity(self, hole_cards, num_opponents):
+        num_opponents = min(max(num_opponents, 1), self.load().shape[1])
+        return float(self.equities[hand_class(hole_cards), num_opponents - 1]) / SCALE
+
+    def strength(self, hole_cards, num_opponents):
+        # Share of starting hands (by combinations) that this hand beats in
+        # equity, which puts it on the same 0-1 scale as the bot thresholds
+        num_opponents = min(max(num_opponents, 1), self.load().shape[1])
+        percentiles = self.strengths.get(num_opponents)
+        if percentiles is None:
+            column = self.equities[:, num_opponents - 1]
+            weights = np.array([class_combos(index) for index in range(NUM_CLASSES)], dtype=np.float64)
+            order = np.argsort(column, kind='stable')
+            cumulative = np.cumsum(weights[order]) - weights[order] / 2
+            percentiles = np.empty(NUM_CLASSES)
+            percentiles[order] = cumulative / weights.sum()
+            self.strengths[num_opponents] = percentiles
+        return float(percentiles[hand_class(hole_cards)])
+
+
+_table = None
+
+
+def preflop_table():
+    # Shared per process; None when the table file has not been generated
+    global _table
+    if _table is None:
+        if not os.path.exists(TABLE_PATH):
+            return None
+        _table = PreflopTable()
+    return _table
+
+
+def generate(trials, seed=0, max_opponents=MAX_OPPONENTS, progress=None):
+    rng = np.random.default_rng(seed)
+    equities = np.zeros((NUM_CLASSES, max_opponents), dtype='<u2')
+    for index in range(NUM_CLASSES):
+        for opponents in range(1, max_opponents + 1):
+            result = estimate_equity(class_cards(index), num_opponents=opponents, trials=trials,
+                                     batch_size=4096, rng=rng)
+            equities[index, opponents - 1] = round(result.equity * SCALE)
+        if progress is not None:
+            progress(index)
+    return equities
+
+
+def write_table(equities, path=TABLE_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, equities.shape[0], equities.shape[1]))
+        f.write(equities.astype('<u2').tobytes())
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the pre-flop equity table")
+    parser.add_argument('--trials', type=int, default=20000, help="trials per hand and opponent count")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    equities = generate(args.trials, args.seed,
+                        progress=lambda index: print(f"{index + 1}/{NUM_CLASSES} {class_name(index)}", flush=True))
+    write_table(equities, args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# game/profiling.py
+#
+# Opt-in instrumentation for the game loop. Instruments.attach() wraps the
+# phase methods of one Game instance (dealing, each betting street, bot
+# decisions, hand evaluation, settlement, history and output) with timers;
+# a game that was never attached runs its plain methods, so instrumentation
+# costs nothing unless it is switched on. Every timer keeps its call count,
+# inclusive time and self time (excluding nested phases).
+#
+# StackSampler records the main thread's Python stack at a fixed interval
+# and writes it in the folded format read by flamegraph.pl and speedscope.
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from .handcache import cache_stats
+
+# Game method -> phase it is reported under
+PHASES = {
+    'play_hand': 'hand',
+    'start_round': 'deal',
+    'deal_hole_cards': 'deal',
+    'deal_flop': 'deal',
+    'deal_turn': 'deal',
+    'deal_river': 'deal',
+    'get_action': 'decision',
+    'evaluate_hand_strength': 'evaluation',
+    'evaluate_hand': 'evaluation',
+    'determine_winner': 'settlement',
+    'check_for_winner': 'settlement',
+    'record_hand': 'history',
+    'emit': 'output',
+}
+
+
+class Instruments:
+    def __init__(self):
+        self.timers = {}  # phase -> [calls, inclusive seconds, self seconds]
+        self.stack = []
+        self.started = None
+        self.elapsed = 0.0
+
+    def attach(self, game):
+        for method, phase in PHASES.items():
+            setattr(game, method, self.timed(getattr(game, method), phase))
+        game.betting_round = self.timed(game.betting_round, lambda street: f'betting {street}')
+        if self.started is None:
+            self.started = time.perf_counter()
+        return game
+
+    def detach(self, game):
+        for method in list(PHASES) + ['betting_round']:
+            game.__dict__.pop(method, None)
+        self.stop()
+
+    def stop(self):
+        if self.started is not None:
+            self.elapsed += time.perf_counter() - self.started
+            self.started = None
+
+    def timed(self, method, phase):
+        timers = self.timers
+        stack = self.stack
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            name = phase(*args) if callable(phase) else phase
+            stack.append(0.0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                timer = timers.get(name)
+                if timer is None:
+                    timer = timers[name] = [0, 0.0, 0.0]
+                timer[0] += 1
+                timer[1] += elapsed
+                timer[2] += elapsed - nested
+        return wrapper
+
+    def count(self, phase):
+        timer = self.timers.get(phase)
+        return timer[0] if timer else 0
+
+    def wall_time(self):
+        if self.started is not None:
+            return self.elapsed + time.perf_counter() - self.started
+        return self.elapsed
+
+    def as_dict(self):
+        cache = cache_stats()
+        return {
+            'wall_seconds': self.wall_time(),
+            'hands': self.count('hand'),
+            'decisions': self.count('decision'),
+            'phases': {name: {'calls': calls, 'seconds': total, 'self_seconds': own}
+                       for name, (calls, total, own) in sorted(self.timers.items())},
+            'evaluation_cache': {'hits': cache.hits, 'misses': cache.misses, 'size': cache.currsize},
+        }
+
+    def to_json(self, path=None):
+        data = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(data)
+        return data
+
+    def summary(self):
+        wall = self.wall_time()
+        hands = self.count('hand')
+        lines = [f"{hands} hands in {wall:.3f}s ({hands / wall if wall else 0.0:.1f} hands/s), "
+                 f"{self.count('decision')} decisions",
+                 f"{'phase':<18} {'calls':>9} {'total s':>9} {'self s':>9} {'self %':>7} {'us/call':>9}"]
+        for name, (calls, total, own) in sorted(self.timers.items(), key=lambda item: -item[1][2]):
+            share = own / wall if wall else 0.0
+            lines.append(f"{name:<18} {calls:>9} {total:>9.3f} {own:>9.3f} {share:>7.1%} "
+                         f"{total / calls * 1e6:>9.1f}")
+        cache = cache_stats()
+        lookups = cache.hits + cache.misses
+        lines.append(f"evaluation cache: {cache.hits} hits, {cache.misses} misses "
+                     f"({cache.hits / lookups if lookups else 0.0:.1%} hit rate)")
+        return '\n'.join(lines)
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval=0.001, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='stack-sampler', daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def write(self, path):
+        # One "outer;...;inner count" line per distinct stack
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,38 @@
+# game/providers.py
+
+# An action provider is any callable taking (game, player, current_bet) and
+# returning an (action, amount) pair. The amount is only used for 'bet' and
+# 'raise' and is None otherwise.
+
+
+def console_provider(game, player, current_bet):
+    action = game.get_player_action(player, current_bet)
+    if action == 'raise':
+        return action, game.get_raise_amount(player, min_raise=game.state.min_raise)
+    if action == 'bet':
+        return action, game.get_bet_amount(player, min_bet=game.state.min_raise)
+    return action, None
+
+
+def bot_provider(game, player, current_bet):
+    action = game.get_bot_action(player, current_bet)
+    if action == 'raise':
+        return action, game.get_bot_raise_amount(player, current_bet)
+    if action == 'bet':
+        return action, game.get_bot_bet_amount(player)
+    return action, None
+
+
+def callback_provider(callback):
+    # Wraps a simple bot callback that returns just the action name, or an
+    # (action, amount) pair, so it can be seated as a player's provider.
+    def provider(game, player, current_bet):
+        decision = callback(game, player, current_bet)
+        if isinstance(decision, str):
+            if decision == 'raise':
+                return decision, game.get_bot_raise_amount(player, current_bet)
+            if decision == 'bet':
+                return decision, game.get_bot_bet_amount(player)
+            return decision, None
+        return decision
+    return provider
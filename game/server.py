@@ -0,0 +1,275 @@
+# game/server.py
+#
+# Asyncio poker server hosting many tables in one process. Clients speak line
+# delimited JSON over TCP or a Unix socket:
+#
+#   client -> server  {"type": "join", "name": "alice"}
+#                     {"type": "action", "action": "raise", "amount": 20}
+#   server -> client  {"type": "welcome", "table": 0, "seat": 2}
+#                     {"type": "act", "hole_cards": ["Ah", "Kd"], "board": [...],
+#                      "current_bet": 10, "your_bet": 0, "chips": 990, "pot": 15,
+#                      "valid_actions": ["fold", "call", "raise"], "min_raise": 10,
+#                      "timeout": 5.0}
+#                     {"type": "hand_end", ...}, {"type": "table_end", ...}
+#                     {"type": "error", "message": "..."}
+#
+# Each table's Game runs on its own worker thread; when it needs a decision
+# from a remote seat it waits on a coroutine in the event loop, which applies
+# the per-action timeout. A slow client therefore only holds up its own
+# table. Once --max-tables tables are running, joins are refused with an
+# error rather than queued behind them.
+#
+#     python -m game.server --port 8765 --seats 6 --max-tables 256
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .game import Game
+
+TURNAROUND_SAMPLES = 100000  # Recent action turnarounds kept for latency figures
+
+
+def card_code(card):
+    return card.to_treys_notation()
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.name = None
+        self.closed = False
+        self.replies = asyncio.Queue()
+
+    def send(self, message):
+        if not self.closed:
+            self.writer.write(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+
+    async def read_message(self):
+        line = await self.reader.readline()
+        if not line:
+            self.closed = True
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            self.send({'type': 'error', 'message': "Malformed JSON"})
+            return {}
+        if not isinstance(message, dict):
+            self.send({'type': 'error', 'message': "Expected a JSON object"})
+            return {}
+        return message
+
+
+class RemoteProvider:
+    # Action provider for a remote seat; called on the table's worker thread
+    def __init__(self, table, connection):
+        self.table = table
+        self.connection = connection
+
+    def __call__(self, game, player, current_bet):
+        future = asyncio.run_coroutine_threadsafe(
+            self.table.request_action(self.connection, game, player, current_bet), self.table.loop)
+        return future.result()
+
+
+class Table:
+    def __init__(self, server, table_id, connections):
+        self.server = server
+        self.table_id = table_id
+        self.connections = connections
+        self.loop = asyncio.get_running_loop()
+        self.last_reply = None
+        self.game = Game.headless([connection.name for connection in connections],
+                                  server.starting_chips, rng=random.Random(server.rng.getrandbits(64)))
+        for player, connection in zip(self.game.players, connections):
+            player.provider = RemoteProvider(self, connection)
+
+    async def request_action(self, connection, game, player, current_bet):
+        actions = game.state.legal_actions()
+        min_raise = game.state.min_raise
+        while not connection.replies.empty():
+            connection.replies.get_nowait()  # Drop replies that arrived out of turn
+        connection.send({
+            'type': 'act',
+            'hole_cards': [card_code(card) for card in player.hand],
+            'board': [card_code(card) for card in game.community_cards],
+            'current_bet': current_bet,
+            'your_bet': player.current_bet,
+            'chips': player.chips,
+            'pot': game.pot,
+            'valid_actions': actions,
+            'min_raise': min_raise,
+            'timeout': self.server.action_timeout,
+        })
+        if self.last_reply is not None:
+            self.server.turnarounds.append(time.perf_counter() - self.last_reply)
+        reply = None
+        if not connection.closed:
+            try:
+                reply = await asyncio.wait_for(connection.replies.get(), self.server.action_timeout)
+            except asyncio.TimeoutError:
+                pass
+        self.last_reply = time.perf_counter()
+        action = reply.get('action') if isinstance(reply, dict) else None
+        if action not in actions:
+            # Timed out, disconnected or invalid: take the passive option
+            return ('check' if 'check' in actions else 'fold'), None
+        if action in ('bet', 'raise'):
+            # The hand state tops amounts up to the minimum and caps them at the stack
+            try:
+                amount = int(reply.get('amount') or min_raise)
+            except (TypeError, ValueError):
+                amount = min_raise
+            return action, amount
+        return action, None
+
+    def broadcast(self, message):
+        for connection in self.connections:
+            connection.send(message)
+
+    def hand_summary(self, hand):
+        showdown = hand['winning_hand'] is not None
+        return {
+            'type': 'hand_end',
+            'hand': hand['number'],
+            'winner': hand['winner'],
+            'winning_hand': hand['winning_hand'],
+            'pot': hand['pot'],
+            'board': [card_code(card) for card in hand['community_cards']],
+            # Only hands that reached showdown are revealed
+            'showdown': {player['name']: [card_code(card) for card in player['hand']]
+                         for player in hand['players'] if showdown and player['active']},
+            'actions': hand['actions'],
+            'chips': {player.name: player.chips for player in self.game.roster},
+        }
+
+    def run(self, max_hands):
+        # Worker thread: drives the synchronous game loop
+        game = self.game
+        while max_hands is None or game.hands_played < max_hands:
+            game.play_hand()
+            self.loop.call_soon_threadsafe(self.broadcast, self.hand_summary(game.hand_history.pop()))
+            game.remove_busted_players()
+            if len(game.players) < 2:
+                break
+        return {'type': 'table_end', 'table': self.table_id,
+                'chips': {player.name: player.chips for player in game.roster}}
+
+
+class PokerServer:
+    def __init__(self, seats_per_table=6, starting_chips=1000, action_timeout=5.0, max_hands=None,
+                 max_tables=256, seed=None):
+        self.seats_per_table = seats_per_table
+        self.starting_chips = starting_chips
+        self.action_timeout = action_timeout
+        self.max_hands = max_hands
+        self.max_tables = max_tables
+        self.rng = random.Random(seed)
+        self.executor = ThreadPoolExecutor(max_workers=max_tables, thread_name_prefix='table')
+        self.table_ids = itertools.count()
+        self.waiting = []
+        self.tables = set()
+        # Seconds from a reply reaching a table to its next action request,
+        # over the most recent actions
+        self.turnarounds = deque(maxlen=TURNAROUND_SAMPLES)
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_client(self, reader, writer):
+        connection = Connection(reader, writer)
+        try:
+            while True:
+                message = await connection.read_message()
+                if message is None:
+                    break
+                if message.get('type') == 'join' and connection.name is None:
+                    if len(self.tables) >= self.max_tables:
+                        # Every worker thread is busy; a new table would wait silently
+                        connection.send({'type': 'error', 'message': "Server is full, try again later"})
+                    else:
+                        self.join(connection, str(message.get('name') or f'Player{id(connection)}'))
+                elif message.get('type') == 'action':
+                    connection.replies.put_nowait(message)
+                await writer.drain()
+        finally:
+            connection.closed = True
+            if connection in self.waiting:
+                self.waiting.remove(connection)
+            writer.close()
+
+    def join(self, connection, name):
+        # Results are keyed by name, so two seats at a table cannot share one
+        if any(waiting.name == name for waiting in self.waiting):
+            connection.send({'type': 'error', 'message': f"The name {name!r} is taken at this table"})
+            return
+        connection.name = name
+        self.seat(connection)
+
+    def seat(self, connection):
+        self.waiting.append(connection)
+        if len(self.waiting) >= self.seats_per_table:
+            seated, self.waiting = self.waiting[:self.seats_per_table], self.waiting[self.seats_per_table:]
+            task = asyncio.create_task(self.run_table(seated))
+            self.tables.add(task)
+            task.add_done_callback(self.tables.discard)
+
+    async def run_table(self, connections):
+        table = Table(self, next(self.table_ids), connections)
+        for seat, connection in enumerate(connections):
+            connection.send({'type': 'welcome', 'table': table.table_id, 'seat': seat})
+        result = await table.loop.run_in_executor(self.executor, table.run, self.max_hands)
+        table.broadcast(result)
+        return result
+
+
+async def serve(args):
+    server = PokerServer(args.seats, args.chips, args.timeout, args.hands, args.max_tables, args.seed)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Serving on {args.unix or f'{args.host}:{args.port}'}")
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-table poker server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--seats', type=int, default=6, help="players per table")
+    parser.add_argument('--chips', type=int, default=1000, help="starting chips per player")
+    parser.add_argument('--timeout', type=float, default=30.0, help="seconds allowed per action")
+    parser.add_argument('--hands', type=int, default=None, help="hands per table (default: until one player is left)")
+    parser.add_argument('--max-tables', type=int, default=256,
+                        help="tables played at once; further joins are refused until one ends")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# game/snapshot.py
+#
+# Checkpointing of table state between hands. capture() copies everything a
+# table needs to carry on: seats and chips, the dealer button, the deck order
+# the exact state of both random number generators and any opponent
+# statistics the bots read, so a restored table plays on bit-for-bit as the
+# original would have. Hand records live in the
+# history store, not in the snapshot, so its size does not grow as the
+# session ages.
+#
+# Snapshots are encoded as a small fixed-layout binary record. A
+# SnapshotWriter encodes and writes them on a background thread, keeping only
+# the newest pending snapshot, so the game loop never waits on the disk.
+
+import os
+import struct
+import threading
+
+import numpy as np
+
+MAGIC = b'PKSN'
+VERSION = 2
+NO_HISTORY = 0xFFFFFFFF
+
+HEADER = struct.Struct('<4sBHIIBBB')  # magic, version, dealer, hands, history size, deck cursor, roster, seated
+PLAYER = struct.Struct('<IB')  # chips, flags
+MT_STATE = struct.Struct('<B625IBd')  # Mersenne Twister state, cached gauss
+PCG_STATE = struct.Struct('<B16s16sBI')  # present, state, increment, has_uint32, uinteger
+EXTRA = struct.Struct('<I')  # Length of a trailing byte section
+
+BOT = 1
+SEATED = 2
+
+
+class TableSnapshot:
+    def __init__(self, dealer_index, hands_played, history_size, deck_order, deck_position,
+                 roster, rng_state, equity_rng_state, extra=b'', stats=b''):
+        self.dealer_index = dealer_index
+        self.hands_played = hands_played
+        self.history_size = history_size  # Hands in the history store, or None
+        self.deck_order = deck_order
+        self.deck_position = deck_position
+        self.roster = roster  # (name, chips, is_bot, seated) in seat order
+        self.rng_state = rng_state
+        self.equity_rng_state = equity_rng_state
+        self.extra = extra  # Opaque bytes for the caller, e.g. running statistics
+        self.stats = stats  # Encoded OpponentStats of the table, if it had any
+
+
+def capture(game, extra=b''):
+    # Cheap enough to call at every hand boundary on the game thread
+    seated = set(map(id, game.players))
+    store = game.history_store
+    return TableSnapshot(
+        game.dealer_index,
+        game.hands_played,
+        len(store) if store is not None else None,
+        bytes(game.deck.order),
+        game.deck.position,
+        tuple((player.name, player.chips, player.is_bot, id(player) in seated) for player in game.roster),
+        game.rng.getstate(),
+        game.equity_rng.bit_generator.state if game.equity_rng is not None else None,
+        extra,
+        game.stats.encode() if game.stats is not None else b'')
+
+
+def restore(game, snapshot):
+    # Applies a snapshot to a game created with the same roster of names
+    if [player.name for player in game.roster] != [entry[0] for entry in snapshot.roster]:
+        raise ValueError("Snapshot was taken at a table with different players")
+    for player, (name, chips, is_bot, seated) in zip(game.roster, snapshot.roster):
+        player.chips = chips
+        player.is_bot = is_bot
+    game.players = [player for player, entry in zip(game.roster, snapshot.roster) if entry[3]]
+    game.dealer_index = snapshot.dealer_index
+    game.hands_played = snapshot.hands_played
+    game.deck.order = list(snapshot.deck_order)
+    game.deck.position = snapshot.deck_position
+    game.rng.setstate(snapshot.rng_state)
+    if snapshot.equity_rng_state is not None:
+        game.equity_rng = np.random.default_rng()
+        game.equity_rng.bit_generator.state = snapshot.equity_rng_state
+    else:
+        game.equity_rng = None
+    if game.stats is not None and snapshot.stats:
+        game.stats.restore(snapshot.stats)
+    game.state = None
+    return game
+
+
+def encode(snapshot):
+    seated = sum(1 for entry in snapshot.roster if entry[3])
+    history_size = NO_HISTORY if snapshot.history_size is None else snapshot.history_size
+    parts = [HEADER.pack(MAGIC, VERSION, snapshot.dealer_index, snapshot.hands_played, history_size,
+                         snapshot.deck_position, len(snapshot.roster), seated),
+             snapshot.deck_order]
+    for name, chips, is_bot, is_seated in snapshot.roster:
+        encoded = name.encode('utf-8')
+        parts.append(bytes([len(encoded)]) + encoded)
+        parts.append(PLAYER.pack(chips, (BOT if is_bot else 0) | (SEATED if is_seated else 0)))
+
+    version, state, gauss = snapshot.rng_state
+    parts.append(MT_STATE.pack(version, *state, gauss is not None, gauss or 0.0))
+    pcg = snapshot.equity_rng_state
+    if pcg is None:
+        parts.append(PCG_STATE.pack(0, bytes(16), bytes(16), 0, 0))
+    else:
+        if pcg['bit_generator'] != 'PCG64':
+            raise ValueError("Only PCG64 equity generators can be snapshotted")
+        parts.append(PCG_STATE.pack(1, pcg['state']['state'].to_bytes(16, 'little'),
+                                    pcg['state']['inc'].to_bytes(16, 'little'),
+                                    pcg['has_uint32'], pcg['uinteger']))
+    parts.append(EXTRA.pack(len(snapshot.extra)) + snapshot.extra)
+    parts.append(EXTRA.pack(len(snapshot.stats)) + snapshot.stats)
+    return b''.join(parts)
+
+
+def decode(data):
+    magic, version, dealer, hands, history_size, position, roster_size, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a table snapshot")
+    offset = HEADER.size
+    deck_order = data[offset:offset + 52]
+    offset += 52
+    roster = []
+    for _ in range(roster_size):
+        size = data[offset]
+        name = data[offset + 1:offset + 1 + size].decode('utf-8')
+        offset += 1 + size
+        chips, flags = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        roster.append((name, chips, bool(flags & BOT), bool(flags & SEATED)))
+
+    values = MT_STATE.unpack_from(data, offset)
+    offset += MT_STATE.size
+    rng_state = (values[0], tuple(values[1:626]), values[627] if values[626] else None)
+    present, state, inc, has_uint32, uinteger = PCG_STATE.unpack_from(data, offset)
+    offset += PCG_STATE.size
+    equity_rng_state = None
+    if present:
+        equity_rng_state = {'bit_generator': 'PCG64',
+                            'state': {'state': int.from_bytes(state, 'little'),
+                                      'inc': int.from_bytes(inc, 'little')},
+                            'has_uint32': has_uint32, 'uinteger': uinteger}
+    (extra_size,) = EXTRA.unpack_from(data, offset)
+    offset += EXTRA.size
+    extra = bytes(data[offset:offset + extra_size])
+    offset += extra_size
+    (stats_size,) = EXTRA.unpack_from(data, offset)
+    offset += EXTRA.size
+    stats = bytes(data[offset:offset + stats_size])
+    return TableSnapshot(dealer, hands, None if history_size == NO_HISTORY else history_size,
+                         bytes(deck_order), position, tuple(roster), rng_state, equity_rng_state, extra, stats)
+
+
+def write_snapshot(path, snapshot):
+    # Write to a temporary file and rename, so a crash never leaves a torn snapshot
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encode(snapshot))
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+class SnapshotWriter:
+    def __init__(self, path, every=1):
+        self.path = path
+        self.every = every  # Hands between snapshots taken by Game.play
+        self.pending = None
+        self.closed = False
+        self.written = 0
+        self.error = None  # Last failed write, raised on the game thread by submit() or close()
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='snapshot-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, snapshot):
+        # Never blocks on I/O; a newer snapshot replaces one not yet written
+        with self.condition:
+            self.raise_error()
+            self.pending = snapshot
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                snapshot, self.pending = self.pending, None
+                if snapshot is None:
+                    return
+            try:
+                write_snapshot(self.path, snapshot)
+            except Exception as error:
+                # Keep running: a later snapshot may succeed once the disk recovers
+                with self.condition:
+                    self.error = error
+                continue
+            self.written += 1
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        # Flushes the last submitted snapshot before stopping
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+        self.raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
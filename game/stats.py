@@ -0,0 +1,234 @@
+# game/stats.py
+#
+# Streaming per-player statistics for opponent modelling: how often a player
+# voluntarily puts chips in pre-flop (VPIP) and raises pre-flop (PFR), their
+# post-flop aggression factor (bets and raises per call), how often they fold
+# when facing a bet after the flop, and how often they reach and win a
+# showdown.
+#
+# Every player has a fixed-size list of counters that is updated as each
+# action is observed, so a query at decision time already reflects the hand
+# in progress and an update costs the same however many hands have been seen.
+# With a half-life (in hands), a player's counters decay by a constant factor
+# at the start of each of their hands, which keeps the figures tracking
+# recent play.
+#
+# A Game given `stats=` feeds it live. Stored histories are replayed with
+# backfill(), which streams them through read_hands():
+#
+#     python -m game.stats history.bin --half-life 500
+
+import argparse
+import json
+import time
+
+from .history import read_hands
+
+# Counter slots
+HANDS = 0
+VPIP = 1
+PFR = 2
+SAW_FLOP = 3
+AGGRESSIVE = 4  # Post-flop bets and raises
+PASSIVE = 5  # Post-flop calls
+FACED_BET = 6  # Post-flop actions facing a bet or raise
+FOLDED_TO_BET = 7
+SHOWDOWNS = 8
+SHOWDOWNS_WON = 9
+NUM_COUNTERS = 10
+
+VOLUNTARY = ('call', 'bet', 'raise')
+AGGRESSION = ('bet', 'raise')
+
+
+def ratio(count, total):
+    return count / total if total else None
+
+
+class PlayerCounters:
+    __slots__ = ('counts', 'vpip_seen', 'pfr_seen', 'folded_on')
+
+    def __init__(self):
+        self.counts = [0.0] * NUM_COUNTERS
+        # Flags for the hand in progress
+        self.vpip_seen = False
+        self.pfr_seen = False
+        self.folded_on = None
+
+    @property
+    def hands(self):
+        return self.counts[HANDS]
+
+    @property
+    def vpip(self):
+        return ratio(self.counts[VPIP], self.counts[HANDS])
+
+    @property
+    def pfr(self):
+        return ratio(self.counts[PFR], self.counts[HANDS])
+
+    @property
+    def aggression(self):
+        # Undefined until the player has called; a player who only ever
+        # bets is reported as infinitely aggressive
+        if not self.counts[PASSIVE]:
+            return float('inf') if self.counts[AGGRESSIVE] else None
+        return self.counts[AGGRESSIVE] / self.counts[PASSIVE]
+
+    @property
+    def fold_to_bet(self):
+        return ratio(self.counts[FOLDED_TO_BET], self.counts[FACED_BET])
+
+    @property
+    def went_to_showdown(self):
+        return ratio(self.counts[SHOWDOWNS], self.counts[SAW_FLOP])
+
+    @property
+    def showdown_win(self):
+        return ratio(self.counts[SHOWDOWNS_WON], self.counts[SHOWDOWNS])
+
+    def as_dict(self):
+        return {'hands': self.hands, 'vpip': self.vpip, 'pfr': self.pfr, 'aggression': self.aggression,
+                'fold_to_bet': self.fold_to_bet, 'went_to_showdown': self.went_to_showdown,
+                'showdown_win': self.showdown_win}
+
+    def __repr__(self):
+        return f"PlayerCounters({', '.join(f'{key}={value!r}' for key, value in self.as_dict().items())})"
+
+
+class OpponentStats:
+    def __init__(self, half_life=None):
+        self.decay = 0.5 ** (1 / half_life) if half_life else 1.0
+        self.players = {}
+        self.seated = []
+        self.street = None
+        self.bet_open = False  # Whether the current street has a bet to face
+        self.hands_seen = 0
+
+    def get(self, name):
+        # Counters for a player; a player never seen reads as all None
+        counters = self.players.get(name)
+        if counters is None:
+            counters = self.players[name] = PlayerCounters()
+        return counters
+
+    def start_hand(self, names):
+        self.seated = [self.get(name) for name in names]
+        self.street = None
+        self.bet_open = False
+        decay = self.decay
+        for counters in self.seated:
+            counts = counters.counts
+            if decay != 1.0:
+                for slot in range(NUM_COUNTERS):
+                    counts[slot] *= decay
+            counts[HANDS] += 1
+            counters.vpip_seen = False
+            counters.pfr_seen = False
+            counters.folded_on = None
+
+    def observe(self, name, street, action, amount=0):
+        if street != self.street:
+            self.street = street
+            self.bet_open = False
+        counters = self.players[name]
+        counts = counters.counts
+        if street == 'Pre-Flop':
+            if action in VOLUNTARY and not counters.vpip_seen:
+                counters.vpip_seen = True
+                counts[VPIP] += 1
+            if action in AGGRESSION and not counters.pfr_seen:
+                counters.pfr_seen = True
+                counts[PFR] += 1
+        else:
+            if self.bet_open and action in ('fold', 'call', 'raise'):
+                counts[FACED_BET] += 1
+                if action == 'fold':
+                    counts[FOLDED_TO_BET] += 1
+            if action in AGGRESSION:
+                counts[AGGRESSIVE] += 1
+            elif action == 'call':
+                counts[PASSIVE] += 1
+        if action == 'fold':
+            counters.folded_on = street
+        elif action in AGGRESSION or action == 'big blind':
+            self.bet_open = True
+
+    def end_hand(self, hand):
+        # hand is a hand history record (see Game.record_hand)
+        self.hands_seen += 1
+        saw_flop = len(hand['community_cards']) >= 3
+        showdown = hand['winning_hand'] is not None
+        winners = set(hand['winners'])
+        for player in hand['players']:
+            counters = self.players[player['name']]
+            if saw_flop and counters.folded_on != 'Pre-Flop':
+                counters.counts[SAW_FLOP] += 1
+            if showdown and player['active']:
+                counters.counts[SHOWDOWNS] += 1
+                if player['name'] in winners:
+                    counters.counts[SHOWDOWNS_WON] += 1
+
+    def encode(self):
+        # Counters between hands, for table snapshots
+        return json.dumps({'decay': self.decay, 'hands_seen': self.hands_seen,
+                           'players': {name: counters.counts for name, counters in self.players.items()}},
+                          separators=(',', ':')).encode()
+
+    def restore(self, data):
+        state = json.loads(data)
+        self.decay = state['decay']
+        self.hands_seen = state['hands_seen']
+        self.players = {}
+        for name, counts in state['players'].items():
+            self.get(name).counts = counts
+        return self
+
+    def observe_hand(self, hand):
+        self.start_hand([player['name'] for player in hand['players']])
+        for name, street, action, amount in hand['actions']:
+            self.observe(name, street, action, amount)
+        self.end_hand(hand)
+
+    def summary(self):
+        def cell(value, percent=True):
+            if value is None:
+                return f"{'-':>7}"
+            return f"{value:>7.1%}" if percent else f"{value:>7.2f}"
+
+        lines = [f"{'player':<16} {'hands':>9} {'VPIP':>7} {'PFR':>7} {'AF':>7} {'FtB':>7} {'WTSD':>7} {'W$SD':>7}"]
+        for name, counters in sorted(self.players.items(), key=lambda item: -item[1].hands):
+            lines.append(f"{name:<16} {counters.hands:>9.0f} {cell(counters.vpip)} {cell(counters.pfr)} "
+                         f"{cell(counters.aggression, percent=False)} {cell(counters.fold_to_bet)} "
+                         f"{cell(counters.went_to_showdown)} {cell(counters.showdown_win)}")
+        return '\n'.join(lines)
+
+
+def backfill(paths, stats=None, start=0, format=None):
+    # Replays stored histories into `stats`, one hand in memory at a time
+    stats = stats if stats is not None else OpponentStats()
+    for path in [paths] if isinstance(paths, str) else paths:
+        for hand in read_hands(path, start, format):
+            stats.observe_hand(hand)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-player statistics from hand history files")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--half-life', type=float, default=None,
+                        help="weight hands by recency, halving every this many hands per player")
+    parser.add_argument('--format', choices=['binary', 'jsonl'], default=None,
+                        help="record format (default: from the file extension)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = backfill(args.paths, OpponentStats(args.half_life), format=args.format)
+    elapsed = time.perf_counter() - start
+    print(stats.summary())
+    print(f"\n{stats.hands_seen} hands in {elapsed:.2f}s "
+          f"({stats.hands_seen / elapsed if elapsed else 0.0:.0f} hands/s)")
+
+
+if __name__ == "__main__":
+    main()
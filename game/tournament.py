@@ -0,0 +1,201 @@
+# game/tournament.py
+#
+# Batch runner for bot-vs-bot sessions. Independent tables are sharded over a
+# process pool; every table gets its own RNG seed derived from a master seed,
+# so a run is reproducible no matter how many workers execute it. With a
+# checkpoint directory every table snapshots itself as it goes, and running
+# the same tournament again picks each table up where it stopped.
+#
+#     python -m game.tournament --bots 6 --tables 64 --hands 500 --seed 42
+#     python -m game.tournament --tables 64 --hands 100000 --checkpoint-dir runs/long
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .evaluator import get_evaluator
+from .game import Game
+from .snapshot import SnapshotWriter, capture, restore, read_snapshot
+
+BIG_BLIND = 10
+
+
+class PlayerStats:
+    def __init__(self):
+        self.hands = 0
+        self.net = 0
+        self.net_sq = 0
+
+    def add(self, delta):
+        self.hands += 1
+        self.net += delta
+        self.net_sq += delta * delta
+
+    def merge(self, other):
+        self.hands += other.hands
+        self.net += other.net
+        self.net_sq += other.net_sq
+
+    @property
+    def mean(self):
+        return self.net / self.hands if self.hands else 0.0
+
+    @property
+    def stdev(self):
+        if self.hands < 2:
+            return 0.0
+        variance = (self.net_sq - self.net * self.net / self.hands) / (self.hands - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def bb_per_100(self):
+        return self.mean / BIG_BLIND * 100
+
+    @property
+    def bb_per_100_error(self):
+        # Standard error of the win rate, in big blinds per 100 hands
+        if self.hands < 2:
+            return 0.0
+        return self.stdev / math.sqrt(self.hands) / BIG_BLIND * 100
+
+
+class TournamentResult:
+    def __init__(self, tables, hands_played, stats, elapsed):
+        self.tables = tables
+        self.hands_played = hands_played
+        self.stats = stats
+        self.elapsed = elapsed
+
+    @property
+    def hands_per_second(self):
+        return self.hands_played / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        lines = [f"{self.tables} tables, {self.hands_played} hands in {self.elapsed:.2f}s "
+                 f"({self.hands_per_second:.1f} hands/s)",
+                 f"{'player':<12} {'hands':>8} {'net chips':>10} {'EV/hand':>9} {'bb/100':>16}"]
+        for name, stats in sorted(self.stats.items()):
+            lines.append(f"{name:<12} {stats.hands:>8} {stats.net:>10} {stats.mean:>9.2f} "
+                         f"{stats.bb_per_100:>8.1f} ± {stats.bb_per_100_error:<5.1f}")
+        return '\n'.join(lines)
+
+
+def table_seeds(master_seed, num_tables):
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(64) for _ in range(num_tables)]
+
+
+def save_table(writer, game, hands_played, stats):
+    progress = {'hands': hands_played,
+                'stats': {name: [s.hands, s.net, s.net_sq] for name, s in stats.items()}}
+    writer.submit(capture(game, json.dumps(progress).encode()))
+
+
+def load_table(path, game, stats):
+    # Returns the hands already played at this table, or 0 without a checkpoint
+    if path is None or not os.path.exists(path):
+        return 0
+    snapshot = read_snapshot(path)
+    restore(game, snapshot)
+    progress = json.loads(snapshot.extra)
+    for name, (count, net, net_sq) in progress['stats'].items():
+        stats[name].hands, stats[name].net, stats[name].net_sq = count, net, net_sq
+    return progress['hands']
+
+
+def play_table(spec):
+    seed, bot_names, providers, starting_chips, hands, checkpoint, checkpoint_every = spec
+    rng = random.Random(seed)
+    stats = {name: PlayerStats() for name in bot_names}
+    game = Game.headless(bot_names, starting_chips, rng=rng)
+    hands_played = load_table(checkpoint, game, stats)
+    writer = SnapshotWriter(checkpoint) if checkpoint is not None else None
+    while hands_played < hands:
+        # A session ends once one bot holds every chip; rebuy everyone and keep going
+        if len(game.players) < 2:
+            game = Game.headless(bot_names, starting_chips, rng=rng)
+        for player in game.players:
+            player.provider = providers.get(player.name)
+        while hands_played < hands:
+            if writer is not None and hands_played % checkpoint_every == 0:
+                save_table(writer, game, hands_played, stats)
+            before = [player.chips for player in game.roster]
+            game.play_hand()
+            hands_played += 1
+            for player, chips in zip(game.roster, before):
+                if chips > 0:
+                    stats[player.name].add(player.chips - chips)
+            game.remove_busted_players()
+            if not game.continue_game():
+                break
+    if writer is not None:
+        save_table(writer, game, hands_played, stats)
+        writer.close()
+    return hands_played, stats
+
+
+def run_tournament(bot_names, num_tables, hands_per_table, starting_chips=1000, master_seed=0,
+                   workers=None, providers=None, checkpoint_dir=None, checkpoint_every=100):
+    # providers maps bot names to action providers; they must be picklable
+    # (module-level functions) to reach the worker processes
+    providers = providers or {}
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+    specs = []
+    for index, seed in enumerate(table_seeds(master_seed, num_tables)):
+        # Rotate the seating so no bot keeps the same position on every table
+        shift = index % len(bot_names)
+        seating = list(bot_names[shift:]) + list(bot_names[:shift])
+        checkpoint = None
+        if checkpoint_dir is not None:
+            checkpoint = os.path.join(checkpoint_dir, f'table-{index}.snap')
+        specs.append((seed, seating, providers, starting_chips, hands_per_table,
+                      checkpoint, checkpoint_every))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = list(map(play_table, specs))
+    else:
+        workers = workers or os.cpu_count()
+        chunksize = max(1, num_tables // (workers * 4))
+        # Load the evaluator before the pool starts so forked workers inherit it
+        get_evaluator()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(play_table, specs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    # Results come back in table order, so the merge is deterministic
+    merged = {name: PlayerStats() for name in bot_names}
+    hands_played = 0
+    for table_hands, table_stats in results:
+        hands_played += table_hands
+        for name, stats in table_stats.items():
+            merged[name].merge(stats)
+    return TournamentResult(num_tables, hands_played, merged, elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run bot-vs-bot tables across all cores")
+    parser.add_argument('--bots', type=int, default=6, help="bots seated at every table")
+    parser.add_argument('--tables', type=int, default=32)
+    parser.add_argument('--hands', type=int, default=200, help="hands per table")
+    parser.add_argument('--chips', type=int, default=1000, help="starting chips per bot")
+    parser.add_argument('--seed', type=int, default=0, help="master seed")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="snapshot tables here and resume from existing snapshots")
+    parser.add_argument('--checkpoint-every', type=int, default=100, help="hands between table snapshots")
+    args = parser.parse_args(argv)
+
+    bot_names = [f'Bot{i+1}' for i in range(args.bots)]
+    result = run_tournament(bot_names, args.tables, args.hands, args.chips, args.seed, args.workers,
+                            checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every)
+    print(result.report())
+
+
+if __name__ == "__main__":
+    main()
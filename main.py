@@ -1,8 +1,52 @@
 # main.py
 
+import argparse
+import random
+
 from game.game import Game
 
+def profile(args):
+    # Plays headless bot tables under cProfile, sampling stacks alongside
+    import cProfile
+    import pstats
+
+    from game.profiling import Instruments, StackSampler
+
+    bot_names = [f'Bot{i+1}' for i in range(args.bots)]
+    rng = random.Random(args.seed)
+    instruments = Instruments()
+    profiler = cProfile.Profile()
+    game = instruments.attach(Game.headless(bot_names, args.chips, rng=rng))
+    with StackSampler(args.interval / 1000) as sampler:
+        profiler.enable()
+        game.play_hands(args.profile)
+        profiler.disable()
+    instruments.stop()
+
+    profiler.dump_stats(f'{args.output}.pstats')
+    sampler.write(f'{args.output}.folded')
+    instruments.to_json(f'{args.output}.json')
+    print(instruments.summary())
+    print()
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(args.top)
+    print(f"Wrote {args.output}.pstats, {args.output}.json and {args.output}.folded "
+          f"({sampler.samples} stack samples)")
+
 def main():
+    parser = argparse.ArgumentParser(description="Texas Hold'em")
+    parser.add_argument('--profile', type=int, metavar='HANDS',
+                        help="play this many headless bot hands under the profiler")
+    parser.add_argument('--bots', type=int, default=6, help="bots per table in profile mode")
+    parser.add_argument('--chips', type=int, default=1000, help="starting chips in profile mode")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--interval', type=float, default=1.0, help="stack sampling interval in ms")
+    parser.add_argument('--top', type=int, default=25, help="functions to list from cProfile")
+    parser.add_argument('--output', default='profile', help="prefix of the files written")
+    args = parser.parse_args()
+    if args.profile:
+        profile(args)
+        return
+
     player_name = input("Enter your name: ")
     try:
         num_bots = int(input("Enter the number of bots to play against: "))
@@ -13,11 +57,11 @@ def main():
     except ValueError as e:
         print("Invalid input. Using 2 bots by default.")
         num_bots = 2
-        
+
     starting_chips = int(input("Enter the starting chip count for each player: "))
     bot_names = [f'Bot{i+1}' for i in range(num_bots)]
     game = Game(player_name, bot_names, starting_chips)
     game.play()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
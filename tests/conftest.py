@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def evaluator_cache(tmp_path_factory):
+    # Keep the evaluator's table cache out of the developer's home directory
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setenv('POKER_CACHE_DIR', str(tmp_path_factory.mktemp('cache')))
+    yield
+    monkeypatch.undo()
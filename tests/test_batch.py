@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+
+from game.batch import BatchTables, settle
+from game.game import Game
+from game.pot import settle_pots
+
+
+def test_vectorised_settlement_matches_settle_pots():
+    rng = random.Random(15)
+    tables, seats = 300, 6
+    contributions = np.zeros((tables, seats), dtype=np.int64)
+    live = np.zeros((tables, seats), dtype=bool)
+    ranks = np.zeros((tables, seats), dtype=np.int64)
+    counts = np.array([rng.randint(2, seats) for _ in range(tables)])
+    first = np.array([rng.randrange(count) for count in counts])
+    for t, count in enumerate(counts):
+        for seat in range(count):
+            contributions[t, seat] = rng.choice([10, 10, 50, rng.randint(1, 400)])
+            live[t, seat] = rng.random() < 0.7
+            ranks[t, seat] = rng.randint(1, 5)
+        if not live[t].any():
+            live[t, 0] = True
+    payouts = settle(contributions, live, ranks, first, counts)
+
+    for t, count in enumerate(counts):
+        seat_order = [(first[t] + offset) % count for offset in range(count)]
+        _, totals = settle_pots({seat: int(contributions[t, seat]) for seat in range(count)},
+                                {seat: int(ranks[t, seat]) for seat in range(count) if live[t, seat]},
+                                seat_order)
+        assert payouts[t].tolist() == [totals.get(seat, 0) for seat in range(seats)]
+
+
+def test_batch_tables_match_game_statistics():
+    names = ['Bot1', 'Bot2', 'Bot3', 'Bot4', 'Bot5']
+    hands = 12
+    rng = random.Random(16)
+    showdowns, pots, dealt = [], [], []
+    for _ in range(120):
+        game = None
+        for _ in range(hands):
+            if game is None or not game.continue_game():
+                game = Game.headless(names, rng=rng)
+            dealt.append(len(game.players))
+            game.play_hand()
+            game.remove_busted_players()
+            showdowns.append(game.hand_history[-1]['winning_hand'] is not None)
+            pots.append(game.hand_history[-1]['pot'])
+
+    simulator = BatchTables(2000, names, seed=16)
+    dealt_batch = 0
+    for _ in range(hands):
+        dealt_batch += int(simulator.counts.sum())
+        simulator.play_hand()
+    assert sum(simulator.chips.sum(axis=1) != 1000 * len(names)) == 0
+
+    def close(sample, expected):
+        mean = sum(sample) / len(sample)
+        variance = sum((x - mean) ** 2 for x in sample) / (len(sample) - 1)
+        return abs(mean - expected) < 4 * (variance / len(sample)) ** 0.5
+
+    assert close(showdowns, simulator.showdowns / simulator.hands_played)
+    assert close(pots, simulator.pot_total / simulator.hands_played)
+    assert close(dealt, dealt_batch / simulator.hands_played)
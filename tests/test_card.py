@@ -0,0 +1,18 @@
+from treys import Card as TreysCard
+
+from game.card import Card, CARDS
+
+
+def test_card_table_matches_treys_encoding():
+    assert len(CARDS) == 52
+    for index, card in enumerate(CARDS):
+        assert card.index == index
+        assert card.treys == TreysCard.new(card.to_treys_notation())
+
+
+def test_card_keeps_string_view():
+    card = Card('Spades', 'Ace')
+    assert card.suit == 'Spades'
+    assert card.rank == 'Ace'
+    assert repr(card) == 'Ace of Spades'
+    assert card == Card.from_index(card.index)
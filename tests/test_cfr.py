@@ -0,0 +1,51 @@
+import random
+
+from game.cfr import BettingTree, DECISION, FOLD, Policy, PolicyProvider, SHOWDOWN, Trainer
+from game.game import Game
+
+
+def test_betting_tree_is_consistent():
+    tree = BettingTree(max_raises=1)
+    assert [label for label, _ in tree.actions[tree.root]] == ['fold', 'call', 'raise', 'raise', 'all-in']
+    for node, kind in enumerate(tree.kind):
+        if kind == DECISION:
+            assert len(tree.children[node]) == len(tree.actions[node])
+            for (label, target), child in zip(tree.actions[node], tree.children[node]):
+                assert tree.contributions[node][tree.player[node]] <= target <= tree.stack
+        elif kind == SHOWDOWN:
+            assert len(set(tree.contributions[node])) == 1
+        else:
+            assert kind == FOLD
+    assert tree.decision.count(-1) == len(tree.kind) - tree.num_decisions
+
+
+def test_cfr_training_resumes_and_reduces_exploitability(tmp_path):
+    directory = str(tmp_path / 'run')
+    trainer = Trainer(directory, BettingTree(max_raises=1), buckets=4, samples=8, seed=3)
+    untrained = trainer.exploitability(deals=200)
+    trainer.train(300, chunk=150, sink=None)
+    resumed = Trainer(directory)
+    assert resumed.iterations == 300 and resumed.buckets == 4
+    assert (resumed.strategy == trainer.strategy).all()
+    resumed.train(300, chunk=150, sink=None)
+    assert resumed.iterations == 600
+    assert resumed.regrets.min() >= 0
+    assert resumed.exploitability(deals=200) < untrained
+
+
+def test_trained_policy_plays_as_a_bot(tmp_path):
+    trainer = Trainer(str(tmp_path / 'run'), BettingTree(max_raises=1), buckets=4, samples=8, seed=4)
+    trainer.train(100, sink=None)
+    trainer.export(str(tmp_path / 'policy.npz'))
+    provider = PolicyProvider(str(tmp_path / 'policy.npz'))
+    assert isinstance(provider.policy, Policy)
+
+    game = Game.headless(['Policy', 'Threshold'], rng=random.Random(4))
+    game.players[0].provider = provider
+    game.start_round()
+    assert provider.locate(game.state) == provider.policy.tree.root
+
+    game = Game.headless(['Policy', 'Threshold'], rng=random.Random(4))
+    game.players[0].provider = provider
+    result = game.play(max_hands=20)
+    assert sum(result.chips.values()) == 2000
@@ -0,0 +1,23 @@
+import random
+
+import pytest
+
+from game.deck import Deck
+
+
+def test_deal_advances_cursor():
+    deck = Deck(random.Random(0))
+    hole = deck.deal(2)
+    assert len(hole) == 2
+    assert len(deck) == 50
+    assert not set(hole) & set(deck.cards)
+
+
+def test_shuffle_resets_deck():
+    deck = Deck(random.Random(0))
+    dealt = deck.deal(52)
+    assert len(set(dealt)) == 52
+    with pytest.raises(ValueError):
+        deck.deal()
+    deck.shuffle()
+    assert len(deck) == 52
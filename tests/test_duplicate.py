@@ -0,0 +1,14 @@
+from game.duplicate import calling_station, duplicate_match
+from game.providers import bot_provider, callback_provider
+
+
+def test_duplicate_match_cancels_card_luck():
+    # A provider against itself plays both halves of every deal identically
+    mirror = duplicate_match(bot_provider, bot_provider, 50, seed=2)
+    assert mirror.pairs == [0.0] * 50 and mirror.std_error == 0.0
+
+    result = duplicate_match(bot_provider, callback_provider(calling_station), 300, seed=2)
+    assert result.deals == 300
+    assert result.std_error < result.unpaired_std_error
+    again = duplicate_match(bot_provider, callback_provider(calling_station), 300, seed=2)
+    assert again.pairs == result.pairs
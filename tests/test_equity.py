@@ -0,0 +1,10 @@
+from game.card import Card
+from game.equity import estimate_equity
+
+
+def test_pocket_aces_equity():
+    aces = [Card('Spades', 'Ace'), Card('Hearts', 'Ace')]
+    heads_up = estimate_equity(aces, num_opponents=1, trials=20000, rng=0)
+    assert abs(heads_up.equity - 0.852) < 0.015
+    nine_way = estimate_equity(aces, num_opponents=9, trials=20000, rng=0)
+    assert abs(nine_way.equity - 0.31) < 0.02
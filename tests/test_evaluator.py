@@ -0,0 +1,88 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+from treys import Evaluator
+
+from game import evaluator as evaluator_module
+from game.card import Card, CARDS
+from game.evaluator import evaluate, evaluate_batch, hand_name
+from game.handcache import cache_stats, canonical_key, clear_cache, evaluate_cards
+
+
+def test_evaluator_matches_treys_ranks_and_class_names():
+    rng = random.Random(0)
+    evaluator = Evaluator()
+    for size in (5, 6, 7):
+        for _ in range(20000):
+            hand = rng.sample(range(52), size)
+            expected = evaluator.evaluate([CARDS[i].treys for i in hand], [])
+            assert evaluate(hand) == expected
+            assert hand_name(expected) == evaluator.class_to_string(evaluator.get_rank_class(expected))
+
+    hands = [rng.sample(range(52), 7) for _ in range(50000)]
+    expected = [evaluator.evaluate([CARDS[i].treys for i in hand], []) for hand in hands]
+    assert evaluate_batch(np.array(hands)).tolist() == expected
+
+
+def test_evaluator_ranks_every_flush_and_straight_flush():
+    evaluator = Evaluator()
+    # Every set of 7 spades plus every 5- and 6-card spade flush
+    for size in (5, 6, 7):
+        for ranks in itertools.combinations(range(13), size):
+            hand = [39 + rank for rank in ranks]
+            assert evaluate(hand) == evaluator.evaluate([CARDS[i].treys for i in hand], [])
+
+
+def test_evaluator_tables_round_trip_through_cache_file(tmp_path, monkeypatch):
+    current = evaluator_module.get_evaluator()
+    tables = (current.flush, current.seven, current.rank_sums[5], current.rank_sums[6], current.flush_suits)
+    path = str(tmp_path / 'cache' / 'tables.bin')
+    evaluator_module.write_tables(tables, path)
+    loaded = evaluator_module.HandEvaluator(evaluator_module.read_tables(path))
+
+    rng = random.Random(1)
+    for size in (5, 6, 7):
+        hands = np.array([rng.sample(range(52), size) for _ in range(2000)])
+        assert loaded.evaluate_batch(hands).tolist() == current.evaluate_batch(hands).tolist()
+        assert [loaded.evaluate(hand) for hand in hands.tolist()] == current.evaluate_batch(hands).tolist()
+
+    # A damaged cache file is rebuilt rather than trusted
+    with open(path, 'r+b') as f:
+        f.truncate(1000)
+    monkeypatch.setattr(evaluator_module, 'build_tables', lambda: tables)
+    assert evaluator_module.cached_tables(path)[2] == current.rank_sums[5]
+    assert evaluator_module.read_tables(path)[4].shape == current.flush_suits.shape
+
+
+def test_evaluator_cache_rejects_tables_built_from_other_keys(tmp_path, monkeypatch):
+    current = evaluator_module.get_evaluator()
+    tables = (current.flush, current.seven, current.rank_sums[5], current.rank_sums[6], current.flush_suits)
+    path = str(tmp_path / 'tables.bin')
+    evaluator_module.write_tables(tables, path)
+    fingerprint = evaluator_module.tables_fingerprint()
+
+    monkeypatch.setattr(evaluator_module, 'RANK_KEYS', evaluator_module.RANK_KEYS[:-1] + [1479182])
+    assert evaluator_module.tables_fingerprint() != fingerprint
+    with pytest.raises(ValueError):
+        evaluator_module.read_tables(path)
+    rebuilt = []
+    monkeypatch.setattr(evaluator_module, 'build_tables', lambda: rebuilt.append(1) or tables)
+    evaluator_module.cached_tables(path)
+    assert rebuilt == [1]
+    evaluator_module.read_tables(path)
+
+
+def test_evaluation_cache_shares_suit_isomorphic_hands():
+    hand = [Card('Hearts', 'Ace'), Card('Hearts', 'King'), Card('Spades', '2'),
+            Card('Clubs', '7'), Card('Hearts', '9')]
+    # Swap hearts and diamonds: same hand up to suit relabelling
+    swapped = [Card('Diamonds' if card.suit == 'Hearts' else card.suit, card.rank) for card in hand]
+    assert canonical_key(hand) == canonical_key(swapped)
+    assert canonical_key(hand) != canonical_key(hand + [Card('Hearts', '3')])
+
+    clear_cache()
+    assert evaluate_cards(hand) == evaluate_cards(swapped)
+    stats = cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
@@ -0,0 +1,58 @@
+import itertools
+import random
+
+import numpy as np
+
+from game.evaluator import evaluate
+from game.exact import COMBOS, exact_equity, top_range
+from game.game import Game
+
+
+def brute_force_equity(hole, board, weights=None):
+    dead = set(hole + board)
+    unseen = [card for card in range(52) if card not in dead]
+    share = total = 0.0
+    for runout in itertools.combinations(unseen, 5 - len(board)):
+        full_board = board + list(runout)
+        hero = evaluate(hole + full_board)
+        for holding in itertools.combinations([card for card in unseen if card not in runout], 2):
+            weight = 1.0 if weights is None else weights[holding]
+            villain = evaluate(list(holding) + full_board)
+            total += weight
+            share += weight * ((hero < villain) + (hero == villain) / 2)
+    return share / total
+
+
+def test_exact_equity_matches_brute_force():
+    rng = random.Random(14)
+    for board_size in (4, 5, 4, 5):
+        cards = rng.sample(range(52), 2 + board_size)
+        hole, board = cards[:2], cards[2:]
+        assert abs(exact_equity(hole, board).equity - brute_force_equity(hole, board)) < 1e-12
+
+
+def test_exact_equity_weights_opponent_range():
+    hole, board = [12, 25], [0, 14, 27, 40]
+    rng = random.Random(3)
+    weights = {combo: rng.choice([0.0, 0.5, 1.0]) for combo in itertools.combinations(range(52), 2)}
+    combo_weights = np.array([weights[tuple(combo)] for combo in COMBOS])
+    assert abs(exact_equity(hole, board, combo_weights).equity
+               - brute_force_equity(hole, board, weights)) < 1e-12
+
+
+def test_exact_outs_hold_up_on_the_river():
+    hole, board = [4, 3], [5, 32, 50, 13]  # 6-5 on 7-8-K-2: open-ended straight draw
+    turn = exact_equity(hole, board)
+    assert turn.equity < 0.5
+    assert {2, 15, 28, 41, 7, 20, 33, 46} <= set(turn.outs)  # every four and nine
+    for card in turn.card_equity:
+        river = exact_equity(hole, board + [card])
+        assert abs(river.equity - turn.card_equity[card]) < 1e-12
+        assert (card in turn.outs) == (river.equity > 0.5)
+
+
+def test_bots_can_decide_by_exact_equity():
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(5), exact_equity=True,
+                         opponent_range=top_range(0.3))
+    result = game.play(max_hands=5)
+    assert result.hands_played >= 1
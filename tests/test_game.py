@@ -0,0 +1,100 @@
+import random
+
+from game.game import Game, SessionResult
+from game.providers import callback_provider
+
+
+def test_headless_game_plays_without_output(capsys):
+    random.seed(1)
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], starting_chips=200)
+    result = game.play(max_hands=20)
+    assert isinstance(result, SessionResult)
+    assert 1 <= result.hands_played <= 20
+    assert set(result.chips) == {'Bot1', 'Bot2', 'Bot3'}
+    assert capsys.readouterr().out == ""
+
+
+def test_headless_session_returns_winner_instead_of_exiting():
+    random.seed(2)
+    game = Game.headless(['Bot1', 'Bot2'], starting_chips=50)
+    result = game.play()
+    assert result.winner in ('Bot1', 'Bot2')
+    assert result.chips[result.winner] > 0
+
+
+def test_event_sink_receives_output():
+    random.seed(3)
+    events = []
+    game = Game.headless(['Bot1', 'Bot2'], sink=events.append)
+    game.play(max_hands=1)
+    assert any('Pre-Flop Betting Round' in event for event in events)
+
+
+def test_callback_provider_drives_bot_decisions():
+    seen = []
+
+    def always_fold(game, player, current_bet):
+        seen.append(player.name)
+        return 'fold'
+
+    random.seed(4)
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], bot_provider=callback_provider(always_fold))
+    game.play(max_hands=1)
+    assert seen
+
+
+def test_seeded_tables_are_reproducible():
+    def play(seed):
+        game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(seed))
+        return game.play(max_hands=10).chips
+
+    assert play(7) == play(7)
+
+
+def test_bots_can_decide_by_equity_within_budget():
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(5), equity_budget=0.01)
+    result = game.play(max_hands=3)
+    assert result.hands_played >= 1
+
+
+def test_seeded_equity_bots_are_reproducible():
+    def session():
+        game = Game.headless([f'Bot{i+1}' for i in range(6)], rng=random.Random(3), equity_trials=300)
+        return game.play(max_hands=15).chips
+
+    assert session() == session()
+
+
+def test_chips_are_conserved_across_sessions():
+    for seed in range(10):
+        game = Game.headless(['Bot1', 'Bot2', 'Bot3', 'Bot4'], starting_chips=150, rng=random.Random(seed))
+        result = game.play(max_hands=100)
+        assert sum(result.chips.values()) == 600
+
+
+def test_button_moves_to_next_player_when_an_earlier_seat_busts():
+    game = Game.headless(['A', 'B', 'C', 'D'], rng=random.Random(0))
+    game.dealer_index = 3  # The button is due on D
+    game.players[1].chips = 0
+    game.remove_busted_players()
+    game.assign_positions()
+    assert [(player.name, player.position) for player in game.players] == [
+        ('A', 'Small Blind'), ('C', 'Big Blind'), ('D', 'Dealer')]
+
+
+def test_play_hands_reseats_until_every_hand_is_played():
+    game = Game.headless(['Bot1', 'Bot2'], starting_chips=50, rng=random.Random(2))
+    results = game.play_hands(200)
+    assert len(results) > 1
+    assert sum(result.hands_played for result in results) == 200
+    assert game.hands_played == 200
+    for result in results:
+        assert sum(result.chips.values()) == 100
+    assert all(result.winner is not None for result in results[:-1])
+
+
+def test_headless_games_keep_only_recent_hands_in_memory():
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], starting_chips=5000, rng=random.Random(9), history_limit=20)
+    game.play_hands(60)
+    assert len(game.hand_history) == 20
+    assert [hand['number'] for hand in game.hand_history] == list(range(41, 61))
@@ -0,0 +1,67 @@
+import random
+
+from game.game import Game
+from game.hand import HandState
+from game.player import Player
+
+
+def make_players(*stacks):
+    return [Player(f'P{seat}', chips=chips) for seat, chips in enumerate(stacks)]
+
+
+def test_hand_state_tracks_actor_and_legal_actions():
+    state = HandState(make_players(1000, 1000, 1000), dealer=0)
+    assert (state.small_blind_seat, state.big_blind_seat, state.actor) == (1, 2, 0)
+    assert state.legal_actions() == ['fold', 'call', 'raise']
+    state.apply('call')
+    state.apply('call')
+    assert state.actor == 2
+    assert state.legal_actions() == ['check', 'raise']
+    state.apply('check')
+    assert state.street_over and state.pot == 30
+
+    state.start_street("Flop")
+    assert state.actor == 1
+    assert state.legal_actions() == ['check', 'bet']
+    state.apply('bet', 20)
+    state.apply('raise', 5)  # Topped up to the minimum raise of 20
+    assert state.current_bet == 40 and state.min_raise == 20
+    assert state.actor == 0
+    state.apply('fold')
+    assert state.actor == 1
+    state.apply('call')
+    assert state.street_over and not state.hand_over
+
+
+def test_hand_state_closes_street_when_everyone_is_all_in():
+    state = HandState(make_players(100, 1000, 50), dealer=0)
+    state.apply('raise', 1000)  # Dealer shoves for 100
+    state.apply('call')
+    state.apply('call')  # Big blind calls all-in for 50
+    assert state.street_over
+    state.start_street("Flop")
+    assert state.street_over and state.legal_actions() == []
+
+
+def test_hand_state_snapshot_and_restore():
+    players = make_players(500, 500, 500, 500)
+    state = HandState(players, dealer=1)
+    saved = state.snapshot()
+    state.apply('raise', 40)
+    state.apply('fold')
+    state.restore(saved)
+    assert state.snapshot() == saved
+    assert [player.chips for player in players] == [500, 500, 495, 490]
+    assert all(player.active for player in players)
+
+
+def test_hands_replay_from_event_log():
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3', 'Bot4'], rng=random.Random(12))
+    for _ in range(5):
+        stacks = [player.chips for player in game.players]
+        dealer = game.dealer_index
+        game.play_hand()
+        replayed = HandState.replay(make_players(*stacks), dealer, game.state.events)
+        assert replayed.events == game.state.events
+        assert replayed.pot == game.state.pot
+        assert [p.total_bet for p in replayed.players] == [p.total_bet for p in game.players]
@@ -0,0 +1,77 @@
+import os
+import random
+
+import pytest
+
+from game.game import Game
+from game.history import decode_binary, encode_binary, HandHistoryStore, MAGIC, read_hand, read_hands
+
+
+def test_hand_history_store_round_trips(tmp_path):
+    for filename in ('hands.bin', 'hands.jsonl'):
+        path = str(tmp_path / filename)
+        in_memory = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(8))
+        in_memory.play(max_hands=25)
+        with HandHistoryStore(path) as store:
+            streamed = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(8), history_store=store)
+            streamed.play(max_hands=25)
+            assert not streamed.hand_history
+            assert len(store) == len(in_memory.hand_history)
+            last = len(store) - 1
+            assert store.get(last) == in_memory.hand_history[last]
+        assert list(read_hands(path)) == list(in_memory.hand_history)
+        with HandHistoryStore(path) as store:
+            assert store.get(0) == in_memory.hand_history[0]
+
+
+def test_read_hand_opens_history_read_only(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    with HandHistoryStore(path) as store:
+        Game.headless(['Bot1', 'Bot2'], rng=random.Random(4), history_store=store).play(max_hands=5)
+        expected = store.get(3)
+    assert read_hand(path, 3) == expected
+    with pytest.raises(IndexError):
+        read_hand(path, len(store))
+    missing = str(tmp_path / 'typo.bin')
+    with pytest.raises(FileNotFoundError):
+        read_hand(missing, 0)
+    assert not os.path.exists(missing) and not os.path.exists(missing + '.idx')
+
+
+def test_binary_records_keep_winners_with_commas_in_their_names():
+    game = Game.headless(['Smith, J', 'Doe, A', 'Bot3'], rng=random.Random(5))
+    game.play(max_hands=30)
+    assert any(hand['winners'] for hand in game.hand_history)
+    for hand in game.hand_history:
+        assert decode_binary(encode_binary(hand)) == hand
+    hand = dict(game.hand_history[0])
+    hand['players'] = [dict(player, name='x' * 256) for player in hand['players']]
+    with pytest.raises(ValueError):
+        encode_binary(hand)
+
+
+def test_stores_read_back_in_their_own_format(tmp_path):
+    path = str(tmp_path / 'hands.log')
+    with HandHistoryStore(path, format='jsonl') as store:
+        game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(6), history_store=store)
+        game.play(max_hands=10)
+        hands = list(store)
+    assert len(hands) == len(store) and hands[0]['number'] == 1
+    assert list(read_hands(path, 4, format='jsonl')) == hands[4:]
+    assert read_hand(path, 4, format='jsonl') == hands[4]
+
+
+def test_read_hands_starts_from_the_index(tmp_path):
+    for filename in ('hands.bin', 'hands.jsonl'):
+        path = str(tmp_path / filename)
+        with HandHistoryStore(path) as store:
+            Game.headless(['Bot1', 'Bot2'], rng=random.Random(7), history_store=store).play(max_hands=12)
+            hands = list(store)
+            first = store.get(1)
+        assert list(read_hands(path, 5)) == hands[5:]
+        assert list(read_hands(path, len(hands))) == []
+        # Damage the first record: reads that start later never touch it
+        with open(path, 'r+b') as f:
+            f.seek(len(MAGIC) if filename == 'hands.bin' else 0)
+            f.write(b'\xff' * 4)
+        assert next(read_hands(path, 1)) == first
@@ -0,0 +1,17 @@
+from game.player import Player
+
+
+def test_bet_is_capped_at_stack():
+    player = Player('Alice', chips=30)
+    assert player.bet(50) == 30
+    assert player.chips == 0
+    assert player.current_bet == 30
+
+
+def test_reset_bet_and_fold():
+    player = Player('Bob')
+    player.bet(10)
+    player.reset_bet()
+    player.fold()
+    assert player.current_bet == 0
+    assert not player.active
@@ -0,0 +1,63 @@
+from hypothesis import given, strategies as st
+
+from game.pot import settle_pots
+
+
+def test_side_pots_follow_all_in_levels():
+    contributions = {'A': 50, 'B': 100, 'C': 100, 'D': 30}
+    # D folded; A has the best hand but only covers the main pot
+    pots, payouts = settle_pots(contributions, {'A': 1, 'B': 5, 'C': 5}, ['A', 'B', 'C', 'D'])
+    assert [(pot.amount, pot.eligible) for pot in pots] == [(180, ['A', 'B', 'C']), (100, ['B', 'C'])]
+    assert payouts == {'A': 180, 'B': 50, 'C': 50}
+
+
+def test_odd_chips_go_left_of_dealer_first():
+    pots, payouts = settle_pots({'A': 5, 'B': 10, 'C': 10}, {'B': 3, 'C': 3}, ['C', 'A', 'B'])
+    assert payouts == {'C': 13, 'B': 12}
+
+
+settlements = st.integers(min_value=2, max_value=10).flatmap(lambda n: st.tuples(
+    st.lists(st.integers(min_value=0, max_value=500), min_size=n, max_size=n),
+    st.lists(st.booleans(), min_size=n, max_size=n),
+    st.lists(st.integers(min_value=1, max_value=7462), min_size=n, max_size=n)))
+
+
+@given(settlements)
+def test_settlement_conserves_chips(settlement):
+    amounts, folded, hand_ranks = settlement
+    players = list(range(len(amounts)))
+    if all(folded):
+        folded[0] = False
+    contributions = dict(zip(players, amounts))
+    ranks = {player: hand_ranks[player] for player in players if not folded[player]}
+    pots, payouts = settle_pots(contributions, ranks, players)
+
+    assert sum(payouts.values()) == sum(amounts)
+    assert sum(pot.amount for pot in pots) == sum(amounts)
+    for pot in pots:
+        assert set(pot.winners) <= set(pot.eligible) <= set(ranks)
+        assert sum(pot.payouts.values()) == pot.amount
+        shares = sorted(pot.payouts.values())
+        assert shares[-1] - shares[0] <= 1
+        best = min(ranks[player] for player in pot.eligible)
+        assert all(ranks[player] == best for player in pot.winners)
+
+
+@given(settlements)
+def test_nobody_wins_more_than_they_could_cover(settlement):
+    amounts, folded, hand_ranks = settlement
+    players = list(range(len(amounts)))
+    if all(folded):
+        folded[0] = False
+    contributions = dict(zip(players, amounts))
+    ranks = {player: hand_ranks[player] for player in players if not folded[player]}
+    _, payouts = settle_pots(contributions, ranks, players)
+
+    top_live = max(contributions[player] for player in ranks)
+    for player, amount in payouts.items():
+        # A live player can at most win every contribution capped at their own,
+        # plus folded money above the top live level when they reach it
+        covered = sum(min(contribution, contributions[player]) for contribution in amounts)
+        if contributions[player] == top_live:
+            covered = sum(amounts)
+        assert amount <= covered
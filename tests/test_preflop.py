@@ -0,0 +1,25 @@
+import itertools
+import random
+
+from game.equity import estimate_equity
+from game.preflop import class_cards, class_combos, hand_class, NUM_CLASSES, PreflopTable
+
+
+def test_preflop_hand_classes_cover_all_starting_hands():
+    counts = {}
+    for hole in itertools.combinations(range(52), 2):
+        index = hand_class(hole)
+        counts[index] = counts.get(index, 0) + 1
+    assert len(counts) == NUM_CLASSES
+    for index, count in counts.items():
+        assert count == class_combos(index)
+        assert hand_class(class_cards(index)) == index
+
+
+def test_preflop_table_matches_fresh_simulation():
+    table = PreflopTable()
+    sample = random.Random(0).sample(range(NUM_CLASSES), 6)
+    for index, opponents in zip(sample, (1, 2, 3, 5, 7, 9)):
+        cards = class_cards(index)
+        fresh = estimate_equity(cards, num_opponents=opponents, trials=20000, rng=index)
+        assert abs(table.equity(cards, opponents) - fresh.equity) < 0.015
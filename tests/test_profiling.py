@@ -0,0 +1,22 @@
+import random
+
+from game.game import Game
+from game.profiling import Instruments
+
+
+def test_instruments_time_phases_without_changing_play():
+    names = ['Bot1', 'Bot2', 'Bot3']
+    plain = Game.headless(names, rng=random.Random(8))
+    plain.play(max_hands=10)
+    instruments = Instruments()
+    timed = instruments.attach(Game.headless(names, rng=random.Random(8)))
+    timed.play(max_hands=10)
+
+    assert [p.chips for p in timed.roster] == [p.chips for p in plain.roster]
+    report = instruments.as_dict()
+    assert report['hands'] == 10
+    assert report['phases']['betting Pre-Flop']['calls'] == 10
+    for phase in report['phases'].values():
+        assert 0 <= phase['self_seconds'] <= phase['seconds'] + 1e-9
+    instruments.detach(timed)
+    assert 'play_hand' not in vars(timed)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from game.server import PokerServer
+
+
+def test_server_plays_tables_and_times_out_silent_clients():
+    async def client(port, name, answer):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(json.dumps({'type': 'join', 'name': name}).encode() + b'\n')
+        seen = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            seen.append(message['type'])
+            if message['type'] == 'table_end':
+                break
+            if message['type'] == 'act' and answer:
+                writer.write(json.dumps({'type': 'action', 'action': message['valid_actions'][-1]}).encode() + b'\n')
+        writer.close()
+        return seen
+
+    async def run():
+        server = PokerServer(seats_per_table=2, action_timeout=0.05, max_hands=3, seed=1)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        results = await asyncio.wait_for(asyncio.gather(client(port, 'Alice', True),
+                                                        client(port, 'Bob', False)), 30)
+        await server.close()
+        return results
+
+    for seen in asyncio.run(run()):
+        assert seen[0] == 'welcome'
+        assert 'hand_end' in seen
+        assert seen[-1] == 'table_end'
+
+
+def test_server_answers_non_object_messages_with_errors():
+    async def run():
+        server = PokerServer(seats_per_table=2, seed=1)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        replies = []
+        for line in (b'[1]\n', b'"x"\n', b'{oops\n'):
+            writer.write(line)
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        await server.close()
+        return replies
+
+    replies = asyncio.run(run())
+    assert [reply['type'] for reply in replies] == ['error', 'error', 'error']
+    assert replies[0]['message'] == "Expected a JSON object"
+
+
+def test_server_refuses_joins_beyond_its_table_limit():
+    async def join(port, name):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(json.dumps({'type': 'join', 'name': name}).encode() + b'\n')
+        return reader, writer
+
+    async def run():
+        server = PokerServer(seats_per_table=2, action_timeout=0.5, max_hands=2, max_tables=1, seed=1)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        seated = [await join(port, name) for name in ('Alice', 'Bob')]
+        welcomes = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for reader, _ in seated]
+        reader, writer = await join(port, 'Cat')
+        refusal = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        for _, seated_writer in seated + [(reader, writer)]:
+            seated_writer.close()
+        await server.close()
+        return welcomes, refusal
+
+    welcomes, refusal = asyncio.run(run())
+    assert [message['type'] for message in welcomes] == ['welcome', 'welcome']
+    assert refusal == {'type': 'error', 'message': "Server is full, try again later"}
+
+
+def test_server_rejects_duplicate_names_at_a_table():
+    async def join(port, name):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(json.dumps({'type': 'join', 'name': name}).encode() + b'\n')
+        return reader, writer
+
+    async def run():
+        server = PokerServer(seats_per_table=2, action_timeout=0.05, max_hands=1, seed=1)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        first, first_writer = await join(port, 'alice')
+        await asyncio.sleep(0.1)  # let the first join land before the second
+        second, second_writer = await join(port, 'alice')
+        refusal = json.loads(await asyncio.wait_for(second.readline(), 5))
+        # The refused client may pick another name
+        second_writer.write(json.dumps({'type': 'join', 'name': 'bob'}).encode() + b'\n')
+        welcomes = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for reader in (first, second)]
+        first_writer.close()
+        second_writer.close()
+        await server.close()
+        return refusal, welcomes
+
+    refusal, welcomes = asyncio.run(run())
+    assert refusal == {'type': 'error', 'message': "The name 'alice' is taken at this table"}
+    assert [message['seat'] for message in welcomes] == [0, 1]
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from game.game import Game
+from game.history import HandHistoryStore
+from game.snapshot import capture, encode, read_snapshot, SnapshotWriter
+from game.stats import OpponentStats
+
+
+def test_resumed_session_is_bit_exact(tmp_path):
+    names = ['Bot1', 'Bot2', 'Bot3', 'Bot4']
+    path = str(tmp_path / 'table.snap')
+    reference = Game.headless(names, rng=random.Random(21), equity_trials=200)
+    with SnapshotWriter(path) as writer:
+        reference.checkpoint = writer
+        reference.play(max_hands=8)
+    reference.checkpoint = None
+    reference.play(max_hands=8)
+
+    snapshot = read_snapshot(path)
+    assert snapshot.hands_played == 8
+    with HandHistoryStore(str(tmp_path / 'hands.bin')) as store:
+        resumed = Game.headless(names, rng=random.Random(), equity_trials=200,
+                                history_store=store).resume(snapshot)
+        resumed.play(max_hands=8)
+        assert [hand['number'] for hand in store] == list(range(9, 17))
+        assert list(store) == list(reference.hand_history)[8:]
+    assert [p.chips for p in resumed.roster] == [p.chips for p in reference.roster]
+
+
+def test_snapshot_size_does_not_grow(tmp_path):
+    game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(4))
+    game.play(max_hands=1)
+    early = len(encode(capture(game)))
+    game.play(max_hands=50)
+    assert len(encode(capture(game))) == early
+
+
+def test_resume_restores_opponent_stats(tmp_path):
+    names = [f'Bot{i+1}' for i in range(6)]
+    path = str(tmp_path / 'table.snap')
+    reference = Game.headless(names, 5000, rng=random.Random(1), stats=OpponentStats(half_life=20))
+    with SnapshotWriter(path) as writer:
+        reference.checkpoint = writer
+        reference.play(max_hands=30)
+    reference.checkpoint = None
+    reference.play(max_hands=30)
+
+    resumed = Game.headless(names, 5000, rng=random.Random(), stats=OpponentStats())
+    resumed.resume(read_snapshot(path))
+    resumed.play(max_hands=30)
+    assert list(resumed.hand_history) == list(reference.hand_history)[30:]
+    assert [p.chips for p in resumed.roster] == [p.chips for p in reference.roster]
+    assert resumed.stats.encode() == reference.stats.encode()
+
+
+def test_snapshot_writer_reports_failed_writes(tmp_path):
+    game = Game.headless(['Bot1', 'Bot2'], rng=random.Random(2))
+    writer = SnapshotWriter(str(tmp_path / 'missing' / 'table.snap'))
+    writer.submit(capture(game))
+    while writer.error is None:
+        writer.thread.join(0.01)
+    with pytest.raises(OSError):
+        writer.submit(capture(game))
+    writer.close()
+
+    writer = SnapshotWriter(str(tmp_path / 'missing' / 'table.snap'))
+    writer.submit(capture(game))
+    with pytest.raises(OSError):
+        writer.close()
+    assert writer.written == 0
@@ -0,0 +1,53 @@
+import random
+
+from game.card import CARDS
+from game.game import Game
+from game.history import HandHistoryStore
+from game.stats import backfill, OpponentStats
+
+
+def test_opponent_stats_count_actions_and_decay():
+    hand = {
+        'number': 1, 'winner': 'Bob', 'winners': ['Bob'], 'winning_hand': 'Pair', 'pot': 60,
+        'community_cards': [CARDS[index] for index in (0, 14, 28, 42, 51)],
+        'players': [{'name': name, 'hand': [], 'final_hand': None, 'active': name != 'Cat'}
+                    for name in ('Ann', 'Bob', 'Cat')],
+        'actions': [('Bob', 'Pre-Flop', 'small blind', 5), ('Cat', 'Pre-Flop', 'big blind', 10),
+                    ('Ann', 'Pre-Flop', 'raise', 20), ('Bob', 'Pre-Flop', 'call', 15),
+                    ('Cat', 'Pre-Flop', 'call', 10), ('Bob', 'Flop', 'check', 0),
+                    ('Cat', 'Flop', 'check', 0), ('Ann', 'Flop', 'bet', 10),
+                    ('Bob', 'Flop', 'call', 10), ('Cat', 'Flop', 'fold', 0),
+                    ('Bob', 'Turn', 'check', 0), ('Ann', 'Turn', 'check', 0),
+                    ('Bob', 'River', 'check', 0), ('Ann', 'River', 'check', 0)],
+    }
+    stats = OpponentStats()
+    stats.observe_hand(hand)
+    ann, bob, cat = stats.get('Ann'), stats.get('Bob'), stats.get('Cat')
+    assert (ann.vpip, ann.pfr, ann.aggression, ann.fold_to_bet) == (1.0, 1.0, float('inf'), None)
+    assert (bob.vpip, bob.pfr, bob.aggression, bob.fold_to_bet) == (1.0, 0.0, 0.0, 0.0)
+    assert (cat.vpip, cat.fold_to_bet, cat.went_to_showdown) == (1.0, 1.0, 0.0)
+    assert (ann.showdown_win, bob.showdown_win, bob.went_to_showdown) == (0.0, 1.0, 1.0)
+    assert stats.get('Dan').vpip is None
+
+    # With a half-life of one hand, old hands count half as much per new hand
+    stats = OpponentStats(half_life=1)
+    stats.observe_hand(hand)
+    hand['actions'][2] = ('Ann', 'Pre-Flop', 'fold', 0)
+    hand['players'][0]['active'] = False
+    stats.observe_hand(hand)
+    assert stats.get('Ann').hands == 1.5
+    assert stats.get('Ann').vpip == 0.5 / 1.5
+
+
+def test_live_opponent_stats_match_backfill_from_history(tmp_path):
+    stats = OpponentStats(half_life=50)
+    path = str(tmp_path / 'hands.bin')
+    with HandHistoryStore(path) as store:
+        game = Game.headless(['Bot1', 'Bot2', 'Bot3'], rng=random.Random(6), stats=stats, history_store=store)
+        game.play(max_hands=100)
+    replayed = backfill([path], OpponentStats(half_life=50))
+    assert replayed.hands_seen == stats.hands_seen == game.hands_played
+    for name in ('Bot1', 'Bot2', 'Bot3'):
+        assert replayed.get(name).counts == stats.get(name).counts
+        assert 0 < stats.get(name).vpip <= 1
+    assert -0.1 <= game.bet_adjustment(game.players[0]) <= 0.1
@@ -0,0 +1,59 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.suite import compare, main, permutation_p_value
+
+
+def timing_results(samples, paired=False):
+    return {'hands.2': {'unit': 's/hand', 'lower_is_better': True, 'paired': paired, 'samples': samples}}
+
+
+def test_identical_samples_are_not_flagged():
+    rng = random.Random(1)
+    samples = [1e-4 * (1 + rng.gauss(0, 0.05)) for _ in range(7)]
+    baseline = {'calibration': [0.01] * 7, 'cases': timing_results(samples)}
+    assert compare(baseline, timing_results(list(samples)), [0.01] * 7, 0.01, 0.05) == []
+
+    deals = [rng.gauss(10, 40) for _ in range(500)]
+    strength = {'strength.duplicate': {'unit': 'chips/hand', 'lower_is_better': False, 'paired': True,
+                                       'samples': deals}}
+    assert compare({'cases': strength}, json.loads(json.dumps(strength)), [], 0.01, 0.05) == []
+
+
+def test_shifted_samples_are_flagged_as_regressions():
+    rng = random.Random(2)
+    samples = [1e-4 * (1 + rng.gauss(0, 0.05)) for _ in range(7)]
+    baseline = {'calibration': [0.01] * 7, 'cases': timing_results(samples)}
+    slower = timing_results([sample * 1.5 for sample in samples])
+    assert compare(baseline, slower, [0.01] * 7, 0.01, 0.05) == ['hands.2']
+    # A machine that runs the calibration loop 1.5x slower explains the same shift
+    assert compare(baseline, slower, [0.015] * 7, 0.01, 0.05) == []
+
+
+def test_regressions_make_the_cli_exit_non_zero(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    options = ['--cases', 'memory', '--repeats', '3', '--alpha', '0.2']
+    main(options + ['--save', path])
+    main(options + ['--compare', path])
+
+    with open(path) as f:
+        baseline = json.load(f)
+    case = baseline['cases']['memory.table']
+    case['samples'] = [sample / 2 for sample in case['samples']]
+    with open(path, 'w') as f:
+        json.dump(baseline, f)
+    with pytest.raises(SystemExit) as exit_info:
+        main(options + ['--compare', path])
+    assert exit_info.value.code == 1
+
+
+def test_permutation_p_value_is_deterministic_for_a_seed():
+    rng = random.Random(3)
+    baseline = [rng.gauss(1.0, 0.1) for _ in range(20)]
+    current = [rng.gauss(1.05, 0.1) for _ in range(20)]
+    for paired in (False, True):
+        first = permutation_p_value(baseline, current, True, paired, rounds=2000, seed=7)
+        assert first == permutation_p_value(baseline, current, True, paired, rounds=2000, seed=7)
+        assert 0 < first <= 1
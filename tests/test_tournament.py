@@ -0,0 +1,23 @@
+from game.tournament import run_tournament
+
+
+def test_tournament_is_reproducible_across_worker_counts():
+    bot_names = ['Bot1', 'Bot2', 'Bot3']
+    serial = run_tournament(bot_names, num_tables=3, hands_per_table=4, master_seed=11, workers=1)
+    parallel = run_tournament(bot_names, num_tables=3, hands_per_table=4, master_seed=11, workers=2)
+    assert serial.hands_played == parallel.hands_played == 12
+    for name in bot_names:
+        assert serial.stats[name].net == parallel.stats[name].net
+        assert serial.stats[name].hands == parallel.stats[name].hands
+
+
+def test_tournament_resumes_from_checkpoints(tmp_path):
+    bot_names = ['Bot1', 'Bot2', 'Bot3']
+    full = run_tournament(bot_names, num_tables=2, hands_per_table=12, master_seed=5, workers=1)
+    run_tournament(bot_names, num_tables=2, hands_per_table=5, master_seed=5, workers=1,
+                   checkpoint_dir=str(tmp_path), checkpoint_every=2)
+    resumed = run_tournament(bot_names, num_tables=2, hands_per_table=12, master_seed=5, workers=1,
+                             checkpoint_dir=str(tmp_path), checkpoint_every=2)
+    assert resumed.hands_played == full.hands_played
+    assert {n: (s.hands, s.net, s.net_sq) for n, s in resumed.stats.items()} == \
+        {n: (s.hands, s.net, s.net_sq) for n, s in full.stats.items()}